@@ -0,0 +1,293 @@
+"""Asyncio HTTP scoring service with micro-batching.
+
+Uploads are extracted and cleaned in a bounded process pool. Cleaned
+resumes that arrive within a short window (``batch_window`` seconds or
+``max_batch`` documents, whichever comes first) are scored together with
+one sparse matrix-matrix product against the job matrix.
+
+    POST /score?name=resume.pdf&top=5   body: PDF/DOCX bytes (kind from name, or ?kind=pdf|docx|text), top 1..MAX_TOP
+    GET  /health                         catalog size and batching statistics
+
+The catalog is reloaded (incrementally) when the job description file changes.
+"""
+import asyncio
+import json
+import time
+from concurrent.futures import ProcessPoolExecutor
+from urllib.parse import parse_qs, urlsplit
+
+from catalog_watcher import CatalogWatcher
+from extraction import extract_text, resume_kind
+from extraction_sandbox import ExtractionError, SandboxedExtractor
+from scoring import DEFAULT_TOP_K, score_cleaned_batch
+from scoring_daemon import result_row
+
+# Per-process extraction state set up by init_extract_worker
+_worker_stop_words = None
+_worker_text_cache = None
+_worker_sandbox = None
+
+# Most roles one request may ask for; a larger top would force ranking the whole catalog
+MAX_TOP = 50
+
+HTTP_REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 413: "Payload Too Large",
+                422: "Unprocessable Entity", 500: "Internal Server Error"}
+
+
+def init_extract_worker(cache_dir, version, sandbox_options=None):
+    """Load the stopword list (and open the text cache and sandbox) once per worker process"""
+    global _worker_stop_words, _worker_text_cache, _worker_sandbox
+    from stop_words import load_stop_words
+    from text_cache import TextCache
+    _worker_stop_words = frozenset(load_stop_words())
+    _worker_text_cache = TextCache(cache_dir, version=version) if cache_dir else None
+    # A hostile upload then kills a sandbox process, never a pool worker (which
+    # would break the whole pool)
+    _worker_sandbox = SandboxedExtractor(**sandbox_options) if sandbox_options is not None else None
+
+
+def extract_and_clean(data, kind):
+    """Extract and clean one upload in a worker; returns (cleaned text or None, pages)"""
+    from text_cleaning import clean_text
+
+    if kind == "text":
+        return clean_text(data.decode('utf-8', errors='replace'), _worker_stop_words), 0
+
+    cache_key = None
+    if _worker_text_cache is not None:
+        cache_key = _worker_text_cache.key_for_bytes(data)
+        cached = _worker_text_cache.get(cache_key)
+        if cached is not None:
+            return cached[1], cached[2]
+
+    if _worker_sandbox is not None:
+        text, pages = _worker_sandbox.extract(data, kind)
+    else:
+        text, pages = extract_text(data, kind)
+    if not text:
+        return None, pages
+    cleaned = clean_text(text, _worker_stop_words)
+    if cache_key is not None:
+        _worker_text_cache.put(cache_key, text, cleaned, pages)
+    return cleaned, pages
+
+
+class MicroBatcher:
+    """Collects concurrent scoring requests and scores each group in one matrix product"""
+
+    def __init__(self, job_index, max_batch=64, batch_window=0.005, instrumentation=None, top_k=DEFAULT_TOP_K):
+        self.job_index = job_index
+        self.top_k = top_k
+        self.max_batch = max_batch
+        self.batch_window = batch_window
+        self.instrumentation = instrumentation
+        self.queue = asyncio.Queue()
+        self.batches = 0
+        self.documents = 0
+        self.largest_batch = 0
+
+    async def score(self, cleaned_text, resume_file="", pages=0, top=0):
+        """Queue one cleaned resume and wait for its MatchResult (None for empty text).
+
+        At least ``top`` roles (and the batcher's top_k) are ranked.
+        """
+        future = asyncio.get_running_loop().create_future()
+        await self.queue.put((cleaned_text, resume_file, pages, top, future))
+        return await future
+
+    async def run(self):
+        """Batching loop; runs until cancelled"""
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self.queue.get()]
+            deadline = loop.time() + self.batch_window
+            while len(batch) < self.max_batch:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self.queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+
+            # Score off the event loop so uploads keep being accepted; requests
+            # arriving meanwhile simply form the next, larger batch
+            try:
+                results = await loop.run_in_executor(None, self._score_batch, batch)
+            except Exception as e:
+                for *_, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+            for (*_, future), result in zip(batch, results):
+                if not future.done():
+                    future.set_result(result)
+
+    def _score_batch(self, batch):
+        texts = [item[0] for item in batch]
+        files = [item[1] for item in batch]
+        pages = [item[2] for item in batch]
+        self.batches += 1
+        self.documents += len(batch)
+        self.largest_batch = max(self.largest_batch, len(batch))
+        # Only the best roles are ranked, enough for the largest ``top`` in the batch
+        top_k = max([self.top_k] + [item[3] for item in batch])
+        if self.instrumentation is None:
+            return score_cleaned_batch(self.job_index, texts, files, pages, top_k)
+        with self.instrumentation.stage("score_batch") as record:
+            record["sizes"].update({"documents": len(batch), "roles": len(self.job_index.roles)})
+            return score_cleaned_batch(self.job_index, texts, files, pages, top_k)
+
+
+class ScoringService:
+    """HTTP front end: bounded extraction pool feeding a MicroBatcher"""
+
+    def __init__(self, job_index, workers=None, max_batch=64, batch_window=0.005, max_pending=256,
+                 max_upload_bytes=20 * 1024 * 1024, cache_dir=None, cache_version="", instrumentation=None,
+                 sandbox_options=None):
+        self.job_index = job_index
+        self.workers = workers
+        self.max_pending = max_pending
+        self.max_upload_bytes = max_upload_bytes
+        self.cache_dir = cache_dir
+        self.cache_version = cache_version
+        self.sandbox_options = sandbox_options
+        self.batcher = MicroBatcher(job_index, max_batch, batch_window, instrumentation)
+        self.executor = None
+        self.pending = None
+        self.requests = 0
+        self.started_at = time.time()
+
+    async def score_upload(self, data, kind, resume_file="", top=5):
+        """Extract in the pool, then score in the next micro-batch; returns a result row"""
+        async with self.pending:
+            loop = asyncio.get_running_loop()
+            try:
+                cleaned, pages = await loop.run_in_executor(self.executor, extract_and_clean, data, kind)
+            except ExtractionError as e:
+                return dict(result_row(None, resume_file), error=str(e), error_type=e.reason)
+            except Exception as e:
+                return dict(result_row(None, resume_file), error=f"{type(e).__name__}: {e}")
+        if cleaned is None:
+            return dict(result_row(None, resume_file), error="Could not extract text")
+        return result_row(await self.batcher.score(cleaned, resume_file, pages, top), resume_file, top)
+
+    async def route(self, method, target, body):
+        """Dispatch one request; returns (HTTP status, JSON-serializable payload)"""
+        url = urlsplit(target)
+        query = {name: values[-1] for name, values in parse_qs(url.query).items()}
+        if method == "GET" and url.path == "/health":
+            return 200, {"status": "ok", "roles": len(self.job_index.roles), "requests": self.requests,
+                         "batches": self.batcher.batches, "documents": self.batcher.documents,
+                         "largest_batch": self.batcher.largest_batch,
+                         "uptime_s": round(time.time() - self.started_at, 3)}
+        if url.path != "/score":
+            return 404, {"status": "error", "error": f"Unknown path '{url.path}'"}
+        if method != "POST":
+            return 400, {"status": "error", "error": "Use POST to upload a resume"}
+
+        name = query.get("name", "")
+        kind = query.get("kind") or resume_kind(name)
+        if kind not in ("pdf", "docx", "text"):
+            return 400, {"status": "error", "error": "Pass ?kind=pdf|docx|text or a name with that extension"}
+        try:
+            top = int(query.get("top", 5))
+        except ValueError:
+            return 400, {"status": "error", "error": "top must be an integer"}
+        if not 1 <= top <= MAX_TOP:
+            return 400, {"status": "error", "error": f"top must be between 1 and {MAX_TOP}"}
+
+        self.requests += 1
+        row = await self.score_upload(body, kind, name, top)
+        return (200 if row["status"] == "ok" else 422), row
+
+    async def handle_connection(self, reader, writer):
+        """Serve HTTP/1.1 requests (keep-alive) on one connection"""
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line.strip():
+                    break
+                method, target, _ = request_line.decode('latin-1').split(" ", 2)
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    header, _, value = line.decode('latin-1').partition(":")
+                    headers[header.strip().lower()] = value.strip()
+
+                length = int(headers.get("content-length", 0))
+                if length > self.max_upload_bytes:
+                    await self._respond(writer, 413, {"status": "error", "error": "Upload too large"}, False)
+                    break
+                body = await reader.readexactly(length) if length else b""
+
+                try:
+                    status, payload = await self.route(method, target, body)
+                except Exception as e:
+                    status, payload = 500, {"status": "error", "error": f"{type(e).__name__}: {e}"}
+                keep_alive = headers.get("connection", "").lower() != "close"
+                await self._respond(writer, status, payload, keep_alive)
+                if not keep_alive:
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    async def _respond(self, writer, status, payload, keep_alive):
+        body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+        head = (f"HTTP/1.1 {status} {HTTP_REASONS.get(status, '')}\r\n"
+                f"Content-Type: application/json\r\nContent-Length: {len(body)}\r\n"
+                f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n")
+        writer.write(head.encode('latin-1') + body)
+        await writer.drain()
+
+    async def serve(self, host="127.0.0.1", port=8766):
+        """Run until cancelled"""
+        self.pending = asyncio.Semaphore(self.max_pending)
+        self.executor = ProcessPoolExecutor(self.workers, initializer=init_extract_worker,
+                                            initargs=(self.cache_dir, self.cache_version, self.sandbox_options))
+        batcher = asyncio.create_task(self.batcher.run())
+        server = await asyncio.start_server(self.handle_connection, host, port)
+        print(f"Async scoring service listening on http://{host}:{port} (Ctrl+C to stop)")
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            batcher.cancel()
+            self.executor.shutdown(cancel_futures=True)
+
+
+def run_service(job_file="job_description.txt", host="127.0.0.1", port=8766, workers=None, max_batch=64,
+                batch_window_ms=5.0, max_pending=256, max_upload_mb=20, cache_dir=None, instrumentation=None,
+                sandbox_options=None):
+    """Load the catalog and run the async service until interrupted"""
+    from resume_analyzer import ResumeAnalyzer, EXTRACTOR_VERSION
+
+    analyzer = ResumeAnalyzer(cache_dir=None, instrumentation=instrumentation)
+    if not analyzer.load_job_descriptions(job_file):
+        return False
+    service = ScoringService(analyzer.job_index, workers=workers, max_batch=max_batch,
+                             batch_window=batch_window_ms / 1000.0, max_pending=max_pending,
+                             max_upload_bytes=int(max_upload_mb * 1024 * 1024), cache_dir=cache_dir,
+                             cache_version=EXTRACTOR_VERSION, instrumentation=instrumentation,
+                             sandbox_options=sandbox_options)
+
+    def reload():
+        # Update a copy so batches being scored keep a consistent index
+        reloaded = ResumeAnalyzer(cache_dir=None, instrumentation=instrumentation)
+        reloaded.job_index = service.job_index.copy()
+        if reloaded.load_job_descriptions(job_file, verbose=False):
+            service.job_index = service.batcher.job_index = reloaded.job_index
+            print(f"Reloaded {len(reloaded.job_descriptions)} job descriptions from '{job_file}'.")
+
+    stop_event = CatalogWatcher(job_file).start(reload)
+    try:
+        asyncio.run(service.serve(host, port))
+    except KeyboardInterrupt:
+        print("\nStopping async scoring service.")
+    finally:
+        stop_event.set()
+    return True
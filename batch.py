@@ -0,0 +1,455 @@
+import csv
+import glob
+import hashlib
+import json
+import multiprocessing
+import os
+import shutil
+import tempfile
+import time
+from contextlib import nullcontext
+
+import numpy as np
+
+from resume_analyzer import ResumeAnalyzer
+from corpus_store import CorpusStore, cached_embeddings
+from extraction_sandbox import SandboxedExtractor
+from text_cache import DEFAULT_CACHE_DIR
+from instrumentation import Instrumentation
+from near_duplicates import DEFAULT_THRESHOLD, MinHasher, cluster_signatures, text_hash
+from scoring import DEFAULT_TOP_K, score_embedding_batch
+
+RESUME_EXTENSIONS = ('.pdf', '.docx')
+CSV_FIELDS = ["file", "status", "best_match", "best_score", "best_normalized_score", "top_matches",
+              "matched_skills", "missing_skills", "chart", "error", "error_type", "cluster", "duplicate_of"]
+
+# Analyzer and chart export settings loaded once per worker process by init_worker
+_worker_analyzer = None
+_worker_chart_options = None
+_worker_corpus = None
+_worker_minhasher = None
+
+
+def iter_resume_files(target):
+    """Yield resume files from a directory (walked recursively) or a glob pattern"""
+    if os.path.isdir(target):
+        for dirpath, dirnames, filenames in os.walk(target):
+            dirnames.sort()
+            for filename in sorted(filenames):
+                if filename.lower().endswith(RESUME_EXTENSIONS):
+                    yield os.path.join(dirpath, filename)
+    else:
+        for path in glob.iglob(target, recursive=True):
+            if path.lower().endswith(RESUME_EXTENSIONS) and os.path.isfile(path):
+                yield path
+
+
+def init_worker(job_file, cache_dir=DEFAULT_CACHE_DIR, chart_options=None, trace_memory=None, top_k=DEFAULT_TOP_K,
+                max_pages=None, max_chars=None, sandbox_options=None, corpus_path=None, hash_features=None,
+                lsa_dims=None, skills_file=None):
+    """Load the job catalog (and map the corpus store) once per worker process"""
+    global _worker_analyzer, _worker_chart_options, _worker_corpus, _worker_minhasher
+    _worker_chart_options = chart_options
+    _worker_corpus = CorpusStore(corpus_path) if corpus_path else None
+    _worker_minhasher = MinHasher()
+    # trace_memory is None when instrumentation is off
+    instrumentation = Instrumentation(trace_memory=trace_memory) if trace_memory is not None else None
+    # Pool workers are daemonic and cannot split PDFs across processes themselves;
+    # the sandbox is a plain subprocess, so each worker can still own one
+    sandbox = SandboxedExtractor(**sandbox_options) if sandbox_options is not None else None
+    analyzer = ResumeAnalyzer(cache_dir=cache_dir, instrumentation=instrumentation, top_k=top_k,
+                              max_pages=max_pages, max_chars=max_chars, sandbox=sandbox,
+                              hash_features=hash_features, lsa_dims=lsa_dims, skills_file=skills_file)
+    if analyzer.load_job_descriptions(job_file, verbose=False):
+        _worker_analyzer = analyzer
+
+
+def score_file(path, top=5):
+    """Extract and score a single resume, returning one result row"""
+    row = _score_file(path, top)
+    return _with_metrics(row)
+
+
+def score_stored(position, top=5):
+    """Score document ``position`` of the worker's corpus store, returning one result row"""
+    if position >= len(_worker_corpus):
+        # Appended after this worker mapped the store (deduplication stages resumes first)
+        _worker_corpus.reload()
+    doc_id, text = next(_worker_corpus.iter_documents(position, position + 1))
+    row = _new_row(doc_id)
+    if _worker_analyzer is None:
+        row["status"] = "error"
+        row["error"] = "Job descriptions could not be loaded"
+        return row
+    _worker_analyzer.resume_file = doc_id
+    _worker_analyzer.resume_text = text
+    # Only cleaned text is stored, so skills are found in it
+    _worker_analyzer.raw_text = ""
+    _worker_analyzer.skill_text = ""
+    return _with_metrics(_score_text(_worker_analyzer, row, top))
+
+
+def hash_file(path):
+    """(path, SHA-256 digest of the file bytes, or None if it cannot be read)"""
+    digest = hashlib.sha256()
+    try:
+        with open(path, 'rb') as file:
+            for block in iter(lambda: file.read(1 << 20), b""):
+                digest.update(block)
+    except OSError:
+        return path, None
+    return path, digest.digest()
+
+
+def fingerprint_file(path):
+    """Extract and clean one resume for deduplication: (row, cleaned text, text hash, MinHash signature).
+
+    The text is None (and row holds the error) when extraction fails.
+    """
+    row = _new_row(path)
+    if not _extract(row):
+        return _with_metrics(row), None, None, None
+    text = _worker_analyzer.resume_text
+    return _with_metrics(row), text, text_hash(text), _worker_minhasher.signature(text)
+
+
+def fingerprint_stored(position):
+    """(position, text hash, MinHash signature) of a document of the worker's corpus store"""
+    doc_id, text = next(_worker_corpus.iter_documents(position, position + 1))
+    return position, text_hash(text), _worker_minhasher.signature(text)
+
+
+def _with_metrics(row):
+    # Ship this file's stage records back to the parent with the row
+    if _worker_analyzer is not None and _worker_analyzer.instrumentation is not None:
+        row["metrics"] = _worker_analyzer.instrumentation.drain()
+    return row
+
+
+def _new_row(path):
+    return {"file": path, "status": "ok", "best_match": "", "best_score": None,
+            "best_normalized_score": None, "top_matches": [], "matched_skills": [], "missing_skills": [],
+            "skill_gaps": {}, "chart": "", "error": "", "error_type": "", "cluster": None, "duplicate_of": ""}
+
+
+def _extract(row):
+    """Extract and clean row's file into the worker analyzer's resume_text; False (row filled in) on failure"""
+    analyzer = _worker_analyzer
+    if analyzer is None:
+        row["status"] = "error"
+        row["error"] = "Job descriptions could not be loaded"
+        return False
+
+    analyzer.resume_file = row["file"]
+    analyzer.resume_text = ""
+    if not analyzer.extract_text_from_file():
+        row["status"] = "error"
+        row["error"] = "Could not extract text"
+        if analyzer.extract_error is not None:
+            # Structured sandbox failure: timeout, oom, parse_error or crash
+            row["error"] = str(analyzer.extract_error)
+            row["error_type"] = analyzer.extract_error.reason
+        return False
+    return True
+
+
+def _score_file(path, top):
+    row = _new_row(path)
+    if not _extract(row):
+        return row
+    return _score_text(_worker_analyzer, row, top)
+
+
+def _score_text(analyzer, row, top):
+    """Score analyzer.resume_text into row"""
+    path = row["file"]
+    if not analyzer.calculate_similarities():
+        row["status"] = "error"
+        row["error"] = "Could not analyze resume"
+        return row
+
+    ranked = [(match.role, match.normalized_score) for match in analyzer.result.ranked()]
+    row["best_match"] = analyzer.best_match
+    row["best_score"] = analyzer.best_score
+    row["best_normalized_score"] = analyzer.best_normalized_score
+    row["top_matches"] = ranked[:top]
+
+    # Matched/missing skills of the top role (CSV and JSONL) and of every reported role (JSONL)
+    if ranked and analyzer.match_skills():
+        row["skill_gaps"] = {role: analyzer.skill_gaps[role] for role, _ in ranked[:top]}
+        row["matched_skills"] = analyzer.skill_gaps[ranked[0][0]]["matched"]
+        row["missing_skills"] = analyzer.skill_gaps[ranked[0][0]]["missing"]
+
+    if _worker_chart_options is not None:
+        stage = nullcontext()
+        if analyzer.instrumentation is not None:
+            stage = analyzer.instrumentation.stage("render_chart", resume_file=path)
+        with stage:
+            row["chart"] = export_chart(path, analyzer.chart_matches(), **_worker_chart_options)
+    return row
+
+
+def _result_row(result, top):
+    row = _new_row(result.resume_file)
+    row["best_match"] = result.best_match
+    row["best_score"] = result.best_score
+    row["best_normalized_score"] = result.best_normalized_score
+    row["top_matches"] = [(match.role, match.normalized_score) for match in result.ranked(top)]
+    return row
+
+
+def score_corpus_embeddings(corpus_path, output, output_format, job_index, top=5, chart_options=None,
+                            instrumentation=None, chunk_size=4096):
+    """Re-score a corpus store in LSA mode: cached float32 embeddings times the role embeddings.
+
+    Each chunk of resumes is scored with one BLAS matrix product in this
+    process, so no worker pool is needed.
+    """
+    start = time.perf_counter()
+    with CorpusStore(corpus_path) as store:
+        stage = nullcontext({"sizes": {}})
+        if instrumentation is not None:
+            stage = instrumentation.stage("embed_corpus")
+        with stage as record:
+            embeddings = cached_embeddings(store, job_index)
+            record["sizes"].update({"documents": len(embeddings), "dims": embeddings.shape[1]})
+        print(f"Scoring {len(store)} stored resumes from '{corpus_path}' with LSA embeddings...")
+
+        with open(output, 'w', encoding='utf-8', newline='') as out_file:
+            writer = ResultWriter(out_file, output_format)
+            for chunk_start in range(0, len(store), chunk_size):
+                doc_ids = [store.doc_id(i) for i in range(chunk_start, min(chunk_start + chunk_size, len(store)))]
+                results = score_embedding_batch(job_index, embeddings[chunk_start:chunk_start + len(doc_ids)],
+                                                doc_ids, max(top, DEFAULT_TOP_K))
+                for result in results:
+                    row = _result_row(result, top)
+                    if chart_options is not None:
+                        row["chart"] = export_chart(result.resume_file, result.chart_matches(), **chart_options)
+                    writer.write(row)
+
+    elapsed = time.perf_counter() - start
+    print(f"Scored {len(embeddings)} resumes in {elapsed:.1f}s. Results saved to '{output}'")
+    return True
+
+
+def export_chart(path, normalized_job_matches, charts_dir, chart_format="svg", dpi=100):
+    """Render one resume's chart with the Agg backend and return the file path"""
+    from charts import render_chart_file
+
+    # Short hash of the full path keeps same-named resumes from colliding
+    stem = os.path.splitext(os.path.basename(path))[0]
+    suffix = hashlib.sha1(os.path.abspath(path).encode('utf-8')).hexdigest()[:8]
+    chart_path = os.path.join(charts_dir, f"{stem}_{suffix}.{chart_format}")
+    try:
+        return render_chart_file(list(normalized_job_matches.keys()), list(normalized_job_matches.values()),
+                                 chart_path, dpi=dpi)
+    except Exception as e:
+        print(f"Could not save chart for {path}: {e}")
+        return ""
+
+
+def _score_file_star(args):
+    return score_file(*args)
+
+
+def _score_stored_star(args):
+    return score_stored(*args)
+
+
+def _duplicate_row(path, representative, cluster):
+    row = _new_row(path)
+    row["status"] = "duplicate"
+    row["duplicate_of"] = representative
+    row["cluster"] = cluster
+    return row
+
+
+def _deduplicated_rows(pool, target, corpus_path, from_corpus, top, threshold=DEFAULT_THRESHOLD,
+                       instrumentation=None):
+    """Rows of a deduplicated batch: failures, then duplicates, then one scored row per cluster.
+
+    Files with identical bytes (SHA-256) are extracted once. The cleaned
+    text of the rest is staged in the corpus store at corpus_path with its
+    exact hash and MinHash signature; near-duplicates are clustered with
+    LSH and only each cluster's first document is scored. Every row
+    carries its cluster id, and duplicates name their representative.
+    With from_corpus the documents are already in the store at corpus_path.
+    """
+    store = CorpusStore(corpus_path)
+    byte_duplicates = []
+    if from_corpus:
+        n_documents = len(store)
+        signatures = np.empty((n_documents, MinHasher().num_perm), dtype=np.uint32)
+        keys = [None] * n_documents
+        for position, key, signature in pool.imap_unordered(fingerprint_stored, range(n_documents), chunksize=64):
+            keys[position] = key
+            signatures[position] = signature
+    else:
+        # Exact copies are found from the file bytes, before any extraction
+        first_paths = {}
+        paths = []
+        for path, digest in pool.imap(hash_file, iter_resume_files(target), chunksize=64):
+            first = first_paths.setdefault(digest, path) if digest is not None else path
+            if first == path:
+                paths.append(path)
+            else:
+                byte_duplicates.append((path, first))
+        del first_paths
+
+        # Staged in input order (not completion order), so cluster ids and
+        # representatives are the same on every run over the same input
+        keys = []
+        signatures = np.empty((max(len(paths), 1), MinHasher().num_perm), dtype=np.uint32)
+        for row, text, key, signature in pool.imap(fingerprint_file, paths, chunksize=4):
+            if text is None:
+                yield row
+                continue
+            for record in row.pop("metrics", []):
+                instrumentation.ingest(record)
+            store.append(row["file"], text)
+            signatures[len(keys)] = signature
+            keys.append(key)
+        signatures = signatures[:len(keys)]
+        store.flush()
+
+    stage = nullcontext({"sizes": {}})
+    if instrumentation is not None:
+        stage = instrumentation.stage("cluster_duplicates")
+    with stage as record:
+        roots = cluster_signatures(signatures, threshold=threshold, exact_keys=keys)
+        representatives = np.flatnonzero(roots == np.arange(len(roots)))
+        record["sizes"].update({"documents": len(roots), "clusters": len(representatives)})
+    del signatures, keys
+    print(f"{len(roots) + len(byte_duplicates)} resumes form {len(representatives)} clusters; "
+          f"scoring one resume per cluster...")
+
+    # Cluster ids number the representatives in document order
+    clusters = np.zeros(len(roots), dtype=np.int64)
+    clusters[representatives] = np.arange(len(representatives))
+    clusters = clusters[roots]
+    for position in np.flatnonzero(roots != np.arange(len(roots))):
+        yield _duplicate_row(store.doc_id(position), store.doc_id(roots[position]), int(clusters[position]))
+    positions = store.positions()
+    for path, first in byte_duplicates:
+        # The first copy failed extraction when it is not in the store
+        position = positions.get(first)
+        if position is None:
+            yield _duplicate_row(path, first, None)
+        else:
+            yield _duplicate_row(path, store.doc_id(roots[position]), int(clusters[position]))
+    del byte_duplicates
+
+    tasks = ((int(position), top) for position in representatives)
+    for row in pool.imap_unordered(_score_stored_star, tasks, chunksize=64):
+        row["cluster"] = int(clusters[positions[row["file"]]])
+        yield row
+    store.close()
+
+
+class ResultWriter:
+    """Stream result rows to a CSV or JSONL file as they arrive"""
+
+    def __init__(self, file, output_format="csv"):
+        self.file = file
+        self.output_format = output_format
+        self.csv_writer = None
+        if output_format == "csv":
+            self.csv_writer = csv.DictWriter(file, fieldnames=CSV_FIELDS)
+            self.csv_writer.writeheader()
+
+    def write(self, row):
+        """Write one row and flush it so memory stays flat"""
+        if self.csv_writer is not None:
+            csv_row = dict(row)
+            csv_row["top_matches"] = "; ".join(f"{role}: {score}%" for role, score in row["top_matches"])
+            csv_row["matched_skills"] = "; ".join(row["matched_skills"])
+            csv_row["missing_skills"] = "; ".join(row["missing_skills"])
+            del csv_row["skill_gaps"]
+            self.csv_writer.writerow(csv_row)
+        else:
+            self.file.write(json.dumps(row, ensure_ascii=False) + "\n")
+        self.file.flush()
+
+
+def run_batch(target, output, output_format="csv", workers=None, job_file="job_description.txt", top=5,
+              cache_dir=DEFAULT_CACHE_DIR, charts_dir=None, chart_format="svg", chart_dpi=100,
+              instrumentation=None, max_pages=None, max_chars=None, sandbox_options=None, from_corpus=False,
+              hash_features=None, lsa_dims=None, skills_file=None, dedup=False, dedup_threshold=DEFAULT_THRESHOLD):
+    """Score every resume under target across a process pool, streaming rows to output.
+
+    With from_corpus, target is a CorpusStore and its stored cleaned text is
+    re-scored without opening the original files. With dedup, exact and
+    near-duplicate resumes are clustered first and only one resume per
+    cluster is scored (see _deduplicated_rows).
+    """
+    # Compile the job index once up front so every worker starts with a plain load
+    compiler = ResumeAnalyzer(cache_dir=None, instrumentation=instrumentation, hash_features=hash_features,
+                              lsa_dims=lsa_dims)
+    if not compiler.load_job_descriptions(job_file, verbose=False):
+        return False
+
+    workers = workers or os.cpu_count() or 1
+    trace_memory = instrumentation.trace_memory if instrumentation is not None else None
+    chart_options = None
+    if charts_dir:
+        chart_options = {"charts_dir": charts_dir, "chart_format": chart_format, "dpi": chart_dpi}
+    if from_corpus:
+        # Workers map the same store file, so the text is read from a shared page cache
+        if not os.path.exists(target + ".idx"):
+            print(f"Corpus store '{target}' not found!")
+            return False
+        if lsa_dims:
+            if dedup:
+                print("Deduplication is not applied when re-scoring LSA embeddings; scoring every stored resume.")
+            return score_corpus_embeddings(target, output, output_format, compiler.job_index, top,
+                                           chart_options, instrumentation)
+        corpus_path = target
+        score_task = _score_stored_star
+        tasks = ((position, top) for position in range(len(CorpusStore(target))))
+    else:
+        corpus_path = None
+        score_task = _score_file_star
+        tasks = ((path, top) for path in iter_resume_files(target))
+    staging_dir = None
+    if dedup and not from_corpus:
+        # Unique cleaned text is staged in a temporary corpus store between clustering and scoring
+        staging_dir = tempfile.mkdtemp(prefix="resume_dedup_")
+        corpus_path = os.path.join(staging_dir, "staged.corpus")
+    processed = 0
+    failed = 0
+    duplicates = 0
+    start = time.perf_counter()
+
+    print(f"Scoring resumes from '{target}' with {workers} workers...")
+    try:
+        with open(output, 'w', encoding='utf-8', newline='') as out_file:
+            writer = ResultWriter(out_file, output_format)
+            with multiprocessing.Pool(workers, initializer=init_worker,
+                                      initargs=(job_file, cache_dir, chart_options, trace_memory,
+                                                max(top, DEFAULT_TOP_K), max_pages, max_chars,
+                                                sandbox_options, corpus_path, hash_features, lsa_dims,
+                                                skills_file)) as pool:
+                # Results are written as each resume finishes, in completion order
+                if dedup:
+                    rows = _deduplicated_rows(pool, target, corpus_path, from_corpus, top, dedup_threshold,
+                                              instrumentation)
+                else:
+                    rows = pool.imap_unordered(score_task, tasks, chunksize=64 if from_corpus else 4)
+                for row in rows:
+                    # Worker stage records feed the parent's instrumentation hooks and totals
+                    for record in row.pop("metrics", []):
+                        instrumentation.ingest(record)
+                    writer.write(row)
+                    processed += 1
+                    if row["status"] == "duplicate":
+                        duplicates += 1
+                    elif row["status"] != "ok":
+                        failed += 1
+    finally:
+        if staging_dir is not None:
+            shutil.rmtree(staging_dir, ignore_errors=True)
+
+    elapsed = time.perf_counter() - start
+    skipped = f", {duplicates} duplicates" if dedup else ""
+    print(f"Scored {processed} resumes ({failed} failed{skipped}) in {elapsed:.1f}s. Results saved to '{output}'")
+    return True
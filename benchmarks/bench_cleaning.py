@@ -0,0 +1,76 @@
+"""Compare the original four-pass clean_text with the single-pass cleaner.
+
+Checks that both produce identical output on synthetic resumes and catalog
+sections, then reports the time per document and the speedup as JSON:
+
+    python benchmarks/bench_cleaning.py --documents 2000 --words 4000
+"""
+import argparse
+import json
+import os
+import random
+import re
+import sys
+import time
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_DIR)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from stop_words import ENGLISH_STOP_WORDS  # noqa: E402
+from text_cleaning import clean_text  # noqa: E402
+import synthetic  # noqa: E402
+
+
+def legacy_clean_text(text, stop_words):
+    """The original ResumeAnalyzer.clean_text implementation"""
+    text = text.lower()
+    text = re.sub(r'[^\w\s]', '', text)
+    text = re.sub(r'\d+', '', text)
+    text = re.sub(r'\s+', ' ', text).strip()
+    words = text.split()
+    filtered_words = [word for word in words if word not in stop_words]
+    return ' '.join(filtered_words)
+
+
+def best_of(func, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        timings.append(time.perf_counter() - start)
+    return min(timings), result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="clean_text benchmark")
+    parser.add_argument("--documents", type=int, default=1000)
+    parser.add_argument("--words", type=int, default=2000, help="Words per document (a 40-page CV is ~20k)")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    vocabulary = synthetic.make_vocabulary(rng)
+    documents = [synthetic.make_text(rng, vocabulary, args.words) for _ in range(args.documents)]
+    stop_words = ENGLISH_STOP_WORDS
+
+    legacy_s, legacy = best_of(lambda: [legacy_clean_text(doc, stop_words) for doc in documents], args.repeat)
+    single_s, single = best_of(lambda: [clean_text(doc, stop_words) for doc in documents], args.repeat)
+    if legacy != single:
+        print("Cleaned output differs from the original clean_text!", file=sys.stderr)
+        sys.exit(1)
+
+    print(json.dumps({
+        "benchmark": "clean_text",
+        "documents": args.documents,
+        "words_per_document": args.words,
+        "legacy_ms_per_doc": round(legacy_s / args.documents * 1000, 4),
+        "single_pass_ms_per_doc": round(single_s / args.documents * 1000, 4),
+        "speedup": round(legacy_s / single_s, 2),
+        "identical_output": True,
+    }))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""Compare the native streaming DOCX extractor with docx2txt.
+
+Generates DOCX resumes of a few shapes (plain text, large embedded image,
+large table), checks that extraction.read_docx returns exactly the text
+docx2txt.process returns, and reports the time per file as JSON:
+
+    python benchmarks/bench_docx.py --repeat 5
+"""
+import argparse
+import json
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_DIR)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from extraction import read_docx  # noqa: E402
+import synthetic  # noqa: E402
+
+# name: (words, media_bytes, table_rows)
+SHAPES = {
+    "plain_2k_words": (2000, 0, 0),
+    "image_5mb": (1000, 5 * 1024 * 1024, 0),
+    "table_2000_rows": (500, 0, 2000),
+    "long_40k_words": (40000, 0, 0),
+}
+
+
+def best_of(func, path, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func(path)
+        timings.append(time.perf_counter() - start)
+    return min(timings), result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Native DOCX extraction vs docx2txt")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    import docx2txt
+
+    rng = random.Random(args.seed)
+    vocabulary = synthetic.make_vocabulary(rng)
+    work_dir = tempfile.mkdtemp(prefix="bench_docx_")
+    results = []
+    try:
+        for name, (words, media_bytes, table_rows) in SHAPES.items():
+            text_words = synthetic.make_text(rng, vocabulary, words).split()
+            paragraphs = [" ".join(text_words[i:i + 40]) for i in range(0, len(text_words), 40)]
+            path = os.path.join(work_dir, name + ".docx")
+            synthetic.write_docx(path, paragraphs, header="Jane Doe - Resume", footer="Page 1",
+                                 media_bytes=media_bytes, table_rows=table_rows)
+
+            docx2txt_s, expected = best_of(docx2txt.process, path, args.repeat)
+            native_s, (text, _) = best_of(read_docx, path, args.repeat)
+            if text != expected:
+                print(f"{name}: native text differs from docx2txt!", file=sys.stderr)
+                sys.exit(1)
+            results.append({
+                "shape": name,
+                "file_bytes": os.path.getsize(path),
+                "docx2txt_ms": round(docx2txt_s * 1000, 3),
+                "native_ms": round(native_s * 1000, 3),
+                "speedup": round(docx2txt_s / native_s, 2),
+                "identical_text": True,
+            })
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    print(json.dumps({"benchmark": "docx_extraction", "results": results}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
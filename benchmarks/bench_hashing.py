@@ -0,0 +1,100 @@
+"""Compare the exact (vocabulary) TF-IDF mode with the hashing vectorizer mode.
+
+Fits both on one synthetic catalog, scores the same synthetic resumes and
+reports the accuracy difference (best-role agreement, top-5 overlap and
+similarity error) together with model memory and timings as JSON:
+
+    python benchmarks/bench_hashing.py --roles 2000 --resumes 500 --features 262144 1048576
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_DIR)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import numpy as np  # noqa: E402
+
+from job_index import JobIndex  # noqa: E402
+from stop_words import ENGLISH_STOP_WORDS  # noqa: E402
+from text_cleaning import clean_batch, clean_text  # noqa: E402
+import synthetic  # noqa: E402
+
+
+def fit_model(job_descriptions, hash_features):
+    """Fit one mode; returns (index, fit seconds, traced peak bytes of the fit)"""
+    tracemalloc.start()
+    start = time.perf_counter()
+    job_index = JobIndex(hash_features).fit(job_descriptions)
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return job_index, elapsed, peak
+
+
+def top_roles(similarities, k):
+    return np.argsort(-similarities, axis=1, kind='stable')[:, :k]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Hashing vectorizer vs exact TF-IDF benchmark")
+    parser.add_argument("--roles", type=int, default=1000)
+    parser.add_argument("--resumes", type=int, default=300)
+    parser.add_argument("--words", type=int, default=600, help="Words per resume")
+    parser.add_argument("--features", type=int, nargs="+", default=[2 ** 16, 2 ** 18, 2 ** 20],
+                        help="Column counts of the hashing mode to compare")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    vocabulary = synthetic.make_vocabulary(rng)
+    stop_words = ENGLISH_STOP_WORDS
+    job_texts = [synthetic.make_text(rng, vocabulary, 150) for _ in range(args.roles)]
+    job_descriptions = {f"Role {i}": words for i, words in enumerate(clean_batch(job_texts, stop_words))}
+    resumes = [clean_text(synthetic.make_text(rng, vocabulary, args.words), stop_words)
+               for _ in range(args.resumes)]
+
+    exact, exact_fit_s, exact_peak = fit_model(job_descriptions, None)
+    start = time.perf_counter()
+    exact_scores = exact.score_batch(resumes)
+    exact_score_s = time.perf_counter() - start
+    exact_top = top_roles(exact_scores, 5)
+
+    results = {
+        "benchmark": "hashing_vectorizer",
+        "roles": args.roles,
+        "resumes": args.resumes,
+        "exact": {"terms": len(exact.vocabulary), "fit_s": round(exact_fit_s, 4),
+                  "fit_peak_mb": round(exact_peak / 2 ** 20, 2),
+                  "score_ms_per_resume": round(exact_score_s / args.resumes * 1000, 4)},
+        "hashing": [],
+    }
+    for n_features in args.features:
+        hashed, fit_s, peak = fit_model(job_descriptions, n_features)
+        start = time.perf_counter()
+        scores = hashed.score_batch(resumes)
+        score_s = time.perf_counter() - start
+        top = top_roles(scores, 5)
+        overlap = np.mean([len(set(a) & set(b)) / 5 for a, b in zip(top, exact_top)])
+        error = np.abs(scores - exact_scores)
+        results["hashing"].append({
+            "features": n_features,
+            "fit_s": round(fit_s, 4),
+            "fit_peak_mb": round(peak / 2 ** 20, 2),
+            "score_ms_per_resume": round(score_s / args.resumes * 1000, 4),
+            "best_role_agreement": round(float(np.mean(top[:, 0] == exact_top[:, 0])), 4),
+            "top5_overlap": round(float(overlap), 4),
+            "mean_abs_similarity_error": float(error.mean()),
+            "max_abs_similarity_error": float(error.max()),
+        })
+
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,180 @@
+"""Per-stage benchmark of the resume analysis pipeline.
+
+Generates (or reuses) a synthetic catalog and resume set, times each stage
+separately and writes machine-readable JSON that compare.py can diff:
+
+    python benchmarks/bench_pipeline.py --roles 500 --resumes 200 --out results/base.json
+    python benchmarks/compare.py results/base.json results/new.json
+
+Stages: extraction (PDF/DOCX to raw text), cleaning (clean_text on catalog
+sections and resumes), vectorizing (catalog fit, then per-resume
+transform_tokens), scoring (sparse job-matrix product), normalization and chart
+rendering.
+"""
+import argparse
+import datetime
+import json
+import os
+import platform
+import random
+import re
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_DIR)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from resume_analyzer import ResumeAnalyzer  # noqa: E402
+from job_index import JobIndex  # noqa: E402
+from text_cleaning import vectorizer_tokens  # noqa: E402
+import synthetic  # noqa: E402
+
+
+class StageTimer:
+    """Collect wall-clock samples per stage"""
+
+    def __init__(self):
+        self.samples = {}
+
+    def time(self, stage, func, *args, **kwargs):
+        start = time.perf_counter()
+        result = func(*args, **kwargs)
+        self.samples.setdefault(stage, []).append(time.perf_counter() - start)
+        return result
+
+    def summary(self):
+        stages = {}
+        for stage, samples in self.samples.items():
+            ordered = sorted(samples)
+            stages[stage] = {
+                "count": len(samples),
+                "total_s": round(sum(samples), 6),
+                "mean_ms": round(statistics.mean(samples) * 1000, 4),
+                "p50_ms": round(ordered[len(ordered) // 2] * 1000, 4),
+                "p95_ms": round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))] * 1000, 4),
+                "max_ms": round(ordered[-1] * 1000, 4),
+            }
+        return stages
+
+
+def git_revision():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=REPO_DIR, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return ""
+
+
+def prepare_data(args):
+    """Generate the synthetic data set unless --data-dir points at an existing one"""
+    data_dir = args.data_dir
+    job_file = os.path.join(data_dir, "job_description.txt")
+    resume_dir = os.path.join(data_dir, "resumes")
+    if not os.path.exists(job_file) or not os.path.isdir(resume_dir):
+        vocabulary = synthetic.make_vocabulary(random.Random(args.seed))
+        synthetic.generate_catalog(job_file, args.roles, args.words_per_role, seed=args.seed, vocabulary=vocabulary)
+        synthetic.generate_resumes(resume_dir, args.resumes, args.words_per_resume, args.pdf_ratio,
+                                   seed=args.seed + 1, vocabulary=vocabulary)
+    paths = sorted(os.path.join(resume_dir, name) for name in os.listdir(resume_dir))
+    return job_file, paths
+
+
+def run(args):
+    job_file, paths = prepare_data(args)
+    timer = StageTimer()
+    analyzer = ResumeAnalyzer(cache_dir=None)
+
+    # Catalog: parse, clean every section, fit the shared TF-IDF model
+    with open(job_file, 'r', encoding='utf-8') as file:
+        content = file.read()
+    sections = split_catalog(content)
+    job_words = timer.time("cleaning_catalog", analyzer.clean_batch, [text for _, text in sections])
+    job_index = timer.time("vectorizing_fit", JobIndex().fit, dict(zip([role for role, _ in sections], job_words)))
+    analyzer.job_index = job_index
+    analyzer.job_descriptions = job_index.job_descriptions()
+
+    # Resumes: every stage timed per document
+    n_characters = 0
+    for path in paths:
+        raw_text = timer.time("extraction", analyzer.read_resume_file, path)
+        n_characters += len(raw_text)
+        resume_text = timer.time("cleaning", analyzer.clean_text, raw_text)
+        vector = timer.time("vectorizing", lambda: job_index.transform_tokens(vectorizer_tokens(resume_text)))
+        similarities = timer.time("scoring", lambda: (job_index.job_matrix @ vector.T).toarray().ravel())
+        analyzer.job_matches = {role: round(similarity * 100) for role, similarity in zip(job_index.roles, similarities)}
+        analyzer.normalized_job_matches = {}
+        timer.time("normalization", analyzer.normalize_job_matches)
+
+    # Charts are slow, so only a sample is rendered in each format
+    if args.chart_samples:
+        from charts import render_chart_file
+        chart_dir = os.path.join(args.data_dir, "charts")
+        os.makedirs(chart_dir, exist_ok=True)
+        roles = list(analyzer.normalized_job_matches.keys())[:6]
+        scores = list(analyzer.normalized_job_matches.values())[:6]
+        for i in range(args.chart_samples):
+            timer.time("chart_png", render_chart_file, roles, scores, os.path.join(chart_dir, f"{i}.png"), dpi=300)
+            timer.time("chart_svg", render_chart_file, roles, scores, os.path.join(chart_dir, f"{i}.svg"))
+
+    return {
+        "benchmark": "pipeline",
+        "timestamp": datetime.datetime.now().isoformat(timespec="seconds"),
+        "git_revision": git_revision(),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "params": {
+            "roles": len(job_index.roles), "resumes": len(paths), "words_per_role": args.words_per_role,
+            "words_per_resume": args.words_per_resume, "pdf_ratio": args.pdf_ratio, "seed": args.seed,
+            "resume_characters": n_characters, "vocabulary_size": len(job_index.vocabulary),
+        },
+        "stages": timer.summary(),
+    }
+
+
+def split_catalog(content):
+    """Split a catalog into (role, text) pairs the same way load_job_descriptions does"""
+    sections = re.split(r'={5}\s+(.*?)\s+={5}', content)[1:]
+    return [(sections[i].strip(), sections[i + 1].strip()) for i in range(0, len(sections) - 1, 2)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Per-stage resume pipeline benchmark")
+    parser.add_argument("--roles", type=int, default=100, help="Catalog size (10 to 10,000 roles)")
+    parser.add_argument("--resumes", type=int, default=100, help="Number of resumes (1 to 100k)")
+    parser.add_argument("--words-per-role", type=int, default=150)
+    parser.add_argument("--words-per-resume", type=int, default=600)
+    parser.add_argument("--pdf-ratio", type=float, default=0.5)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--chart-samples", type=int, default=3, help="Charts rendered per format (0 to skip)")
+    parser.add_argument("--data-dir", default=None, help="Reuse/generate the data set here instead of a temp dir")
+    parser.add_argument("--out", default=None, help="Write the JSON result to this file (default: stdout)")
+    args = parser.parse_args()
+
+    # A generated temporary data set is removed afterwards; --data-dir is kept
+    temp_dir = None
+    if args.data_dir is None:
+        temp_dir = args.data_dir = tempfile.mkdtemp(prefix="resume_bench_")
+    try:
+        result = run(args)
+    finally:
+        if temp_dir is not None:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+    output = json.dumps(result, indent=2)
+    if args.out:
+        directory = os.path.dirname(args.out)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(args.out, 'w', encoding='utf-8') as file:
+            file.write(output + "\n")
+        print(f"Results written to {args.out}")
+    else:
+        print(output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""Measure the cold import time of resume_analyzer.
+
+Runs ``python -c "import resume_analyzer"`` in fresh interpreters and
+reports the median wall time, optionally failing when it exceeds a budget:
+
+    python benchmarks/bench_startup.py --runs 10 --budget 0.3
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def time_import(module, runs):
+    """Return wall times of importing module in `runs` fresh interpreters"""
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, "-c", f"import {module}"], cwd=REPO_DIR, check=True,
+                       stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Cold import time benchmark")
+    parser.add_argument("--module", default="resume_analyzer", help="Module to import")
+    parser.add_argument("--runs", type=int, default=5, help="Number of fresh interpreters to time")
+    parser.add_argument("--budget", type=float, default=None, help="Fail if the median exceeds this many seconds")
+    args = parser.parse_args()
+
+    baseline = statistics.median(time_import("sys", args.runs))
+    timings = time_import(args.module, args.runs)
+    median = statistics.median(timings)
+    result = {
+        "benchmark": "startup",
+        "module": args.module,
+        "runs": args.runs,
+        "median_s": round(median, 4),
+        "min_s": round(min(timings), 4),
+        "interpreter_s": round(baseline, 4),
+        "import_s": round(median - baseline, 4),
+    }
+    print(json.dumps(result))
+
+    if args.budget is not None and median > args.budget:
+        print(f"Import time {median:.3f}s exceeds budget of {args.budget:.3f}s", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
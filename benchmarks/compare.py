@@ -0,0 +1,48 @@
+"""Compare two benchmark result files stage by stage.
+
+    python benchmarks/compare.py results/base.json results/new.json
+
+Prints the mean time per stage in both runs and the relative change, and
+exits non-zero when any stage got slower than --threshold (a fraction).
+"""
+import argparse
+import json
+import sys
+
+
+def load(path):
+    with open(path, 'r', encoding='utf-8') as file:
+        return json.load(file)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare two benchmark result files")
+    parser.add_argument("baseline")
+    parser.add_argument("candidate")
+    parser.add_argument("--metric", default="mean_ms", help="Stage metric to compare (mean_ms, p50_ms, p95_ms, total_s)")
+    parser.add_argument("--threshold", type=float, default=None, help="Fail if a stage regresses by more than this fraction")
+    args = parser.parse_args()
+
+    baseline = load(args.baseline)["stages"]
+    candidate = load(args.candidate)["stages"]
+
+    regressions = []
+    print(f"{'stage':<20}{'baseline':>14}{'candidate':>14}{'change':>10}")
+    for stage in sorted(set(baseline) | set(candidate)):
+        before = baseline.get(stage, {}).get(args.metric)
+        after = candidate.get(stage, {}).get(args.metric)
+        if before is None or after is None:
+            print(f"{stage:<20}{str(before):>14}{str(after):>14}{'n/a':>10}")
+            continue
+        change = (after - before) / before if before else 0.0
+        print(f"{stage:<20}{before:>14.4f}{after:>14.4f}{change:>+10.1%}")
+        if args.threshold is not None and change > args.threshold:
+            regressions.append(stage)
+
+    if regressions:
+        print(f"Regressed beyond {args.threshold:.0%}: {', '.join(regressions)}", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
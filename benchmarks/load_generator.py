@@ -0,0 +1,132 @@
+"""Local load generator for the asyncio scoring service.
+
+Keeps ``--concurrency`` keep-alive connections busy uploading resumes to
+``POST /score`` and reports latency percentiles and throughput as JSON:
+
+    python resume_analyzer.py serve-http --jobs bench_data/job_description.txt &
+    python benchmarks/load_generator.py --resumes bench_data/resumes --requests 2000 --concurrency 64
+
+Without ``--resumes`` it uploads synthetic resume text (``kind=text``), which
+measures cleaning, batching and scoring without PDF/DOCX parsing.
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import synthetic  # noqa: E402
+
+
+def load_payloads(resumes_dir, count, words, seed):
+    """(name, bytes) uploads: files from resumes_dir, or synthetic text"""
+    if resumes_dir:
+        payloads = []
+        for filename in sorted(os.listdir(resumes_dir)):
+            if filename.lower().endswith((".pdf", ".docx")):
+                with open(os.path.join(resumes_dir, filename), 'rb') as file:
+                    payloads.append((filename, file.read()))
+        return payloads
+    rng = random.Random(seed)
+    vocabulary = synthetic.make_vocabulary(rng)
+    return [(f"resume_{i}.txt", synthetic.make_text(rng, vocabulary, words).encode('utf-8'))
+            for i in range(min(count, 200))]
+
+
+async def post(reader, writer, host, path, body):
+    """Send one keep-alive POST and return (status, parsed JSON body)"""
+    writer.write((f"POST {path} HTTP/1.1\r\nHost: {host}\r\nContent-Length: {len(body)}\r\n"
+                  "Connection: keep-alive\r\n\r\n").encode('latin-1') + body)
+    await writer.drain()
+    status = int((await reader.readline()).split()[1])
+    length = 0
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b"\n", b""):
+            break
+        name, _, value = line.decode('latin-1').partition(":")
+        if name.strip().lower() == "content-length":
+            length = int(value)
+    return status, json.loads(await reader.readexactly(length))
+
+
+async def connection_worker(host, port, payloads, counter, total, latencies, errors):
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        while counter[0] < total:
+            i = counter[0]
+            counter[0] += 1
+            name, body = payloads[i % len(payloads)]
+            kind = "&kind=text" if name.endswith(".txt") else ""
+            start = time.perf_counter()
+            status, row = await post(reader, writer, host, f"/score?name={name}{kind}", body)
+            latencies.append(time.perf_counter() - start)
+            if status != 200 or row.get("status") != "ok":
+                errors.append(row.get("error", status))
+    finally:
+        writer.close()
+
+
+def percentile(sorted_values, fraction):
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(len(sorted_values) - 1, int(round(fraction * (len(sorted_values) - 1))))]
+
+
+async def run_load(host, port, payloads, total, concurrency):
+    latencies = []
+    errors = []
+    counter = [0]
+    start = time.perf_counter()
+    await asyncio.gather(*(connection_worker(host, port, payloads, counter, total, latencies, errors)
+                           for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+
+    reader, writer = await asyncio.open_connection(host, port)
+    writer.write(f"GET /health HTTP/1.1\r\nHost: {host}\r\nConnection: close\r\n\r\n".encode('latin-1'))
+    await writer.drain()
+    response = await reader.read()
+    writer.close()
+    health = json.loads(response.split(b"\r\n\r\n", 1)[1])
+    return latencies, errors, elapsed, health
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load generator for resume_analyzer.py serve-http")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8766)
+    parser.add_argument("--resumes", default=None, help="Directory of PDF/DOCX resumes to upload")
+    parser.add_argument("--requests", type=int, default=1000)
+    parser.add_argument("--concurrency", type=int, default=32, help="Number of concurrent connections")
+    parser.add_argument("--words", type=int, default=600, help="Words per synthetic resume")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    payloads = load_payloads(args.resumes, args.requests, args.words, args.seed)
+    if not payloads:
+        print("No resumes to upload!", file=sys.stderr)
+        sys.exit(1)
+    latencies, errors, elapsed, health = asyncio.run(
+        run_load(args.host, args.port, payloads, args.requests, args.concurrency))
+
+    latencies.sort()
+    print(json.dumps({
+        "benchmark": "serve_http",
+        "requests": len(latencies),
+        "concurrency": args.concurrency,
+        "errors": len(errors),
+        "throughput_rps": round(len(latencies) / elapsed, 1) if elapsed else 0.0,
+        "p50_ms": round(percentile(latencies, 0.50) * 1000, 2),
+        "p99_ms": round(percentile(latencies, 0.99) * 1000, 2),
+        "max_ms": round(latencies[-1] * 1000, 2) if latencies else 0.0,
+        "server_batches": health.get("batches"),
+        "server_largest_batch": health.get("largest_batch"),
+    }))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,189 @@
+"""Synthetic resumes and job catalogs for benchmarks.
+
+Generates ``===== ROLE =====`` job description files and PDF/DOCX resumes
+of configurable size without any extra dependencies (the PDF and DOCX
+writers below emit the minimal valid structure PyPDF2 and docx2txt read):
+
+    python benchmarks/synthetic.py --roles 500 --resumes 1000 --out bench_data
+"""
+import argparse
+import os
+import random
+import zipfile
+from xml.sax.saxutils import escape
+
+SKILL_WORDS = [
+    "python", "java", "javascript", "typescript", "sql", "nosql", "react", "angular", "django", "flask",
+    "spring", "docker", "kubernetes", "terraform", "aws", "azure", "gcp", "linux", "git", "jenkins",
+    "pandas", "numpy", "tensorflow", "pytorch", "statistics", "regression", "forecasting", "tableau",
+    "excel", "marketing", "sales", "accounting", "payroll", "recruiting", "negotiation", "leadership",
+    "scrum", "agile", "kanban", "budgeting", "compliance", "auditing", "logistics", "procurement",
+    "networking", "security", "firewalls", "penetration", "testing", "automation", "selenium", "figma",
+    "photoshop", "illustrator", "copywriting", "seo", "analytics", "crm", "salesforce", "sap", "erp",
+    "nursing", "pharmacy", "radiology", "teaching", "curriculum", "welding", "carpentry", "plumbing",
+]
+FILLER_WORDS = [
+    "experience", "managed", "developed", "team", "project", "years", "responsible", "designed",
+    "improved", "delivered", "customers", "stakeholders", "requirements", "solutions", "quality",
+    "performance", "the", "and", "with", "for", "in", "of", "to", "on", "our", "we", "is", "a",
+]
+
+
+def make_vocabulary(rng, size=5000):
+    """Skill words plus deterministic pseudo-words to reach the requested size"""
+    vocabulary = list(SKILL_WORDS)
+    letters = "abcdefghijklmnopqrstuvwxyz"
+    while len(vocabulary) < size:
+        vocabulary.append("".join(rng.choice(letters) for _ in range(rng.randint(4, 10))))
+    return vocabulary
+
+
+def make_text(rng, vocabulary, n_words):
+    """Random resume/job text mixing skills, filler words and numbers"""
+    words = []
+    for _ in range(n_words):
+        roll = rng.random()
+        if roll < 0.45:
+            words.append(rng.choice(FILLER_WORDS))
+        elif roll < 0.95:
+            words.append(rng.choice(vocabulary))
+        else:
+            words.append(str(rng.randint(1, 2025)) + rng.choice([",", ".", "%", ""]))
+    return " ".join(words)
+
+
+def generate_catalog(path, n_roles, words_per_role=150, seed=0, vocabulary=None):
+    """Write a job catalog with n_roles ``===== ROLE =====`` sections"""
+    rng = random.Random(seed)
+    vocabulary = vocabulary or make_vocabulary(rng)
+    with open(path, 'w', encoding='utf-8') as file:
+        for i in range(n_roles):
+            file.write(f"===== Role {i:05d} =====\n")
+            file.write(make_text(rng, vocabulary, words_per_role) + "\n\n")
+    return path
+
+
+def write_docx(path, paragraphs, header=None, footer=None, media_bytes=0, table_rows=0):
+    """Write a minimal DOCX containing the given paragraphs.
+
+    Optionally adds a header/footer part, an incompressible image of
+    media_bytes under word/media and a table_rows x 4 table, as real resumes
+    often have.
+    """
+    body = "".join(f"<w:p><w:r><w:t>{escape(paragraph)}</w:t></w:r></w:p>" for paragraph in paragraphs)
+    if table_rows:
+        cell = "<w:tc><w:p><w:r><w:t>cell</w:t><w:tab/><w:t>{}</w:t></w:r></w:p></w:tc>"
+        rows = "".join("<w:tr>" + "".join(cell.format(row * 4 + column) for column in range(4)) + "</w:tr>"
+                       for row in range(table_rows))
+        body += f"<w:tbl>{rows}</w:tbl>"
+    document = ('<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+                '<w:document xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main">'
+                f'<w:body>{body}</w:body></w:document>')
+    content_types = ('<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+                     '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+                     '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+                     '<Default Extension="xml" ContentType="application/xml"/>'
+                     '<Override PartName="/word/document.xml" ContentType="application/'
+                     'vnd.openxmlformats-officedocument.wordprocessingml.document.main+xml"/></Types>')
+    rels = ('<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+            '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+            '<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/'
+            'relationships/officeDocument" Target="word/document.xml"/></Relationships>')
+    with zipfile.ZipFile(path, 'w', zipfile.ZIP_DEFLATED) as docx:
+        docx.writestr("[Content_Types].xml", content_types)
+        docx.writestr("_rels/.rels", rels)
+        docx.writestr("word/document.xml", document)
+        for part, text in (("word/header1.xml", header), ("word/footer1.xml", footer)):
+            if text is not None:
+                tag = "hdr" if "header" in part else "ftr"
+                docx.writestr(part, '<w:{0} xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main">'
+                                    '<w:p><w:r><w:t>{1}</w:t><w:br/></w:r></w:p></w:{0}>'.format(tag, escape(text)))
+        if media_bytes:
+            docx.writestr("word/media/image1.png", os.urandom(media_bytes), zipfile.ZIP_STORED)
+
+
+def _pdf_escape(text):
+    return text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+
+def write_pdf(path, lines, lines_per_page=45):
+    """Write a minimal multi-page PDF (Helvetica text) containing the given lines"""
+    pages = [lines[i:i + lines_per_page] for i in range(0, len(lines), lines_per_page)] or [[]]
+    objects = []
+
+    def add(obj):
+        objects.append(obj)
+        return len(objects)
+
+    catalog = add(None)
+    pages_obj = add(None)
+    font = add(b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>")
+    page_ids = []
+    for page_lines in pages:
+        stream = "BT /F1 10 Tf 50 780 Td 14 TL " + " ".join(
+            f"({_pdf_escape(line)}) Tj T*" for line in page_lines) + " ET"
+        data = stream.encode('latin-1', errors='replace')
+        content = add(b"<< /Length %d >>\nstream\n" % len(data) + data + b"\nendstream")
+        page_ids.append(add(
+            f"<< /Type /Page /Parent {pages_obj} 0 R /MediaBox [0 0 612 842] "
+            f"/Resources << /Font << /F1 {font} 0 R >> >> /Contents {content} 0 R >>".encode('ascii')))
+    objects[catalog - 1] = f"<< /Type /Catalog /Pages {pages_obj} 0 R >>".encode('ascii')
+    kids = " ".join(f"{page_id} 0 R" for page_id in page_ids)
+    objects[pages_obj - 1] = f"<< /Type /Pages /Kids [{kids}] /Count {len(page_ids)} >>".encode('ascii')
+
+    output = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, obj in enumerate(objects, 1):
+        offsets.append(len(output))
+        output += b"%d 0 obj\n" % number + obj + b"\nendobj\n"
+    xref = len(output)
+    output += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    for offset in offsets:
+        output += b"%010d 00000 n \n" % offset
+    output += b"trailer\n<< /Size %d /Root %d 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, catalog, xref)
+    with open(path, 'wb') as file:
+        file.write(output)
+
+
+def generate_resumes(directory, n_resumes, words_per_resume=600, pdf_ratio=0.5, seed=1, vocabulary=None):
+    """Write n_resumes PDF/DOCX resumes into directory and return their paths"""
+    rng = random.Random(seed)
+    vocabulary = vocabulary or make_vocabulary(random.Random(0))
+    os.makedirs(directory, exist_ok=True)
+    paths = []
+    for i in range(n_resumes):
+        text = make_text(rng, vocabulary, words_per_resume)
+        words = text.split()
+        lines = [" ".join(words[j:j + 12]) for j in range(0, len(words), 12)]
+        if rng.random() < pdf_ratio:
+            path = os.path.join(directory, f"resume_{i:06d}.pdf")
+            write_pdf(path, lines)
+        else:
+            path = os.path.join(directory, f"resume_{i:06d}.docx")
+            write_docx(path, lines)
+        paths.append(path)
+    return paths
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate synthetic resumes and a job catalog")
+    parser.add_argument("--roles", type=int, default=50, help="Number of roles in the catalog (10 to 10,000)")
+    parser.add_argument("--resumes", type=int, default=100, help="Number of resumes (1 to 100k)")
+    parser.add_argument("--words-per-role", type=int, default=150)
+    parser.add_argument("--words-per-resume", type=int, default=600)
+    parser.add_argument("--pdf-ratio", type=float, default=0.5, help="Fraction of resumes written as PDF")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--out", default="bench_data", help="Output directory")
+    args = parser.parse_args()
+
+    os.makedirs(args.out, exist_ok=True)
+    vocabulary = make_vocabulary(random.Random(args.seed))
+    catalog = generate_catalog(os.path.join(args.out, "job_description.txt"), args.roles,
+                               args.words_per_role, seed=args.seed, vocabulary=vocabulary)
+    paths = generate_resumes(os.path.join(args.out, "resumes"), args.resumes, args.words_per_resume,
+                             args.pdf_ratio, seed=args.seed + 1, vocabulary=vocabulary)
+    print(f"Wrote {catalog} ({args.roles} roles) and {len(paths)} resumes to {args.out}")
+
+
+if __name__ == "__main__":
+    main()
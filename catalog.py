@@ -0,0 +1,93 @@
+import csv
+import json
+import os
+import re
+
+# A section header such as "===== Data Scientist ====="
+HEADER_PATTERN = re.compile(r'={5}\s+(.*?)\s+={5}')
+
+# Column/key names accepted for JSONL and CSV catalogs
+ROLE_FIELDS = ("role", "title", "name")
+TEXT_FIELDS = ("description", "text", "job_description")
+
+
+def iter_sections(file):
+    """Yield (role, text) for each ``===== ROLE =====`` section of a text file object.
+
+    Lines are read one at a time and only the current section is buffered,
+    so memory stays proportional to the largest section, not the file.
+    Text before the first header is ignored, as it always has been.
+    """
+    role = None
+    lines = []
+    for line in file:
+        match = HEADER_PATTERN.search(line)
+        while match:
+            if role is not None:
+                lines.append(line[:match.start()])
+                yield role, "".join(lines).strip()
+            role = match.group(1).strip()
+            lines = []
+            line = line[match.end():]
+            match = HEADER_PATTERN.search(line)
+        if role is not None:
+            lines.append(line)
+    if role is not None:
+        yield role, "".join(lines).strip()
+
+
+def _pick(record, fields):
+    for field in fields:
+        value = record.get(field)
+        if value is not None:
+            return str(value)
+    return None
+
+
+def iter_jsonl(file):
+    """Yield (role, text) from JSON lines such as {"role": ..., "description": ...}"""
+    for line_number, line in enumerate(file, 1):
+        if not line.strip():
+            continue
+        record = json.loads(line)
+        role = _pick(record, ROLE_FIELDS)
+        text = _pick(record, TEXT_FIELDS)
+        if role is None or text is None:
+            raise ValueError(f"line {line_number}: expected a role and a description field")
+        yield role.strip(), text.strip()
+
+
+def iter_csv(file):
+    """Yield (role, text) from a CSV file with a header row (role, description)"""
+    # Long descriptions exceed the csv module's default 128 KB field limit
+    csv.field_size_limit(max(csv.field_size_limit(), 2**31 - 1))
+    reader = csv.DictReader(file)
+    for record in reader:
+        role = _pick(record, ROLE_FIELDS)
+        text = _pick(record, TEXT_FIELDS)
+        if role is None or text is None:
+            raise ValueError(f"line {reader.line_num}: expected a role and a description column")
+        yield role.strip(), text.strip()
+
+
+def catalog_format(path):
+    """'jsonl', 'csv' or 'sections' (the ===== ROLE ===== text format), from the extension"""
+    extension = os.path.splitext(path)[1].lower()
+    if extension in (".jsonl", ".ndjson"):
+        return "jsonl"
+    if extension == ".csv":
+        return "csv"
+    return "sections"
+
+
+def iter_catalog(path):
+    """Stream (role, text) pairs from a job catalog in any supported format"""
+    catalog = catalog_format(path)
+    # newline='' lets the csv module handle quoted newlines itself
+    with open(path, 'r', encoding='utf-8', newline='' if catalog == "csv" else None) as file:
+        if catalog == "jsonl":
+            yield from iter_jsonl(file)
+        elif catalog == "csv":
+            yield from iter_csv(file)
+        else:
+            yield from iter_sections(file)
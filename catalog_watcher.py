@@ -0,0 +1,44 @@
+import os
+import threading
+
+
+class CatalogWatcher:
+    """Detects edits to the job description file by polling its mtime and size.
+
+    Polling keeps this dependency-free and works on every platform; a stat
+    call every second or two costs nothing next to a reload.
+    """
+
+    def __init__(self, path="job_description.txt"):
+        self.path = path
+        self.stamp = self._stamp()
+
+    def _stamp(self):
+        try:
+            stat = os.stat(self.path)
+        except OSError:
+            return None
+        return (stat.st_mtime_ns, stat.st_size)
+
+    def check(self):
+        """Return True (once) if the file changed since the last check"""
+        stamp = self._stamp()
+        if stamp is None or stamp == self.stamp:
+            return False
+        self.stamp = stamp
+        return True
+
+    def start(self, callback, interval=1.0):
+        """Call callback() from a daemon thread after each change; returns the stop event"""
+        stop_event = threading.Event()
+
+        def watch():
+            while not stop_event.wait(interval):
+                if self.check():
+                    try:
+                        callback()
+                    except Exception as e:
+                        print(f"Error reloading job descriptions: {e}")
+
+        threading.Thread(target=watch, daemon=True).start()
+        return stop_event
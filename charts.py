@@ -0,0 +1,130 @@
+import colorsys
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+from scoring import OTHER_LABEL
+
+# Same colors for the pie chart in the GUI and in saved charts: ten roles by
+# default (no gray among them), and light gray only for the "Other" bucket
+ROLE_COLORS = ['#1f77b4', '#ff7f0e', '#2ca02c', '#d62728', '#9467bd', '#8c564b',
+               '#e377c2', '#393b79', '#bcbd22', '#17becf']
+OTHER_COLOR = '#c7c7c7'
+_OTHER_PREFIX = OTHER_LABEL.split("{")[0]
+
+
+def chart_colors(roles):
+    """One distinct color per role label, and OTHER_COLOR for the "Other" bucket.
+
+    More roles than ROLE_COLORS (``--top-k`` above 10) get evenly spaced
+    hues instead of a repeating palette.
+    """
+    n_roles = sum(not role.startswith(_OTHER_PREFIX) for role in roles)
+    palette = ROLE_COLORS
+    if n_roles > len(ROLE_COLORS):
+        palette = ['#%02x%02x%02x' % tuple(round(channel * 255) for channel in
+                                           colorsys.hsv_to_rgb(i / n_roles, 0.65, 0.85))
+                   for i in range(n_roles)]
+    colors = iter(palette)
+    return [OTHER_COLOR if role.startswith(_OTHER_PREFIX) else next(colors) for role in roles]
+
+
+def draw_pie(figure, ax, roles, scores, facecolor="#e8eef1", title='Resume Match Analysis'):
+    """Draw the match pie chart onto an existing figure/axes, replacing the old wedges"""
+    ax.clear()
+
+    # Create pie chart with improved styling
+    wedges, texts, autotexts = ax.pie(
+        scores,
+        labels=None,  # Remove labels from pie to avoid overlap
+        autopct='%1.1f%%',
+        startangle=90,
+        shadow=True,
+        colors=chart_colors(roles),
+        wedgeprops={'edgecolor': 'white', 'linewidth': 1, 'antialiased': True},
+        textprops={'fontsize': 9}
+    )
+
+    # Customize text appearance
+    for autotext in autotexts:
+        autotext.set_fontsize(9)
+        autotext.set_fontweight('bold')
+        autotext.set_color('white')
+
+    # Add title with proper formatting
+    ax.set_title(title, fontsize=12, fontweight='bold', pad=10)
+
+    # Add legend outside the pie for better positioning
+    ax.legend(wedges, roles, title="Career Roles",
+              loc="center left",
+              bbox_to_anchor=(1, 0.5),
+              fontsize=8,
+              title_fontsize=9)
+
+    # Adjust subplot to give more room for the legend
+    figure.subplots_adjust(right=0.65)
+
+    # Set background color of the chart
+    figure.patch.set_facecolor(facecolor)
+    ax.set_facecolor(facecolor)
+
+
+class ChartRenderer:
+    """One reusable Figure for the on-screen chart.
+
+    The figure is created once and each analysis only clears and redraws the
+    axes, so nothing accumulates in pyplot's figure registry over a long
+    session. The figure is deliberately not created through pyplot.
+    """
+
+    def __init__(self, figsize=(7, 6), facecolor="#e8eef1"):
+        self.facecolor = facecolor
+        self.figure = Figure(figsize=figsize, tight_layout=True)
+        self.ax = self.figure.add_subplot(111)
+
+    def draw(self, roles, scores):
+        """Redraw the chart in place with new data"""
+        draw_pie(self.figure, self.ax, roles, scores, facecolor=self.facecolor)
+
+
+def render_chart_file(roles, scores, path, dpi=300, facecolor="#e8eef1"):
+    """Render the match chart straight to a PNG/SVG/PDF file with the Agg backend.
+
+    A fresh, pyplot-free figure is used so this is safe to call from a
+    worker thread or process; the format follows the file extension (SVG is
+    the cheap option for bulk exports, as is a lower dpi for PNG).
+    """
+    figure = Figure(figsize=(7, 6), tight_layout=True)
+    FigureCanvasAgg(figure)
+    ax = figure.add_subplot(111)
+    draw_pie(figure, ax, roles, scores, facecolor=facecolor)
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    figure.savefig(path, dpi=dpi, bbox_inches='tight')
+    return path
+
+
+class ChartSaver:
+    """Save charts on a single background thread so the UI never blocks on savefig"""
+
+    def __init__(self):
+        self._executor = None
+        self._lock = threading.Lock()
+
+    def submit(self, roles, scores, path, dpi=300, facecolor="#e8eef1"):
+        """Queue a chart export and return its Future"""
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="chart-saver")
+        return self._executor.submit(render_chart_file, list(roles), list(scores), path, dpi, facecolor)
+
+    def shutdown(self):
+        """Wait for pending exports and stop the thread"""
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=True)
+                self._executor = None
@@ -0,0 +1,201 @@
+import mmap
+import os
+
+import numpy as np
+
+# One index record per document: where its bytes start in the data file and
+# the UTF-8 lengths of its id and of its cleaned text
+INDEX_DTYPE = np.dtype([("offset", "<u8"), ("id_length", "<u4"), ("length", "<u4")])
+
+
+class CorpusStore:
+    """Append-only, memory-mapped store of cleaned resume text.
+
+    ``path`` holds the documents back to back (each one's UTF-8 id followed
+    by its ``clean_text`` output) and ``path + ".idx"`` holds one fixed-size
+    INDEX_DTYPE record per document. The index record is written after the
+    data, so a crash mid-append leaves at most an unindexed tail, which is
+    truncated on the next write. Readers map the data file, so worker
+    processes share one copy in the page cache and slices are zero-copy.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.index_path = path + ".idx"
+        self.records = np.zeros(0, dtype=INDEX_DTYPE)
+        self._positions = None
+        self._file = None
+        self._map = None
+        self._pending = []
+        self._end = 0
+        self.reload()
+
+    def reload(self):
+        """Re-read the index (picks up documents appended by another process)"""
+        self.close()
+        if os.path.exists(self.index_path):
+            size = os.path.getsize(self.index_path)
+            self.records = np.fromfile(self.index_path, dtype=INDEX_DTYPE,
+                                       count=size // INDEX_DTYPE.itemsize)
+        self._positions = None
+        last = self.records[-1] if len(self.records) else None
+        self._end = int(last["offset"] + last["id_length"] + last["length"]) if last is not None else 0
+
+    def __len__(self):
+        return len(self.records) + len(self._pending)
+
+    def __contains__(self, doc_id):
+        return doc_id in self.positions()
+
+    def positions(self):
+        """doc_id -> position, built on first use"""
+        if self._positions is None:
+            self._positions = {self.doc_id(i): i for i in range(len(self))}
+        return self._positions
+
+    def _buffer(self):
+        self.flush()
+        if self._map is None or len(self._map) < self._end:
+            # A map that is too short is just dropped: views of it may still be alive
+            with open(self.path, 'rb') as file:
+                self._map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) if self._end else b""
+        return self._map
+
+    def raw(self, i):
+        """(id bytes, text bytes) of document i as zero-copy memoryviews of the mapped file"""
+        buffer = memoryview(self._buffer())
+        offset, id_length, length = (int(value) for value in self.records[i])
+        return buffer[offset:offset + id_length], buffer[offset + id_length:offset + id_length + length]
+
+    def doc_id(self, i):
+        return bytes(self.raw(i)[0]).decode('utf-8')
+
+    def text(self, i):
+        """Cleaned text of document i"""
+        return str(self.raw(i)[1], 'utf-8')
+
+    def get(self, doc_id):
+        """Cleaned text stored for doc_id, or None"""
+        i = self.positions().get(doc_id)
+        return self.text(i) if i is not None else None
+
+    def iter_documents(self, start=0, stop=None):
+        """Yield (doc_id, cleaned text) for documents [start, stop)"""
+        stop = len(self) if stop is None else min(stop, len(self))
+        for i in range(start, stop):
+            doc_id, text = self.raw(i)
+            yield str(doc_id, 'utf-8'), str(text, 'utf-8')
+
+    def append(self, doc_id, cleaned_text):
+        """Add one document; returns False if doc_id is already stored"""
+        positions = self.positions()
+        if doc_id in positions:
+            return False
+        if self._file is None:
+            self._open_for_append()
+        id_bytes = doc_id.encode('utf-8')
+        text_bytes = cleaned_text.encode('utf-8')
+        self._file.write(id_bytes)
+        self._file.write(text_bytes)
+        self._pending.append((self._end, len(id_bytes), len(text_bytes)))
+        self._end += len(id_bytes) + len(text_bytes)
+        positions[doc_id] = len(self) - 1
+        return True
+
+    def _open_for_append(self):
+        # Drop any unindexed tail left by an interrupted append
+        self._file = open(self.path, 'ab')
+        if self._file.tell() != self._end:
+            self._file.truncate(self._end)
+            self._file.seek(self._end)
+
+    def flush(self):
+        """Make appended documents durable and readable (data first, then the index)"""
+        if not self._pending:
+            return
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        pending = np.array(self._pending, dtype=INDEX_DTYPE)
+        with open(self.index_path, 'ab') as index_file:
+            # Likewise drop a partial record from an interrupted index write
+            if index_file.tell() != self.records.nbytes:
+                index_file.truncate(self.records.nbytes)
+                index_file.seek(self.records.nbytes)
+            index_file.write(pending.tobytes())
+        self.records = np.concatenate([self.records, pending])
+        self._pending = []
+
+    def close(self):
+        """Flush pending documents and release the file and the mapping"""
+        self.flush()
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        if isinstance(self._map, mmap.mmap):
+            try:
+                self._map.close()
+            except BufferError:
+                # Views returned by raw() are still alive; the map closes with them
+                pass
+        self._map = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def store_files(store, paths, workers=None, cache_dir=None, max_pages=None, max_chars=None, sandbox_options=None):
+    """Extract and clean resumes in parallel and append the ones not yet stored"""
+    import multiprocessing
+    from resume_index import extract_clean_text, init_extract_worker
+
+    paths = (path for path in paths if path not in store)
+    added = 0
+    failed = 0
+    with multiprocessing.Pool(workers or os.cpu_count() or 1, initializer=init_extract_worker,
+                              initargs=(cache_dir, max_pages, max_chars, sandbox_options)) as pool:
+        for path, text in pool.imap_unordered(extract_clean_text, paths, chunksize=8):
+            if text is None:
+                failed += 1
+            elif store.append(path, text):
+                added += 1
+    store.flush()
+    return added, failed
+
+
+def cached_embeddings(store, job_index, chunk_size=4096):
+    """LSA embeddings of every stored document, cached next to the store.
+
+    The cache is a float32 ``.npy`` file named after the job index's
+    embedding key, so a new projection never reuses stale vectors.
+    Documents appended since the cache was written are embedded and the
+    file is extended; the result is a read-only memory map.
+    """
+    path = f"{store.path}.{job_index.embedding_key()}.emb.npy"
+    n_documents = len(store)
+    dims = job_index.projection.shape[1]
+    cached = None
+    if os.path.exists(path):
+        cached = np.load(path, mmap_mode='r')
+        if cached.ndim != 2 or cached.shape[1] != dims:
+            cached = None
+    if n_documents == 0:
+        return np.zeros((0, dims), dtype=np.float32)
+    done = len(cached) if cached is not None else 0
+    if done >= n_documents:
+        return cached[:n_documents]
+
+    tmp_path = path + ".tmp"
+    embeddings = np.lib.format.open_memmap(tmp_path, mode='w+', dtype=np.float32, shape=(n_documents, dims))
+    if done:
+        embeddings[:done] = cached
+    del cached
+    for start in range(done, n_documents, chunk_size):
+        texts = [text for _, text in store.iter_documents(start, start + chunk_size)]
+        embeddings[start:start + len(texts)] = job_index.embed_batch(texts)
+    embeddings.flush()
+    del embeddings
+    os.replace(tmp_path, path)
+    return np.load(path, mmap_mode='r')
@@ -0,0 +1,233 @@
+import io
+import multiprocessing
+import os
+import re
+import zipfile
+from contextlib import nullcontext
+from xml.etree import ElementTree
+
+SUPPORTED_KINDS = ('pdf', 'docx')
+
+# PDFs with at least this many pages are split across processes when page_workers > 1
+PARALLEL_MIN_PAGES = 16
+
+# WordprocessingML tags that carry text, and the header/footer parts docx2txt reads
+_W = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+_W_P = _W + "p"
+_W_T = _W + "t"
+_W_TAB = _W + "tab"
+_W_BREAKS = (_W + "br", _W + "cr")
+_DOCX_HEADER = re.compile(r'word/header[0-9]*.xml')
+_DOCX_FOOTER = re.compile(r'word/footer[0-9]*.xml')
+
+
+def resume_kind(filename):
+    """Return 'pdf' or 'docx' for a resume filename, or None if unsupported"""
+    extension = os.path.splitext(filename)[1].lower().lstrip('.')
+    return extension if extension in SUPPORTED_KINDS else None
+
+
+def _page_text(page):
+    # extract_text() returns None for pages without a text layer (e.g. scans)
+    return page.extract_text() or ""
+
+
+def _extract_page_range(data, start, stop):
+    """Extract pages [start, stop) of a PDF given as bytes (runs in a worker process)"""
+    import PyPDF2
+    pdf_reader = PyPDF2.PdfReader(io.BytesIO(data))
+    return [_page_text(pdf_reader.pages[number]) for number in range(start, stop)]
+
+
+def _iter_pages_parallel(data, page_count, workers):
+    from concurrent.futures import ProcessPoolExecutor
+
+    size = -(-page_count // workers)
+    ranges = [(start, min(start + size, page_count)) for start in range(0, page_count, size)]
+    executor = ProcessPoolExecutor(len(ranges))
+    try:
+        futures = [executor.submit(_extract_page_range, data, start, stop) for start, stop in ranges]
+        for future in futures:
+            yield from future.result()
+    finally:
+        # Stops the remaining ranges early when a caller's cap was reached
+        executor.shutdown(wait=True, cancel_futures=True)
+
+
+def iter_pdf_pages(source, max_pages=None, page_workers=1):
+    """Yield the text of each page of a PDF (path or binary file object) in order.
+
+    At most ``max_pages`` pages are read. Documents of PARALLEL_MIN_PAGES
+    pages or more are split into page ranges extracted by ``page_workers``
+    processes (not from inside daemonic pool workers, which cannot have
+    children).
+    """
+    import PyPDF2
+
+    with (open(source, 'rb') if isinstance(source, str) else nullcontext(source)) as pdf_file:
+        pdf_reader = PyPDF2.PdfReader(pdf_file)
+        page_count = len(pdf_reader.pages)
+        if max_pages is not None:
+            page_count = min(page_count, max_pages)
+
+        if page_workers > 1 and page_count >= PARALLEL_MIN_PAGES and not multiprocessing.current_process().daemon:
+            pdf_file.seek(0)
+            yield from _iter_pages_parallel(pdf_file.read(), page_count, page_workers)
+        else:
+            for number in range(page_count):
+                yield _page_text(pdf_reader.pages[number])
+
+
+def _cap_chars(chunks, max_chars):
+    """Pass text chunks through until max_chars characters have been produced"""
+    if max_chars is None:
+        yield from chunks
+        return
+    remaining = max_chars
+    try:
+        for chunk in chunks:
+            if len(chunk) >= remaining:
+                yield chunk[:remaining]
+                return
+            remaining -= len(chunk)
+            yield chunk
+    finally:
+        chunks.close()
+
+
+def read_pdf(source, max_pages=None, max_chars=None, page_workers=1):
+    """Extract the text of a PDF from a path or binary file object; returns (text, pages read)"""
+    # Collect pages in a list and join once (linear in the document length)
+    pages = list(_cap_chars(iter_pdf_pages(source, max_pages, page_workers), max_chars))
+    return "".join(pages), len(pages)
+
+
+def iter_docx_text(source):
+    """Yield the text of a DOCX piece by piece, one paragraph at a time.
+
+    Headers, the document body and footers are streamed in the same order
+    and with the same separators as docx2txt (a blank line before every
+    paragraph, tab and line-break elements as tab and newline characters).
+    Each XML part is decompressed and parsed in 64 KB chunks without
+    building an element tree, so memory stays proportional to a chunk, not
+    the document. Images and other media in the zip are never read.
+    """
+    with zipfile.ZipFile(source) as docx:
+        names = docx.namelist()
+        parts = [name for name in names if _DOCX_HEADER.match(name)]
+        parts.append("word/document.xml")
+        parts.extend(name for name in names if _DOCX_FOOTER.match(name))
+        for part in parts:
+            with docx.open(part) as xml_file:
+                yield from _iter_part_text(xml_file)
+
+
+class _DocxTextTarget:
+    """Expat parser target that collects run text, splitting at each paragraph"""
+
+    def __init__(self):
+        self.pieces = []
+        self.paragraphs = []
+        self.in_text = False
+
+    def start(self, tag, attrib):
+        if tag == _W_P:
+            if self.pieces:
+                self.paragraphs.append("".join(self.pieces))
+            self.pieces = ["\n\n"]
+        elif tag == _W_T:
+            self.in_text = True
+        elif tag == _W_TAB:
+            self.pieces.append("\t")
+        elif tag in _W_BREAKS:
+            self.pieces.append("\n")
+
+    def end(self, tag):
+        if tag == _W_T:
+            self.in_text = False
+
+    def data(self, text):
+        if self.in_text:
+            self.pieces.append(text)
+
+    def close(self):
+        if self.pieces:
+            self.paragraphs.append("".join(self.pieces))
+            self.pieces = []
+
+
+def _iter_part_text(xml_file, chunk_size=64 * 1024):
+    target = _DocxTextTarget()
+    parser = ElementTree.XMLParser(target=target)
+    for chunk in iter(lambda: xml_file.read(chunk_size), b''):
+        parser.feed(chunk)
+        yield from target.paragraphs
+        target.paragraphs = []
+    parser.close()
+    yield from target.paragraphs
+
+
+def read_docx(source, max_chars=None):
+    """Extract the text of a DOCX from a path or binary file object; returns (text, pages)"""
+    return "".join(_cap_chars(iter_docx_text(source), max_chars)).strip(), 1
+
+
+class TextStream:
+    """Raw text chunks of one resume (PDF pages or DOCX paragraphs), counted as they are read"""
+
+    def __init__(self, chunks, kind):
+        self.chunks = chunks
+        self.kind = kind
+        self.pages = 0
+        self.characters = 0
+
+    def __iter__(self):
+        for chunk in self.chunks:
+            self.characters += len(chunk)
+            if self.kind == 'pdf':
+                self.pages += 1
+            yield chunk
+        if self.kind == 'docx':
+            self.pages = 1
+
+
+def _open_source(source, kind):
+    """Normalize a path or bytes into (path or file object, kind)"""
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        if kind not in SUPPORTED_KINDS:
+            return None, None
+        return io.BytesIO(bytes(source)), kind
+    source = os.fspath(source)
+    return source, kind or resume_kind(source)
+
+
+def stream_text(source, kind=None, max_pages=None, max_chars=None, page_workers=1):
+    """Return a TextStream over a resume path or its bytes, or None for an unsupported format.
+
+    Feeding the stream to text_cleaning.clean_stream cleans it page by page,
+    so the whole raw document is never held in memory.
+    """
+    source, kind = _open_source(source, kind)
+    if kind == 'pdf':
+        return TextStream(_cap_chars(iter_pdf_pages(source, max_pages, page_workers), max_chars), kind)
+    elif kind == 'docx':
+        return TextStream(_cap_chars(iter_docx_text(source), max_chars), kind)
+    return None
+
+
+def extract_text(source, kind=None, max_pages=None, max_chars=None, page_workers=1):
+    """Extract raw text from a resume path or its bytes.
+
+    ``kind`` ('pdf' or 'docx') is taken from the file extension for paths and
+    is required for bytes. At most ``max_pages`` PDF pages and
+    ``max_chars`` characters are extracted; long PDFs can be split across
+    ``page_workers`` processes. Returns (text, pages), or (None, 0) for an
+    unsupported format. Nothing is shared between calls, so this is safe to
+    use from several threads at once.
+    """
+    source, kind = _open_source(source, kind)
+    if kind == 'pdf':
+        return read_pdf(source, max_pages, max_chars, page_workers)
+    elif kind == 'docx':
+        return read_docx(source, max_chars)
+    return None, 0
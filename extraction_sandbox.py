@@ -0,0 +1,228 @@
+"""Resume extraction in an isolated worker process.
+
+A malformed or adversarial PDF can make PyPDF2 spin or allocate without
+bound. SandboxedExtractor runs extract_text in a separate Python process
+with a per-file wall-clock timeout and an address-space limit; a worker
+that is killed or crashes is replaced on the next request, and every
+failure is raised as an ExtractionError with a machine-readable reason.
+
+The worker is started with subprocess rather than multiprocessing, so it
+also works from daemonic pool workers (batch mode), which cannot have
+multiprocessing children.
+"""
+import os
+import pickle
+import queue
+import signal
+import subprocess
+import sys
+import threading
+
+DEFAULT_TIMEOUT = 60.0
+DEFAULT_MEMORY_MB = 2048
+# Seconds a new worker may take to import its parsers; not charged to any file
+START_TIMEOUT = 60.0
+
+# ExtractionError reasons
+TIMEOUT = "timeout"
+OUT_OF_MEMORY = "oom"
+PARSE_ERROR = "parse_error"
+CRASH = "crash"
+CANCELLED = "cancelled"
+
+
+class ExtractionError(Exception):
+    """Extraction failed in the sandbox; reason is TIMEOUT, OUT_OF_MEMORY, PARSE_ERROR, CRASH or CANCELLED"""
+
+    def __init__(self, reason, message):
+        super().__init__(message)
+        self.reason = reason
+
+    def __reduce__(self):
+        # Survives the trip back from process pool workers
+        return ExtractionError, (self.reason, str(self))
+
+
+class SandboxedExtractor:
+    """extract_text in a restartable worker process with a timeout and memory limit.
+
+    Requests are served one at a time (a lock serializes callers); use one
+    extractor per thread or process for parallelism.
+    """
+
+    def __init__(self, timeout=DEFAULT_TIMEOUT, memory_mb=DEFAULT_MEMORY_MB):
+        self.timeout = timeout
+        self.memory_mb = memory_mb
+        self.process = None
+        self.responses = None
+        self.restarts = 0
+        self._started = False
+        self._cancelled = False
+        self._lock = threading.Lock()
+
+    def _start(self):
+        if self._started:
+            self.restarts += 1
+        self._started = True
+        command = [sys.executable, os.path.abspath(__file__), str(self.memory_mb or 0)]
+        self.process = subprocess.Popen(command, stdin=subprocess.PIPE, stdout=subprocess.PIPE)
+        self.responses = queue.Queue()
+        threading.Thread(target=self._read_responses, args=(self.process, self.responses), daemon=True).start()
+        # The worker reports once its imports are done, so the per-file timeout
+        # only counts extraction, never interpreter and parser startup
+        try:
+            ready = self.responses.get(timeout=START_TIMEOUT)
+        except queue.Empty:
+            ready = None
+        if ready != ("ready",):
+            self._stop()
+            if self._cancelled:
+                raise ExtractionError(CANCELLED, "Extraction was cancelled")
+            raise ExtractionError(CRASH, "Extraction worker failed to start")
+
+    @staticmethod
+    def _read_responses(process, responses):
+        # None marks the end of the worker's output (exit, crash or kill)
+        try:
+            while True:
+                responses.put(pickle.load(process.stdout))
+        except Exception:
+            responses.put(None)
+
+    def _stop(self):
+        if self.process is not None:
+            self.process.kill()
+            self.process.wait()
+            self.process = None
+
+    def cancel(self):
+        """Kill the worker from another thread; the request in flight raises a CANCELLED error"""
+        process = self.process
+        if process is not None:
+            self._cancelled = True
+            process.kill()
+
+    def extract(self, source, kind=None, max_pages=None, max_chars=None, page_workers=1):
+        """extract_text(...) with the same arguments, in the worker; returns (text, pages)"""
+        if not isinstance(source, (bytes, bytearray, memoryview)):
+            source = os.path.abspath(os.fspath(source))
+        with self._lock:
+            self._cancelled = False
+            if self.process is None or self.process.poll() is not None:
+                self._start()
+            try:
+                pickle.dump((source, kind, max_pages, max_chars, page_workers), self.process.stdin)
+                self.process.stdin.flush()
+                response = self.responses.get(timeout=self.timeout)
+            except queue.Empty:
+                self._stop()
+                raise ExtractionError(TIMEOUT, f"Extraction took longer than {self.timeout:g}s") from None
+            except OSError:
+                response = None
+
+            if response is None:
+                # The worker died mid-request; SIGKILL is almost always the OOM killer
+                exit_code = self.process.wait()
+                self.process = None
+                if self._cancelled:
+                    raise ExtractionError(CANCELLED, "Extraction was cancelled")
+                if exit_code == -9:
+                    raise ExtractionError(OUT_OF_MEMORY, "Extraction worker was killed (out of memory)")
+                raise ExtractionError(CRASH, f"Extraction worker exited with code {exit_code}")
+            status, *payload = response
+            if status == "ok":
+                return tuple(payload)
+            raise ExtractionError(*payload)
+
+    def close(self):
+        """Stop the worker process"""
+        with self._lock:
+            if self.process is not None:
+                self.process.stdin.close()
+                try:
+                    self.process.wait(timeout=1)
+                except subprocess.TimeoutExpired:
+                    pass
+            self._stop()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class SandboxPool:
+    """SandboxedExtractors shared by many threads (e.g. a threaded daemon).
+
+    Each call borrows an idle extractor, or starts one when all are busy,
+    so concurrent requests are extracted in parallel and a worker killed
+    for one file never affects another request.
+    """
+
+    def __init__(self, timeout=DEFAULT_TIMEOUT, memory_mb=DEFAULT_MEMORY_MB):
+        self.timeout = timeout
+        self.memory_mb = memory_mb
+        self._idle = []
+        self._lock = threading.Lock()
+
+    def extract(self, source, kind=None, max_pages=None, max_chars=None, page_workers=1):
+        """SandboxedExtractor.extract in any idle worker"""
+        with self._lock:
+            extractor = self._idle.pop() if self._idle else SandboxedExtractor(self.timeout, self.memory_mb)
+        try:
+            return extractor.extract(source, kind, max_pages, max_chars, page_workers)
+        finally:
+            with self._lock:
+                self._idle.append(extractor)
+
+    def close(self):
+        """Stop every idle worker process"""
+        with self._lock:
+            extractors, self._idle = self._idle, []
+        for extractor in extractors:
+            extractor.close()
+
+
+def _limit_memory(memory_mb):
+    try:
+        import resource
+    except ImportError:
+        # No address-space limits on Windows; the timeout still applies
+        return
+    limit = memory_mb * 1024 * 1024
+    resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+
+
+def _worker_main(memory_mb):
+    """Serve pickled extraction requests from stdin until it is closed"""
+    requests = sys.stdin.buffer
+    responses = os.fdopen(os.dup(sys.stdout.fileno()), 'wb')
+    # Stray output from parsers (Python or C level) must not corrupt the responses
+    os.dup2(sys.stderr.fileno(), sys.stdout.fileno())
+    sys.stdout = sys.stderr
+    # Ctrl+C reaches the whole process group; the parent stops this worker itself
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    from extraction import extract_text
+    if memory_mb:
+        _limit_memory(memory_mb)
+    pickle.dump(("ready",), responses)
+    responses.flush()
+
+    while True:
+        try:
+            source, kind, max_pages, max_chars, page_workers = pickle.load(requests)
+        except EOFError:
+            return
+        try:
+            response = ("ok", *extract_text(source, kind, max_pages, max_chars, page_workers))
+        except MemoryError:
+            response = ("error", OUT_OF_MEMORY, "Extraction exceeded the memory limit")
+        except Exception as e:
+            response = ("error", PARSE_ERROR, f"{type(e).__name__}: {e}")
+        pickle.dump(response, responses)
+        responses.flush()
+
+
+if __name__ == "__main__":
+    _worker_main(int(sys.argv[1]))
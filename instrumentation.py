@@ -0,0 +1,192 @@
+import functools
+import json
+import os
+import threading
+import time
+import tracemalloc
+from collections import deque
+from contextlib import contextmanager
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+def current_rss_bytes():
+    """Resident set size of this process in bytes (peak RSS where current is unavailable)"""
+    try:
+        with open("/proc/self/statm", 'r') as statm:
+            return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError, AttributeError):
+        pass
+    if resource is not None:
+        # ru_maxrss is in kilobytes on Linux and bytes on macOS
+        maxrss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return maxrss if os.uname().sysname == "Darwin" else maxrss * 1024
+    return 0
+
+
+class JsonLinesWriter:
+    """Hook that appends every stage record to a JSON lines file"""
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        self._file = open(path, 'a', encoding='utf-8')
+
+    def __call__(self, record):
+        with self._lock:
+            self._file.write(json.dumps(record, ensure_ascii=False) + "\n")
+            self._file.flush()
+
+    def close(self):
+        with self._lock:
+            self._file.close()
+
+
+class Instrumentation:
+    """Per-stage timing and memory records for the analysis pipeline.
+
+    Each stage records wall time, CPU time, RSS, optionally the tracemalloc
+    peak, input sizes (pages, characters, tokens, roles) and the resume file.
+    Records are passed to every registered hook (e.g. a JsonLinesWriter), the
+    most recent ones are kept in a bounded buffer, and running totals per
+    stage are exported in the Prometheus text format.
+    """
+
+    def __init__(self, trace_memory=False, max_records=10000):
+        self.trace_memory = trace_memory
+        self.records = deque(maxlen=max_records)
+        self.hooks = []
+        self.totals = {}
+        self._lock = threading.Lock()
+        # Running tracemalloc peaks of the stages in progress (nested or in other threads)
+        self._open_peaks = []
+        if trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+    def add_hook(self, callback):
+        """Call callback(record) for every finished stage"""
+        self.hooks.append(callback)
+
+    def remove_hook(self, callback):
+        self.hooks.remove(callback)
+
+    @contextmanager
+    def stage(self, name, resume_file=""):
+        """Time a block; the yielded record's "sizes" dict can be filled in by the caller"""
+        record = {"stage": name, "resume_file": resume_file, "sizes": {}, "ok": True}
+        peak = [0]
+        if self.trace_memory:
+            with self._lock:
+                # reset_peak is process-wide, so fold the peak so far into every open stage first
+                traced_peak = tracemalloc.get_traced_memory()[1]
+                for open_peak in self._open_peaks:
+                    open_peak[0] = max(open_peak[0], traced_peak)
+                tracemalloc.reset_peak()
+                self._open_peaks.append(peak)
+        wall_start = time.perf_counter()
+        cpu_start = time.process_time()
+        try:
+            yield record
+        except BaseException:
+            record["ok"] = False
+            raise
+        finally:
+            record["wall_s"] = round(time.perf_counter() - wall_start, 6)
+            record["cpu_s"] = round(time.process_time() - cpu_start, 6)
+            record["rss_bytes"] = current_rss_bytes()
+            if self.trace_memory:
+                # max(peak before any nested stage reset it, peak since the last reset)
+                with self._lock:
+                    self._open_peaks.remove(peak)
+                    record["peak_traced_bytes"] = max(peak[0], tracemalloc.get_traced_memory()[1])
+            record["timestamp"] = round(time.time(), 3)
+            self.ingest(record)
+
+    def ingest(self, record):
+        """Add a finished record (also used for records collected in other processes)"""
+        with self._lock:
+            self.records.append(record)
+            totals = self.totals.setdefault(record["stage"], {
+                "count": 0, "failures": 0, "wall_s": 0.0, "cpu_s": 0.0,
+                "max_wall_s": 0.0, "max_rss_bytes": 0, "max_peak_traced_bytes": 0, "characters": 0,
+            })
+            totals["count"] += 1
+            totals["failures"] += 0 if record.get("ok", True) else 1
+            totals["wall_s"] += record.get("wall_s", 0.0)
+            totals["cpu_s"] += record.get("cpu_s", 0.0)
+            totals["max_wall_s"] = max(totals["max_wall_s"], record.get("wall_s", 0.0))
+            totals["max_rss_bytes"] = max(totals["max_rss_bytes"], record.get("rss_bytes", 0))
+            totals["max_peak_traced_bytes"] = max(totals["max_peak_traced_bytes"], record.get("peak_traced_bytes", 0))
+            totals["characters"] += record.get("sizes", {}).get("characters", 0)
+            hooks = list(self.hooks)
+        for hook in hooks:
+            hook(record)
+
+    def drain(self):
+        """Return and clear the buffered records"""
+        with self._lock:
+            records = list(self.records)
+            self.records.clear()
+        return records
+
+    def write_jsonl(self, path):
+        """Write the buffered records to a JSON lines file"""
+        with open(path, 'w', encoding='utf-8') as file:
+            for record in list(self.records):
+                file.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+    def prometheus_text(self):
+        """Running per-stage totals in the Prometheus text exposition format"""
+        metrics = [
+            ("resume_analyzer_stage_calls_total", "counter", "Number of times each stage ran", "count"),
+            ("resume_analyzer_stage_failures_total", "counter", "Number of failed stage runs", "failures"),
+            ("resume_analyzer_stage_wall_seconds_total", "counter", "Wall-clock time spent in each stage", "wall_s"),
+            ("resume_analyzer_stage_cpu_seconds_total", "counter", "CPU time spent in each stage", "cpu_s"),
+            ("resume_analyzer_stage_wall_seconds_max", "gauge", "Slowest single run of each stage", "max_wall_s"),
+            ("resume_analyzer_stage_rss_bytes_max", "gauge", "Largest RSS seen at the end of each stage", "max_rss_bytes"),
+            ("resume_analyzer_stage_traced_peak_bytes_max", "gauge", "Largest tracemalloc peak within each stage",
+             "max_peak_traced_bytes"),
+            ("resume_analyzer_stage_characters_total", "counter", "Input characters processed by each stage", "characters"),
+        ]
+        with self._lock:
+            totals = {stage: dict(values) for stage, values in self.totals.items()}
+        lines = []
+        for name, metric_type, help_text, key in metrics:
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {metric_type}")
+            for stage in sorted(totals):
+                lines.append(f'{name}{{stage="{stage}"}} {totals[stage][key]}')
+        return "\n".join(lines) + "\n"
+
+    def write_prometheus(self, path):
+        """Write prometheus_text() to a file (e.g. for the node_exporter textfile collector)"""
+        tmp_path = path + ".tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as file:
+            file.write(self.prometheus_text())
+        os.replace(tmp_path, path)
+
+
+def instrumented(stage, sizes=None):
+    """Decorate a ResumeAnalyzer method so it is recorded when instrumentation is enabled.
+
+    ``sizes(self, args, result)`` returns the input sizes to attach to the
+    record. Methods run unchanged when ``self.instrumentation`` is None.
+    """
+    def decorator(method):
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            instrumentation = self.instrumentation
+            if instrumentation is None:
+                return method(self, *args, **kwargs)
+            with instrumentation.stage(stage, resume_file=self.resume_file) as record:
+                result = method(self, *args, **kwargs)
+                if result is False:
+                    record["ok"] = False
+                if sizes is not None:
+                    record["sizes"].update(sizes(self, args, result))
+            return result
+        return wrapper
+    return decorator
@@ -0,0 +1,522 @@
+import hashlib
+import heapq
+import os
+import tempfile
+import zlib
+from collections import Counter
+
+import numpy as np
+import scipy.sparse as sp
+
+from text_cleaning import vectorizer_terms, vectorizer_tokens
+
+# Bump when the on-disk index layout changes
+INDEX_FORMAT = 3
+
+# Columns of the optional hashing mode (8 MB of IDF weights, whatever the vocabulary)
+DEFAULT_HASH_FEATURES = 2 ** 20
+
+# Dimensions of the optional LSA embedding mode
+DEFAULT_LSA_DIMS = 256
+
+
+def file_hash(path):
+    """SHA-256 of a file's contents"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as file:
+        for chunk in iter(lambda: file.read(1024 * 1024), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def section_hash(text):
+    """Content hash of one raw ``===== ROLE =====`` section, used to spot edited roles"""
+    return hashlib.sha1(text.encode('utf-8')).hexdigest()
+
+
+def index_path_for(job_file, hash_features=None, lsa_dims=None):
+    """Path of the compiled index stored next to a job description file.
+
+    The name keeps the source extension and the scoring mode, so jobs.txt
+    and jobs.csv, or the exact, hashing and LSA modes of one catalog, never
+    overwrite each other's index.
+    """
+    mode = ""
+    if hash_features:
+        mode += f".hash{hash_features}"
+    if lsa_dims:
+        mode += f".lsa{lsa_dims}"
+    return f"{job_file}{mode}.index.npz"
+
+
+def hash_column(term, n_features):
+    """Stable column of a term in hashing mode (CRC-32, the same in every process)"""
+    return zlib.crc32(term.encode('utf-8')) % n_features
+
+
+def pack_strings(strings):
+    """Pack strings into one UTF-8 byte array plus offsets (no per-string padding)"""
+    encoded = [string.encode('utf-8') for string in strings]
+    offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+    offsets[1:] = np.cumsum([len(data) for data in encoded])
+    blob = np.frombuffer(b''.join(encoded), dtype=np.uint8)
+    return blob, offsets
+
+
+def unpack_strings(blob, offsets):
+    """Inverse of pack_strings"""
+    data = blob.tobytes()
+    return [data[offsets[i]:offsets[i + 1]].decode('utf-8') for i in range(len(offsets) - 1)]
+
+
+def _best_columns(keys, k):
+    """Columns of the k largest keys in each row, largest first"""
+    if k < keys.shape[1]:
+        columns = np.argpartition(-keys, k - 1, axis=1)[:, :k]
+    else:
+        columns = np.broadcast_to(np.arange(keys.shape[1]), keys.shape)
+    order = np.argsort(-np.take_along_axis(keys, columns, axis=1), axis=1)
+    return np.take_along_axis(columns, order, axis=1)
+
+
+def _normalize_rows(matrix):
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1
+    return matrix / norms
+
+
+class JobIndex:
+    """TF-IDF model fitted once over the whole job catalog.
+
+    The vocabulary and IDF weights come from every job description at once,
+    and the job vectors are kept together as a single sparse CSR matrix with
+    L2-normalised rows. Scoring a resume is then one ``transform_tokens`` and one
+    sparse matrix-vector product, whatever the size of the catalog.
+
+    Raw term counts per role are kept as well, so an edited catalog can be
+    applied with ``update``: only the changed roles are counted again and
+    the IDF weights are recomputed from the count matrix. The weights are
+    the same as sklearn's ``TfidfVectorizer`` defaults (smoothed IDF, L2 norm).
+
+    With ``hash_features`` set, terms are mapped to that many columns by a
+    stable hash instead of a vocabulary dict (the hashing trick): memory no
+    longer grows with the number of distinct terms and any process can
+    vectorize with just the IDF array. Columns no role uses get a zero IDF,
+    so unseen resume terms are ignored as in the exact mode; only hash
+    collisions make the scores differ.
+
+    With ``lsa_dims`` set, a truncated SVD of the job matrix is learned as
+    well and roles and resumes are compared as L2-normalised float32
+    embeddings of that many dimensions (latent semantic analysis), so
+    scoring many resumes is one dense BLAS matrix product.
+    """
+
+    def __init__(self, hash_features=None, lsa_dims=None):
+        self.hash_features = hash_features
+        self.lsa_dims = lsa_dims
+        self.projection = None
+        self.role_embeddings = None
+        self._embedding_key = None
+        self.roles = []
+        self.job_texts = []
+        self.section_hashes = []
+        self.vocabulary = {}
+        self.counts = None
+        self.idf = None
+        self.job_matrix = None
+
+    def fit(self, job_words, section_hashes=None):
+        """Count terms in the cleaned job words and build the IDF weights and job matrix.
+
+        ``job_words`` maps each role to its clean_tokens word list (e.g. from
+        clean_batch); the words are counted as they are, without being joined
+        and split again. ``section_hashes`` ({role: hash} of the raw sections)
+        is stored so a later ``update`` can tell which roles changed.
+        """
+        roles = list(job_words.keys())
+        vocabulary = {}
+        counts = self._count_rows([job_words[role] for role in roles], vocabulary)
+        if not counts.nnz:
+            raise ValueError("empty vocabulary; the job descriptions contain no words")
+        job_texts = [' '.join(job_words[role]) for role in roles]
+        self._set_counts(roles, job_texts, section_hashes or {}, vocabulary, counts)
+        return self
+
+    def update(self, roles, changed_words, section_hashes):
+        """Apply an edited catalog, counting terms only for added or modified roles.
+
+        ``roles`` is the new role order, ``changed_words`` the clean_tokens
+        word list of every added or modified role and ``section_hashes`` the hash of every
+        role's raw section. Roles missing from ``roles`` are removed; all
+        other roles keep their counts. New arrays are built and swapped in,
+        so copies made with ``copy()`` are never modified.
+        """
+        vocabulary = dict(self.vocabulary)
+        changed_roles = list(changed_words)
+        changed_counts = self._count_rows([changed_words[role] for role in changed_roles], vocabulary)
+        old_counts = sp.csr_matrix((self.counts.data, self.counts.indices, self.counts.indptr),
+                                   shape=(self.counts.shape[0], self._n_columns(vocabulary)))
+        stacked = sp.vstack([old_counts, changed_counts], format='csr')
+
+        # Pick each role's row from the old counts or the freshly counted ones
+        old_rows = {role: row for row, role in enumerate(self.roles)}
+        changed_rows = {role: old_counts.shape[0] + row for row, role in enumerate(changed_roles)}
+        order = np.array([changed_rows[role] if role in changed_rows else old_rows[role] for role in roles],
+                         dtype=np.int64)
+        job_texts = [' '.join(changed_words[role]) if role in changed_words else self.job_texts[old_rows[role]]
+                     for role in roles]
+        self._set_counts(list(roles), job_texts, section_hashes, vocabulary, stacked[order])
+        return self
+
+    def copy(self):
+        """Shallow copy; safe to ``update`` while the original keeps serving"""
+        clone = JobIndex(self.hash_features, self.lsa_dims)
+        clone.__dict__.update(self.__dict__)
+        return clone
+
+    def _n_columns(self, vocabulary):
+        return self.hash_features or len(vocabulary)
+
+    def _count_rows(self, word_lists, vocabulary):
+        """Raw term counts of cleaned word lists as CSR rows; new terms are added to vocabulary"""
+        indptr = [0]
+        indices = []
+        data = []
+        for words in word_lists:
+            term_counts = Counter(vectorizer_terms(words))
+            if self.hash_features:
+                # Colliding terms of one document share (and add up in) one column
+                column_counts = Counter()
+                for term, count in term_counts.items():
+                    column_counts[hash_column(term, self.hash_features)] += count
+                indices.extend(column_counts)
+                data.extend(column_counts.values())
+            else:
+                for term, count in term_counts.items():
+                    indices.append(vocabulary.setdefault(term, len(vocabulary)))
+                    data.append(count)
+            indptr.append(len(indices))
+        return sp.csr_matrix((np.array(data, dtype=np.float64), np.array(indices, dtype=np.int32),
+                              np.array(indptr, dtype=np.int64)), shape=(len(word_lists), self._n_columns(vocabulary)))
+
+    def _set_counts(self, roles, job_texts, section_hashes, vocabulary, counts):
+        """Recompute IDF and the normalised job matrix from counts, then swap everything in"""
+        document_frequency = np.bincount(counts.indices, minlength=counts.shape[1])
+
+        # Drop terms no role uses any more; they would still inflate resume vector norms
+        if not self.hash_features and (document_frequency == 0).any():
+            keep = np.flatnonzero(document_frequency)
+            terms = [None] * len(vocabulary)
+            for term, column in vocabulary.items():
+                terms[column] = term
+            counts = counts[:, keep].tocsr()
+            vocabulary = {terms[column]: new_column for new_column, column in enumerate(keep)}
+            document_frequency = document_frequency[keep]
+
+        idf = np.log((1 + len(roles)) / (1 + document_frequency)) + 1
+        if self.hash_features:
+            # Hashed columns are fixed; unused ones are switched off instead
+            idf[document_frequency == 0] = 0
+        job_matrix = counts @ sp.diags(idf)
+        norms = np.sqrt(np.asarray(job_matrix.multiply(job_matrix).sum(axis=1)).ravel())
+        norms[norms == 0] = 1
+        job_matrix = (sp.diags(1 / norms) @ job_matrix).tocsr()
+
+        self.roles = roles
+        self.job_texts = job_texts
+        self.section_hashes = [section_hashes.get(role, "") for role in roles]
+        self.vocabulary = vocabulary
+        self.counts = counts
+        self.idf = idf
+        self.job_matrix = job_matrix
+        self.projection = None
+        self.role_embeddings = None
+        self._embedding_key = None
+        if self.lsa_dims:
+            self.projection, self.role_embeddings = self._fit_lsa(job_matrix, self.lsa_dims)
+
+    @staticmethod
+    def _fit_lsa(job_matrix, dims):
+        """Truncated SVD of the job matrix; returns (terms x dims projection, role embeddings)"""
+        n_roles, n_terms = job_matrix.shape
+        if dims < min(n_roles, n_terms) - 1:
+            from scipy.sparse.linalg import svds
+            _, _, components = svds(job_matrix, k=dims)
+        elif n_roles <= n_terms:
+            # Small catalogs: every role direction fits, so take the exact SVD
+            # from the (roles x roles) Gram matrix instead
+            eigenvalues, vectors = np.linalg.eigh((job_matrix @ job_matrix.T).toarray())
+            # Largest first, and never more than dims of the nonzero ones
+            keep = np.flatnonzero(eigenvalues > 1e-10)[::-1][:dims]
+            components = (vectors[:, keep] / np.sqrt(eigenvalues[keep])).T @ job_matrix
+        else:
+            _, _, components = np.linalg.svd(job_matrix.toarray(), full_matrices=False)
+            components = components[:dims]
+        projection = np.ascontiguousarray(np.asarray(components).T, dtype=np.float32)
+        return projection, _normalize_rows(np.asarray(job_matrix @ projection, dtype=np.float32))
+
+    def embedding_key(self):
+        """Short hash of the LSA projection; embeddings computed under another key are stale"""
+        if self._embedding_key is None:
+            self._embedding_key = hashlib.sha1(self.projection.tobytes()).hexdigest()[:16]
+        return self._embedding_key
+
+    def embed_batch(self, resume_texts):
+        """L2-normalised float32 LSA embeddings of cleaned resumes, one row per text"""
+        resume_matrix = self.transform_batch([vectorizer_tokens(text) for text in resume_texts])
+        return _normalize_rows(np.asarray(resume_matrix @ self.projection, dtype=np.float32))
+
+    def score_embeddings(self, embeddings):
+        """(resumes x roles) similarities of precomputed resume embeddings, in one BLAS product.
+
+        Latent cosines can be negative; they are clipped to 0 like a
+        TF-IDF cosine with no shared terms.
+        """
+        return np.maximum(embeddings @ self.role_embeddings.T, 0)
+
+    def top_k_embeddings(self, embeddings, k):
+        """top_k for many precomputed embeddings at once; returns (rows, similarities, totals) arrays.
+
+        Row i of each result holds resume i's best k role rows (best first),
+        their similarities and the sum of every role's rounded percentage.
+        """
+        similarities = self.score_embeddings(embeddings)
+        percentages = np.rint(similarities * 100).astype(np.int64)
+        n_roles = similarities.shape[1]
+        k = min(k, n_roles)
+        # Same ranking as top_k: higher percentage first, then earlier role
+        keys = percentages * n_roles + (n_roles - 1 - np.arange(n_roles))
+        rows = _best_columns(keys, k)
+        return rows, np.take_along_axis(similarities, rows, axis=1), percentages.sum(axis=1)
+
+    def is_fitted(self):
+        """Return True once a catalog has been fitted"""
+        return self.job_matrix is not None and len(self.roles) > 0
+
+    def transform_tokens(self, tokens):
+        """Vectorize a token stream, matching TfidfVectorizer.transform.
+
+        Raw term counts are weighted by the catalog IDF and L2-normalised;
+        terms outside the catalog vocabulary are ignored.
+        """
+        columns, values = self._weights(tokens)
+        return sp.csr_matrix((values, columns, np.array([0, len(columns)])), shape=(1, len(self.idf)))
+
+    def transform_batch(self, token_lists):
+        """Vectorize many token streams into one CSR matrix, one row per document"""
+        weights = [self._weights(tokens) for tokens in token_lists]
+        indptr = np.zeros(len(weights) + 1, dtype=np.int64)
+        indptr[1:] = np.cumsum([len(columns) for columns, _ in weights])
+        if weights:
+            columns = np.concatenate([columns for columns, _ in weights])
+            values = np.concatenate([values for _, values in weights])
+        else:
+            columns = np.zeros(0, dtype=np.int32)
+            values = np.zeros(0, dtype=np.float64)
+        return sp.csr_matrix((values, columns, indptr), shape=(len(weights), len(self.idf)))
+
+    def _weights(self, tokens):
+        """Sorted vocabulary columns and L2-normalised TF-IDF values of one token stream"""
+        if self.hash_features:
+            n_features = self.hash_features
+            counts = Counter(hash_column(term, n_features) for term in tokens)
+        else:
+            vocabulary = self.vocabulary
+            counts = Counter(vocabulary[token] for token in tokens if token in vocabulary)
+        columns = np.fromiter(sorted(counts), dtype=np.int32, count=len(counts))
+        values = np.fromiter((counts[column] for column in columns), dtype=np.float64, count=len(columns))
+        values *= self.idf[columns]
+        if self.hash_features:
+            # Terms hashed to columns no role uses
+            used = values != 0
+            columns, values = columns[used], values[used]
+        norm = np.sqrt(np.dot(values, values))
+        if norm > 0:
+            values /= norm
+        return columns, values
+
+    def score(self, resume_text):
+        """Return the cosine similarity of a cleaned resume against every role.
+
+        Rows of the job matrix and the resume vector are both L2-normalised,
+        so the dot product is the cosine similarity.
+        """
+        if self.lsa_dims:
+            return self.score_embeddings(self.embed_batch([resume_text]))[0]
+        resume_vector = self.transform_tokens(vectorizer_tokens(resume_text))
+        similarities = self.job_matrix @ resume_vector.T
+        return similarities.toarray().ravel()
+
+    def top_k(self, resume_text, k, chunk_rows=4096):
+        """Best k roles of a cleaned resume, scored in row chunks of the job matrix.
+
+        Only ``chunk_rows`` similarities exist at a time, and a k-sized heap
+        keeps the best roles seen so far. Roles are ranked by rounded match
+        percentage, ties in catalog order. Returns (rows, similarities,
+        total): role rows best first, their cosine similarities and the sum
+        of every role's rounded percentage (used to normalize).
+        """
+        if k < 1:
+            raise ValueError(f"k must be at least 1, got {k}")
+        if self.lsa_dims:
+            embedding = self.embed_batch([resume_text])[0]
+        else:
+            resume_vector = self.transform_tokens(vectorizer_tokens(resume_text)).T.tocsr()
+        n_roles = self.job_matrix.shape[0]
+        heap = []
+        total = 0
+        for start in range(0, n_roles, chunk_rows):
+            if self.lsa_dims:
+                similarities = np.maximum(self.role_embeddings[start:start + chunk_rows] @ embedding, 0)
+            else:
+                similarities = (self.job_matrix[start:start + chunk_rows] @ resume_vector).toarray().ravel()
+            percentages = np.rint(similarities * 100).astype(np.int64)
+            total += int(percentages.sum())
+
+            # One unique integer key per role: higher percentage first, then earlier role
+            keys = percentages * n_roles + (n_roles - 1 - start - np.arange(len(percentages)))
+            candidates = np.argpartition(-keys, k - 1)[:k] if len(keys) > k else np.arange(len(keys))
+            for i in candidates:
+                item = (int(keys[i]), start + int(i), float(similarities[i]))
+                if len(heap) < k:
+                    heapq.heappush(heap, item)
+                elif item > heap[0]:
+                    heapq.heapreplace(heap, item)
+
+        best = sorted(heap, reverse=True)
+        return [row for _, row, _ in best], [similarity for _, _, similarity in best], total
+
+    def top_k_batch(self, resume_texts, k, chunk_rows=4096):
+        """top_k for many cleaned resumes at once; returns (rows, similarities, totals) arrays as top_k_embeddings.
+
+        The job matrix is scored ``chunk_rows`` roles at a time and only each
+        chunk's best k survive, so no (resumes x roles) array is built.
+        """
+        if self.lsa_dims:
+            return self.top_k_embeddings(self.embed_batch(resume_texts), k)
+        resume_matrix = self.transform_batch([vectorizer_tokens(text) for text in resume_texts])
+        n_roles = self.job_matrix.shape[0]
+        k = min(k, n_roles)
+        totals = np.zeros(len(resume_texts), dtype=np.int64)
+        best_keys, best_rows, best_similarities = [], [], []
+        for start in range(0, n_roles, chunk_rows):
+            similarities = (resume_matrix @ self.job_matrix[start:start + chunk_rows].T).toarray()
+            percentages = np.rint(similarities * 100).astype(np.int64)
+            totals += percentages.sum(axis=1)
+            keys = percentages * n_roles + (n_roles - 1 - start - np.arange(similarities.shape[1]))
+            rows = _best_columns(keys, k)
+            best_keys.append(np.take_along_axis(keys, rows, axis=1))
+            best_rows.append(rows + start)
+            best_similarities.append(np.take_along_axis(similarities, rows, axis=1))
+        keys = np.hstack(best_keys)
+        best = _best_columns(keys, k)
+        return (np.take_along_axis(np.hstack(best_rows), best, axis=1),
+                np.take_along_axis(np.hstack(best_similarities), best, axis=1), totals)
+
+    def score_batch(self, resume_texts):
+        """Cosine similarities of many cleaned resumes in one sparse matrix-matrix product.
+
+        Returns a dense (resumes x roles) array; row i equals score(resume_texts[i]).
+        """
+        if self.lsa_dims:
+            return self.score_embeddings(self.embed_batch(resume_texts))
+        resume_matrix = self.transform_batch([vectorizer_tokens(text) for text in resume_texts])
+        similarities = resume_matrix @ self.job_matrix.T
+        return similarities.toarray()
+
+    def job_descriptions(self):
+        """Return the cleaned catalog as a {role: text} dict"""
+        return dict(zip(self.roles, self.job_texts))
+
+    def save(self, path, source_hash, version=""):
+        """Write the cleaned catalog, vocabulary/IDF and job matrix to a binary index"""
+        terms = [None] * len(self.vocabulary)
+        for term, column in self.vocabulary.items():
+            terms[column] = term
+
+        role_blob, role_offsets = pack_strings(self.roles)
+        text_blob, text_offsets = pack_strings(self.job_texts)
+        hash_blob, hash_offsets = pack_strings(self.section_hashes)
+        term_blob, term_offsets = pack_strings(terms)
+
+        directory = os.path.dirname(os.path.abspath(path))
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, 'wb') as file:
+                np.savez(
+                    file,
+                    format=np.array(INDEX_FORMAT),
+                    hash_features=np.array(self.hash_features or 0),
+                    lsa_dims=np.array(self.lsa_dims or 0),
+                    projection=self.projection if self.lsa_dims else np.zeros((0, 0), dtype=np.float32),
+                    role_embeddings=self.role_embeddings if self.lsa_dims else np.zeros((0, 0), dtype=np.float32),
+                    source_hash=np.array(source_hash),
+                    version=np.array(version),
+                    role_blob=role_blob, role_offsets=role_offsets,
+                    text_blob=text_blob, text_offsets=text_offsets,
+                    hash_blob=hash_blob, hash_offsets=hash_offsets,
+                    term_blob=term_blob, term_offsets=term_offsets,
+                    idf=self.idf,
+                    data=self.job_matrix.data,
+                    indices=self.job_matrix.indices,
+                    indptr=self.job_matrix.indptr,
+                    shape=np.array(self.job_matrix.shape),
+                    count_data=self.counts.data.astype(np.int32),
+                    count_indices=self.counts.indices,
+                    count_indptr=self.counts.indptr,
+                )
+            os.replace(tmp_path, path)
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    def load(self, path, source_hash=None, version=""):
+        """Load a saved index, returning False if it is missing or stale.
+
+        The index is only used when it was built from a source file with the
+        same hash and by the same extractor version; otherwise the caller
+        should rebuild it from the text file. With ``source_hash=None`` any
+        index of the right version is loaded, e.g. as the base for ``update``.
+        """
+        if not os.path.exists(path):
+            return False
+        try:
+            with np.load(path, allow_pickle=False) as index:
+                if int(index["format"]) != INDEX_FORMAT or str(index["version"]) != version:
+                    return False
+                if int(index["hash_features"]) != (self.hash_features or 0):
+                    return False
+                if int(index["lsa_dims"]) != (self.lsa_dims or 0):
+                    return False
+                if source_hash is not None and str(index["source_hash"]) != source_hash:
+                    return False
+
+                roles = unpack_strings(index["role_blob"], index["role_offsets"])
+                job_texts = unpack_strings(index["text_blob"], index["text_offsets"])
+                section_hashes = unpack_strings(index["hash_blob"], index["hash_offsets"])
+                terms = unpack_strings(index["term_blob"], index["term_offsets"])
+                idf = index["idf"]
+                shape = tuple(index["shape"])
+                job_matrix = sp.csr_matrix((index["data"], index["indices"], index["indptr"]), shape=shape)
+                counts = sp.csr_matrix(
+                    (index["count_data"].astype(np.float64), index["count_indices"], index["count_indptr"]),
+                    shape=shape,
+                )
+                projection = index["projection"] if self.lsa_dims else None
+                role_embeddings = index["role_embeddings"] if self.lsa_dims else None
+        except (OSError, KeyError, ValueError) as e:
+            print(f"Could not read job index '{path}': {e}")
+            return False
+
+        self.roles = roles
+        self.job_texts = job_texts
+        self.section_hashes = section_hashes
+        self.vocabulary = {term: column for column, term in enumerate(terms)}
+        self.counts = counts
+        self.idf = idf
+        self.job_matrix = job_matrix
+        self.projection = projection
+        self.role_embeddings = role_embeddings
+        self._embedding_key = None
+        return True
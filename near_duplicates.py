@@ -0,0 +1,141 @@
+"""Near-duplicate resume detection with MinHash and locality-sensitive hashing.
+
+Each cleaned resume is reduced to a MinHash signature over its word
+shingles; the fraction of equal signature entries estimates the Jaccard
+similarity of two shingle sets. Signatures are cut into bands and
+documents whose band values are equal in some band become candidates,
+found by sorting each band rather than comparing every pair, so
+clustering a million signatures takes seconds. Candidates are verified
+against the estimated similarity before they are merged.
+"""
+import hashlib
+import zlib
+
+import numpy as np
+
+DEFAULT_NUM_PERM = 64
+DEFAULT_BANDS = 16
+DEFAULT_THRESHOLD = 0.8
+SHINGLE_SIZE = 3
+
+# Signature of a document without any shingles; such documents are never clustered
+_EMPTY = np.uint32(0xFFFFFFFF)
+# Odd 64-bit multipliers that mix shingle words and band values into one key
+_MIX = (np.uint64(0x9E3779B97F4A7C15), np.uint64(0xC2B2AE3D27D4EB4F), np.uint64(0x165667B19E3779F9))
+
+
+def text_hash(cleaned_text):
+    """Exact content hash of a cleaned text (8 bytes)"""
+    return hashlib.blake2b(cleaned_text.encode('utf-8'), digest_size=8).digest()
+
+
+def shingle_hashes(cleaned_text, size=SHINGLE_SIZE):
+    """Distinct 32-bit hashes of the word ``size``-grams of a cleaned text"""
+    words = cleaned_text.split()
+    if not words:
+        return np.zeros(0, dtype=np.uint64)
+    hashes = np.fromiter((zlib.crc32(word.encode('utf-8')) for word in words), dtype=np.uint64, count=len(words))
+    if len(hashes) < size:
+        # Shorter texts are one shingle
+        size = len(hashes)
+    shingles = np.zeros(len(hashes) - size + 1, dtype=np.uint64)
+    with np.errstate(over='ignore'):
+        for offset in range(size):
+            shingles += hashes[offset:len(hashes) - size + 1 + offset] * _MIX[offset % len(_MIX)]
+    return np.unique(shingles >> np.uint64(32))
+
+
+class MinHasher:
+    """MinHash signatures from ``num_perm`` multiply-shift hash functions.
+
+    Each function maps a 32-bit shingle hash h to the top 32 bits of
+    ``(a * h + b) mod 2**64`` with random 64-bit a (odd) and b, a universal
+    family; the signature keeps each function's minimum.
+    The seed is fixed, so signatures from any process are comparable.
+    """
+
+    def __init__(self, num_perm=DEFAULT_NUM_PERM, seed=1):
+        rng = np.random.default_rng(seed)
+        self.num_perm = num_perm
+        self.a = rng.integers(0, 2 ** 64 - 1, size=num_perm, dtype=np.uint64, endpoint=True) | np.uint64(1)
+        self.b = rng.integers(0, 2 ** 64 - 1, size=num_perm, dtype=np.uint64, endpoint=True)
+
+    def signature(self, cleaned_text):
+        """uint32 signature of a cleaned text"""
+        shingles = shingle_hashes(cleaned_text)
+        if not len(shingles):
+            return np.full(self.num_perm, _EMPTY, dtype=np.uint32)
+        with np.errstate(over='ignore'):
+            hashed = (self.a[:, None] * shingles[None, :] + self.b[:, None]) >> np.uint64(32)
+        return hashed.min(axis=1).astype(np.uint32)
+
+
+def _root(parent, i):
+    while parent[i] != i:
+        parent[i] = parent[parent[i]]
+        i = parent[i]
+    return i
+
+
+def _union(parent, i, j):
+    # The smaller index becomes the root, so every cluster is rooted at its first document
+    i, j = _root(parent, i), _root(parent, j)
+    if i != j:
+        parent[max(i, j)] = min(i, j)
+
+
+def _band_keys(band):
+    keys = np.zeros(len(band), dtype=np.uint64)
+    with np.errstate(over='ignore'):
+        for column in range(band.shape[1]):
+            keys = keys * _MIX[0] + band[:, column].astype(np.uint64)
+    return keys
+
+
+def cluster_signatures(signatures, bands=DEFAULT_BANDS, threshold=DEFAULT_THRESHOLD, exact_keys=None,
+                       chunk_size=65536):
+    """Representative (first member) of each document's near-duplicate cluster.
+
+    signatures is an (n, num_perm) uint32 array and num_perm must be a
+    multiple of bands. Documents with equal exact_keys (e.g. text_hash)
+    are merged directly. In every band, documents sharing the band's
+    values are compared with the first of them and merged when their
+    signatures agree on at least ``threshold`` of the entries.
+    """
+    signatures = np.asarray(signatures)
+    n, num_perm = signatures.shape
+    rows = num_perm // bands
+    if rows * bands != num_perm:
+        raise ValueError(f"{num_perm} signature entries cannot be split into {bands} bands")
+    parent = np.arange(n)
+    valid = ~(signatures == _EMPTY).all(axis=1)
+
+    if exact_keys is not None:
+        first = {}
+        for i, key in enumerate(exact_keys):
+            if valid[i]:
+                _union(parent, first.setdefault(key, i), i)
+
+    candidates = np.flatnonzero(valid)
+    for band in range(bands):
+        keys = _band_keys(signatures[candidates, band * rows:(band + 1) * rows])
+        # A stable sort keeps each run of equal keys in document order, so its head is its first document
+        order = np.argsort(keys, kind='stable')
+        sorted_keys = keys[order]
+        starts = np.ones(len(order), dtype=bool)
+        starts[1:] = sorted_keys[1:] != sorted_keys[:-1]
+        heads = candidates[order[np.maximum.accumulate(np.where(starts, np.arange(len(order)), 0))]]
+        members = candidates[order]
+        pairs = np.flatnonzero(~starts)
+        for start in range(0, len(pairs), chunk_size):
+            chunk = pairs[start:start + chunk_size]
+            agreement = (signatures[heads[chunk]] == signatures[members[chunk]]).mean(axis=1)
+            for head, member in zip(heads[chunk][agreement >= threshold], members[chunk][agreement >= threshold]):
+                _union(parent, int(head), int(member))
+
+    # Point every document straight at its root
+    while True:
+        grandparent = parent[parent]
+        if np.array_equal(grandparent, parent):
+            return parent
+        parent = grandparent
@@ -1,77 +1,179 @@
 import os
-import re
-import docx2txt
-import matplotlib.pyplot as plt
-import numpy as np
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
-import nltk
-from nltk.corpus import stopwords
-import PyPDF2
 import glob
+import argparse
+from job_index import DEFAULT_HASH_FEATURES, DEFAULT_LSA_DIMS, JobIndex, file_hash, index_path_for, section_hash
+from catalog import iter_catalog
+from text_cache import TextCache, DEFAULT_CACHE_DIR
+from stop_words import load_stop_words
+from skills import SkillMatcher, load_skills, skill_gaps, tee_skill_tokens
+import text_cleaning
+from extraction import extract_text, stream_text
+from near_duplicates import DEFAULT_THRESHOLD as DEFAULT_DEDUP_THRESHOLD
+from extraction_sandbox import DEFAULT_MEMORY_MB, DEFAULT_TIMEOUT, ExtractionError, SandboxedExtractor
+from scoring import DEFAULT_TOP_K, ResumeScorer, chart_matches, normalize_scores, score_cleaned_text
+from instrumentation import Instrumentation, JsonLinesWriter, instrumented
 
-# Download necessary NLTK data
-nltk.download('stopwords', quiet=True)
-nltk.download('punkt', quiet=True)
+# Heavy backends (PyPDF2, matplotlib) are imported lazily where they are used;
+# DOCX text and the TF-IDF index are handled natively, and no NLTK data is
+# downloaded: the stopword list is bundled in stop_words.py so startup works offline.
+
+# Bump when extraction or clean_text output changes so cached text is invalidated
+EXTRACTOR_VERSION = "1"
+
+# Catalog sections cleaned per clean_batch call while the file is streamed
+CLEAN_BATCH_SIZE = 256
 
 class ResumeAnalyzer:
-    def __init__(self):
-        self.stop_words = set(stopwords.words('english'))
+    def __init__(self, cache_dir=DEFAULT_CACHE_DIR, stop_words_source="bundled", instrumentation=None,
+                 top_k=DEFAULT_TOP_K, max_pages=None, max_chars=None, page_workers=1, sandbox=None,
+                 hash_features=None, lsa_dims=None, skills_file=None):
+        self.stop_words = load_stop_words(stop_words_source)
+        self.instrumentation = instrumentation
+        self.top_k = top_k
+        # Extraction caps for very long documents, and processes for long PDFs
+        self.max_pages = max_pages
+        self.max_chars = max_chars
+        self.page_workers = page_workers
+        # Optional SandboxedExtractor: parse files in a worker with a timeout and memory limit
+        self.sandbox = sandbox
+        self.extract_error = None
         self.job_descriptions = {}
+        self.job_file = None
+        # hash_features selects the constant-memory hashing vectorizer,
+        # lsa_dims the dense low-rank embedding mode
+        self.job_index = JobIndex(hash_features, lsa_dims)
         self.resume_text = ""
+        self.raw_text = ""
+        # Skill tokens of the raw text when it is not kept (streamed extraction)
+        self.skill_text = ""
+        self.raw_characters = 0
+        self.page_count = 0
+        # Capped text must not be served for uncapped runs (and vice versa)
+        cache_version = EXTRACTOR_VERSION
+        if max_pages is not None or max_chars is not None:
+            cache_version += f":pages={max_pages}:chars={max_chars}"
+        self.text_cache = TextCache(cache_dir, version=cache_version) if cache_dir else None
         self.name = ""
         self.job_matches = {}
         self.normalized_job_matches = {}
         self.best_match = ""
         self.best_score = 0
         self.best_normalized_score = 0
+        self.other_normalized_score = 0
+        self.other_roles = 0
+        self.result = None
         self.resume_file = ""
+        # Skills dictionary (bundled list unless skills_file is given), compiled on first use
+        self.skills_file = skills_file
+        self.skill_matcher = None
+        self.resume_skills = []
+        self.skill_gaps = {}
+        # {role: (section hash, skill ids)}, found in the raw catalog sections
+        self._role_skills = {}
+        self._section_hashes = (None, {})
 
+    @instrumented("clean_text", lambda self, args, result: {
+        "characters": len(args[0]), "tokens": result.count(" ") + 1 if result else 0})
     def clean_text(self, text):
         """Clean and preprocess text data"""
-        # Convert to lowercase
-        text = text.lower()
-        # Remove special characters and numbers
-        text = re.sub(r'[^\w\s]', '', text)
-        text = re.sub(r'\d+', '', text)
-        # Remove extra whitespace
-        text = re.sub(r'\s+', ' ', text).strip()
-        # Remove stopwords
-        words = text.split()
-        filtered_words = [word for word in words if word not in self.stop_words]
-        return ' '.join(filtered_words)
-
-    def load_job_descriptions(self):
-        """Load job descriptions from a single file"""
-        job_file = "job_description.txt"
-        
+        # Lowercase, remove special characters, numbers and stopwords in one pass
+        return text_cleaning.clean_text(text, self.stop_words)
+
+    @instrumented("clean_text", lambda self, args, result: {
+        "characters": sum(len(text) for text in args[0]), "tokens": sum(len(words) for words in result)})
+    def clean_batch(self, texts):
+        """clean_text of many texts (e.g. catalog sections), returned as word lists"""
+        return text_cleaning.clean_batch(texts, self.stop_words)
+
+    @instrumented("clean_text", lambda self, args, result: {
+        "characters": self.raw_characters, "tokens": result.count(" ") + 1 if result else 0})
+    def clean_stream(self, stream):
+        """clean_text over a TextStream, chunk by chunk"""
+        # Pages are read lazily as they are cleaned, so this stage includes reading them
+        skill_tokens = []
+        cleaned = text_cleaning.clean_stream(tee_skill_tokens(stream, skill_tokens), self.stop_words)
+        self.raw_characters = stream.characters
+        self.skill_text = " ".join(skill_tokens)
+        return cleaned
+
+    @instrumented("load_job_descriptions", lambda self, args, result: {"roles": len(self.job_descriptions)})
+    def load_job_descriptions(self, job_file="job_description.txt", verbose=True, use_index=True):
+        """Load job descriptions from a single file (or its compiled index)"""
         if not os.path.exists(job_file):
             print(f"Job description file '{job_file}' not found! Please create this file.")
             return False
             
         try:
-            with open(job_file, 'r', encoding='utf-8') as file:
-                content = file.read()
+            # Reuse the compiled index when it was built from this exact file
+            source_hash = file_hash(job_file)
+            index_file = index_path_for(job_file, self.job_index.hash_features, self.job_index.lsa_dims)
+            if use_index and self.job_index.load(index_file, source_hash, EXTRACTOR_VERSION):
+                self.job_descriptions = self.job_index.job_descriptions()
+                self.job_file = job_file
+                if verbose:
+                    print(f"Loaded {len(self.job_descriptions)} job descriptions from index '{index_file}'.")
+                return True
                 
-            # Split content by section headers (===== ROLE =====)
-            sections = re.split(r'={5}\s+(.*?)\s+={5}', content)
-            
-            # First section is empty (before first header)
-            sections = sections[1:]  
+            # The file changed since the index was built (or since the last load in
+            # this process): start from the previous version's index (in memory or
+            # on disk) and only re-clean added or modified roles, reusing the rest
+            base = self.job_index
+            if not base.is_fitted() and use_index:
+                base = JobIndex(self.job_index.hash_features, self.job_index.lsa_dims)
+                base.load(index_file, None, EXTRACTOR_VERSION)
+            known_hashes = dict(zip(base.roles, base.section_hashes)) if base.is_fitted() else {}
             
-            # Process sections in pairs (header, content)
-            for i in range(0, len(sections), 2):
-                if i+1 < len(sections):
-                    role_name = sections[i].strip()
-                    job_text = sections[i+1].strip()
-                    self.job_descriptions[role_name] = self.clean_text(job_text)
+            # Stream (role, text) sections (``===== ROLE =====`` text, or .jsonl/.csv by
+            # extension) and clean them in batches of CLEAN_BATCH_SIZE, so the raw
+            # catalog is never held in memory all at once. Cleaned word lists go to
+            # the job index as they are.
+            section_hashes = {}
+            changed_words = {}
+            pending = {}
+            for role_name, job_text in iter_catalog(job_file):
+                section_hashes[role_name] = section_hash(job_text)
+                if known_hashes.get(role_name) == section_hashes[role_name]:
+                    changed_words.pop(role_name, None)
+                    pending.pop(role_name, None)
+                    continue
+                pending[role_name] = job_text
+                if len(pending) >= CLEAN_BATCH_SIZE:
+                    changed_words.update(zip(pending, self.clean_batch(list(pending.values()))))
+                    pending.clear()
+                if verbose:
                     print(f"Loaded '{role_name}' job description")
-            
-            if not self.job_descriptions:
+            if pending:
+                changed_words.update(zip(pending, self.clean_batch(list(pending.values()))))
+                    
+            if not section_hashes:
                 print("No job descriptions found in the file!")
                 return False
+            changed = list(changed_words)
+            
+            if not known_hashes:
+                # Fit the shared TF-IDF model over the whole catalog once
+                self.job_index.fit({role: changed_words[role] for role in section_hashes}, section_hashes)
+            else:
+                removed = [role for role in base.roles if role not in section_hashes]
+                if changed or removed or list(section_hashes) != base.roles:
+                    base.update(list(section_hashes), changed_words, section_hashes)
+                    if verbose:
+                        added = sum(role not in known_hashes for role in changed)
+                        print(f"Updated job index: {added} added, {len(changed) - added} modified, "
+                              f"{len(removed)} removed.")
+                self.job_index = base
+            self.job_descriptions = self.job_index.job_descriptions()
+            self.job_file = job_file
+            
+            # Save the compiled index so the next start is a plain load
+            if use_index:
+                try:
+                    self.job_index.save(index_file, source_hash, EXTRACTOR_VERSION)
+                except OSError as e:
+                    print(f"Could not save job index '{index_file}': {e}")
                 
-            print(f"Found {len(self.job_descriptions)} job descriptions.")
+            if verbose:
+                print(f"Found {len(self.job_descriptions)} job descriptions.")
             return True
                 
         except Exception as e:
@@ -114,19 +216,40 @@ class ResumeAnalyzer:
                 
         return True
 
+    def read_resume_file(self, path):
+        """Return the raw text of a PDF or DOCX file (None for other formats)"""
+        if self.sandbox is not None:
+            text, self.page_count = self.sandbox.extract(path, None, self.max_pages, self.max_chars, self.page_workers)
+        else:
+            text, self.page_count = extract_text(path, None, self.max_pages, self.max_chars, self.page_workers)
+        return text
+
+    @instrumented("extract_text_from_file", lambda self, args, result: {
+        "pages": self.page_count, "characters": self.raw_characters,
+        "tokens": self.resume_text.count(" ") + 1 if self.resume_text else 0})
     def extract_text_from_file(self):
         """Extract text from resume file (PDF or DOCX)"""
         filename = self.resume_file.lower()
+        self.extract_error = None
+        self.skill_text = ""
         try:
-            if filename.endswith('.pdf'):
-                with open(self.resume_file, 'rb') as pdf_file:
-                    pdf_reader = PyPDF2.PdfReader(pdf_file)
-                    text = ""
-                    for page in pdf_reader.pages:
-                        text += page.extract_text()
-            elif filename.endswith('.docx'):
-                text = docx2txt.process(self.resume_file)
-            else:
+            # Reuse text already extracted from identical file contents
+            cache_key = None
+            if self.text_cache is not None and filename.endswith(('.pdf', '.docx')):
+                cache_key = self.text_cache.key_for_file(self.resume_file)
+                cached = self.text_cache.get(cache_key)
+                if cached is not None:
+                    self.raw_text, self.resume_text, self.page_count = cached
+                    self.raw_characters = len(self.raw_text)
+                    return True
+
+            if cache_key is None and self.sandbox is None:
+                # Nothing to cache, so clean page by page instead of
+                # holding the whole raw document in memory
+                return self._stream_text_from_file()
+
+            text = self.read_resume_file(self.resume_file)
+            if text is None:
                 print(f"Unsupported file format: {self.resume_file}")
                 return False
                 
@@ -134,63 +257,143 @@ class ResumeAnalyzer:
                 print(f"Could not extract text from {self.resume_file}")
                 return False
                 
+            self.raw_text = text
+            self.raw_characters = len(text)
             self.resume_text = self.clean_text(text)
-            return True
             
+            if cache_key is not None:
+                self.text_cache.put(cache_key, self.raw_text, self.resume_text, self.page_count)
+            return True
+
+        except ExtractionError as e:
+            # Timeouts, memory limits and parser failures from the sandbox
+            self.extract_error = e
+            print(f"Could not extract text from {self.resume_file} ({e.reason}): {e}")
+            return False
         except Exception as e:
             print(f"Error processing {self.resume_file}: {e}")
             return False
 
+    def _stream_text_from_file(self):
+        stream = stream_text(self.resume_file, None, self.max_pages, self.max_chars, self.page_workers)
+        if stream is None:
+            print(f"Unsupported file format: {self.resume_file}")
+            return False
+
+        self.raw_text = ""
+        # Cleaned (and skill tokens collected) page by page
+        self.resume_text = self.clean_stream(stream)
+        self.page_count = stream.pages
+        if not self.resume_text:
+            print(f"Could not extract text from {self.resume_file}")
+            return False
+        return True
+
+    @instrumented("calculate_similarities", lambda self, args, result: {"roles": len(self.job_matches)})
     def calculate_similarities(self):
         """Calculate similarity between resume and all job descriptions"""
         if not self.resume_text:
             return False
             
-        for role, job_text in self.job_descriptions.items():
-            # Create a TF-IDF Vectorizer
-            vectorizer = TfidfVectorizer()
-            
-            # Transform documents to TF-IDF matrix
-            tfidf_matrix = vectorizer.fit_transform([self.resume_text, job_text])
-            
-            # Calculate cosine similarity
-            similarity = cosine_similarity(tfidf_matrix[0:1], tfidf_matrix[1:2])[0][0]
-            # Round to nearest integer (whole number)
-            match_percentage = round(similarity * 100)
+        if not self.job_index.is_fitted():
+            return False
             
-            self.job_matches[role] = match_percentage
-        
-        # Normalize job matches right away
-        self.normalize_job_matches()
+        # Only the top-k roles are kept; the rest are summed into other_normalized_score
+        result = score_cleaned_text(self.job_index, self.resume_text, self.resume_file, self.page_count, self.top_k)
         
-        # Set best match based on normalized scores
-        for role, score in self.normalized_job_matches.items():
-            if score > self.best_normalized_score:
-                self.best_normalized_score = score
-                self.best_match = role
-                self.best_score = self.job_matches[role]  # Keep original score for reference
+        # Copy the immutable result into the per-run attributes used by the CLI and GUI
+        self.result = result
+        self.job_matches = result.job_matches
+        self.normalized_job_matches = result.normalized_job_matches
+        self.best_match = result.best_match
+        self.best_score = result.best_score  # Keep original score for reference
+        self.best_normalized_score = result.best_normalized_score
+        self.other_normalized_score = result.other_normalized_score
+        self.other_roles = result.other_roles
                 
         return len(self.job_matches) > 0
 
+    def load_skill_matcher(self):
+        """Compile the skills dictionary into an Aho-Corasick automaton (once)"""
+        if self.skill_matcher is None:
+            self.skill_matcher = SkillMatcher(load_skills(self.skills_file))
+        return self.skill_matcher
+
+    def role_skills(self, role):
+        """Skill ids mentioned in a role's job description (cached until its catalog section changes)"""
+        if self._section_hashes[0] is not self.job_index.section_hashes:
+            self._section_hashes = (self.job_index.section_hashes,
+                                    dict(zip(self.job_index.roles, self.job_index.section_hashes)))
+        hashes = self._section_hashes[1]
+        cached = self._role_skills.get(role)
+        if cached is None or cached[0] != hashes.get(role):
+            self._find_role_skills(hashes)
+            cached = self._role_skills.get(role)
+            if cached is None or cached[0] != hashes.get(role):
+                # Section no longer in the file as loaded; fall back to the cleaned text
+                cached = (hashes.get(role), self.load_skill_matcher().find(self.job_descriptions.get(role, "")))
+                self._role_skills[role] = cached
+        return cached[1]
+
+    def _find_role_skills(self, hashes):
+        # Skills are found in the raw sections (the cleaned text has lost "c++", "s3", ...);
+        # one pass over the catalog fills every role whose section is not cached yet
+        if self.job_file is None:
+            return
+        matcher = self.load_skill_matcher()
+        try:
+            for role, text in iter_catalog(self.job_file):
+                cached = self._role_skills.get(role)
+                if hashes.get(role) is not None and (cached is None or cached[0] != hashes[role]):
+                    if section_hash(text) == hashes[role]:
+                        self._role_skills[role] = (hashes[role], matcher.find(text))
+        except (OSError, ValueError) as e:
+            print(f"Could not read job descriptions for skills: {e}")
+
+    @instrumented("match_skills", lambda self, args, result: {
+        "skills": len(self.resume_skills), "roles": len(self.skill_gaps)})
+    def match_skills(self):
+        """Find the resume's skills and the matched/missing skills of every returned role"""
+        if self.result is None:
+            return False
+        matcher = self.load_skill_matcher()
+        resume_skill_ids = matcher.find(self.raw_text or self.skill_text or self.resume_text)
+        self.resume_skills = matcher.names(resume_skill_ids)
+        self.skill_gaps = {}
+        for match in self.result.ranked():
+            matched, missing = skill_gaps(matcher, resume_skill_ids, self.role_skills(match.role))
+            self.skill_gaps[match.role] = {"matched": matched, "missing": missing}
+        return True
+
     def normalize_job_matches(self):
         """Normalize job match percentages to sum to 100%"""
-        total_match = sum(self.job_matches.values())
-        if total_match > 0:
-            for role, score in self.job_matches.items():
-                self.normalized_job_matches[role] = round((score / total_match) * 100)
+        self.normalized_job_matches = normalize_scores(self.job_matches)
+
+    def create_scorer(self):
+        """Return a reentrant ResumeScorer sharing this analyzer's loaded job index"""
+        return ResumeScorer(self.job_index, self.clean_text, self.text_cache, self.top_k, self.max_pages, self.max_chars,
+                            self.sandbox)
+
+    def chart_matches(self):
+        """Normalized top-k matches plus an "Other" bucket for the remaining roles"""
+        return chart_matches(self.normalized_job_matches, self.other_normalized_score, self.other_roles)
 
     def display_results(self):
         """Display analysis results and visualization"""
         if not self.job_matches:
             return
             
+        if not self.best_match:
+            print("\nYour resume shares no keywords with any of the job descriptions.")
+            return
+            
         print("\n" + "="*50)
         print(f"📊 RESUME ANALYSIS RESULTS FOR {self.name.upper()} 📊")
         print("="*50)
         
-        # Display only normalized percentages
+        # Display only normalized percentages; MatchResult ranks roles best first on every path
         print("\nCareer match percentages (normalized to 100%):")
-        for role, score in sorted(self.normalized_job_matches.items(), key=lambda x: x[1], reverse=True):
+        for role, score in self.chart_matches().items():
             print(f"🔹 {role}: {score}%")
     
         print("\n" + "-"*50)
@@ -217,14 +420,28 @@ class ResumeAnalyzer:
             print("1. Prepare for interviews by researching the company")
             print("2. Practice explaining how your experience relates to the role's requirements")
             print("3. Consider preparing a portfolio of relevant work samples")
+            
+        # Concrete skills from the skills dictionary, per returned role
+        if self.skill_gaps:
+            print("\n" + "-"*50)
+            print("🧩 Skills by role (matched / missing):")
+            for role, gaps in self.skill_gaps.items():
+                print(f"🔹 {role}")
+                print(f"   ✅ Matched: {', '.join(gaps['matched']) or 'none'}")
+                print(f"   ❌ Missing: {', '.join(gaps['missing']) or 'none'}")
         
         # Create visualization of results
         self.create_visualization()
 
+    @instrumented("create_visualization", lambda self, args, result: {"roles": len(self.normalized_job_matches)})
     def create_visualization(self):
         """Create a pie chart showing normalized match percentages"""
-        roles = list(self.normalized_job_matches.keys())
-        scores = list(self.normalized_job_matches.values())
+        import matplotlib.pyplot as plt
+        from charts import chart_colors
+        
+        matches = self.chart_matches()
+        roles = list(matches.keys())
+        scores = list(matches.values())
         
         # Create figure and axis
         fig, ax = plt.subplots(figsize=(10, 6))
@@ -236,6 +453,7 @@ class ResumeAnalyzer:
             autopct='%1.0f%%',
             startangle=90,
             shadow=True,
+            colors=chart_colors(roles),
             wedgeprops={'edgecolor': 'black'}
         )
         
@@ -257,8 +475,9 @@ class ResumeAnalyzer:
         plt.savefig('resume_match_analysis.png')
         print("\n📈 Visualization saved as 'resume_match_analysis.png'")
         
-        # Show the chart
+        # Show the chart, then release the figure so repeated runs don't accumulate them
         plt.show()
+        plt.close(fig)
 
     def run(self):
         """Run the complete resume analysis process"""
@@ -285,10 +504,222 @@ class ResumeAnalyzer:
         if not self.calculate_similarities():
             return
             
+        # Matched and missing skills per role
+        self.match_skills()
+            
         # Display results
         self.display_results()
         
 
+def build_resume_index(target, index_file, workers=None, cache_dir=DEFAULT_CACHE_DIR, from_corpus=False,
+                       max_pages=None, max_chars=None, sandbox_options=None):
+    """Incrementally add every resume under target (or in the corpus store target) to the resume index file"""
+    from batch import iter_resume_files
+    from resume_index import ResumeIndex, index_corpus, index_files
+    
+    index = ResumeIndex()
+    if os.path.exists(index_file) and not index.load(index_file):
+        return False
+        
+    if from_corpus:
+        from corpus_store import CorpusStore
+        if not os.path.exists(target + ".idx"):
+            print(f"Corpus store '{target}' not found!")
+            return False
+        with CorpusStore(target) as store:
+            added, failed = index_corpus(index, store), 0
+    else:
+        added, failed = index_files(index, iter_resume_files(target), workers=workers, cache_dir=cache_dir,
+                                    max_pages=max_pages, max_chars=max_chars, sandbox_options=sandbox_options)
+    index.save(index_file)
+    print(f"Added {added} resumes ({failed} failed). Index '{index_file}' now holds {len(index)} resumes.")
+    return True
+
+
+def build_corpus_store(target, corpus_file, workers=None, cache_dir=DEFAULT_CACHE_DIR, max_pages=None, max_chars=None,
+                       sandbox_options=None):
+    """Append the cleaned text of every resume under target that is not stored yet"""
+    from batch import iter_resume_files
+    from corpus_store import CorpusStore, store_files
+    
+    with CorpusStore(corpus_file) as store:
+        added, failed = store_files(store, iter_resume_files(target), workers=workers, cache_dir=cache_dir,
+                                    max_pages=max_pages, max_chars=max_chars, sandbox_options=sandbox_options)
+        print(f"Stored {added} resumes ({failed} failed). Corpus '{corpus_file}' now holds {len(store)} resumes.")
+    return True
+
+
+def search_resume_index(index_file, role=None, text=None, job_file="job_description.txt", top=50):
+    """Print the top candidates in the resume index for a role or ad-hoc job text"""
+    from resume_index import ResumeIndex
+    
+    index = ResumeIndex()
+    if not os.path.exists(index_file):
+        print(f"Resume index '{index_file}' not found! Build it with the 'index' command first.")
+        return False
+    if not index.load(index_file):
+        return False
+        
+    analyzer = ResumeAnalyzer(cache_dir=None)
+    if role is not None:
+        if not analyzer.load_job_descriptions(job_file, verbose=False):
+            return False
+        if role not in analyzer.job_descriptions:
+            print(f"Role '{role}' not found in '{job_file}'.")
+            return False
+        query = analyzer.job_descriptions[role]
+    else:
+        query = analyzer.clean_text(text)
+        
+    results = index.search(query, k=top)
+    print(f"\nTop {len(results)} candidates for {role or 'the given job'}:")
+    for rank, (doc_id, score) in enumerate(results, 1):
+        print(f"{rank}. {doc_id} ({round(score * 100)}%)")
+    return True
+
+
+def main(argv=None):
+    """Command line entry point (interactive by default, or a subcommand)"""
+    parser = argparse.ArgumentParser(description="Resume Analyzer - Career Match Finder")
+    parser.add_argument("--metrics-jsonl", default=None, help="Append per-stage timing/memory records to this JSON lines file")
+    parser.add_argument("--metrics-prom", default=None, help="Write per-stage totals in Prometheus text format to this file")
+    parser.add_argument("--trace-memory", action="store_true", help="Record tracemalloc peaks per stage (slower)")
+    parser.add_argument("--top-k", type=int, default=DEFAULT_TOP_K, help="Roles to show; the rest are grouped as 'Other'")
+    parser.add_argument("--hash-features", type=int, default=None,
+                        help=f"Score with a hashing vectorizer of this many columns (e.g. {DEFAULT_HASH_FEATURES}) instead of a vocabulary")
+    parser.add_argument("--lsa-dims", type=int, default=None,
+                        help=f"Score with float32 LSA embeddings of this many dimensions (e.g. {DEFAULT_LSA_DIMS})")
+    parser.add_argument("--skills", default=None, help="Skills dictionary file, one skill per line (default: bundled list)")
+    parser.add_argument("--max-pages", type=int, default=None, help="Read at most this many pages of each PDF")
+    parser.add_argument("--max-chars", type=int, default=None, help="Read at most this many characters of each resume")
+    parser.add_argument("--page-workers", type=int, default=1, help="Processes used to extract long PDFs (interactive mode)")
+    parser.add_argument("--extract-timeout", type=float, default=DEFAULT_TIMEOUT, help="Seconds allowed to extract one resume")
+    parser.add_argument("--extract-memory-mb", type=int, default=DEFAULT_MEMORY_MB, help="Address-space limit of each extraction worker")
+    parser.add_argument("--no-sandbox", action="store_true", help="Extract in-process, without the timeout and memory limit")
+    subparsers = parser.add_subparsers(dest="command")
+    
+    # Headless batch scoring of a whole directory or glob of resumes
+    batch_parser = subparsers.add_parser("batch", help="Score every PDF/DOCX resume in a directory or glob")
+    batch_parser.add_argument("target", help="Directory (searched recursively) or glob pattern of resumes")
+    batch_parser.add_argument("--from-corpus", action="store_true", help="Re-score the cleaned text of a corpus store (target) instead of files")
+    batch_parser.add_argument("-o", "--output", required=True, help="Output file (.csv or .jsonl)")
+    batch_parser.add_argument("--format", choices=["csv", "jsonl"], help="Output format (default: from the output extension)")
+    batch_parser.add_argument("--workers", type=int, default=None, help="Number of worker processes (default: all cores)")
+    batch_parser.add_argument("--jobs", default="job_description.txt", help="Job description file")
+    batch_parser.add_argument("--top", type=int, default=5, help="Number of top roles to report per resume")
+    batch_parser.add_argument("--cache-dir", default=DEFAULT_CACHE_DIR, help="Extracted text cache directory")
+    batch_parser.add_argument("--no-cache", action="store_true", help="Disable the extracted text cache")
+    batch_parser.add_argument("--charts-dir", default=None, help="Also export one chart per resume to this directory")
+    batch_parser.add_argument("--chart-format", choices=["svg", "png"], default="svg", help="Chart export format (SVG is cheapest)")
+    batch_parser.add_argument("--chart-dpi", type=int, default=100, help="Resolution of PNG chart exports")
+    batch_parser.add_argument("--dedup", action="store_true", help="Cluster exact and near-duplicate resumes and score one per cluster")
+    batch_parser.add_argument("--dedup-threshold", type=float, default=DEFAULT_DEDUP_THRESHOLD, help="Estimated shingle Jaccard similarity that makes two resumes duplicates")
+    
+    # Reverse search: build a resume index, then rank candidates for one job
+    index_parser = subparsers.add_parser("index", help="Add resumes from a directory or glob to a resume index")
+    index_parser.add_argument("target", help="Directory (searched recursively) or glob pattern of resumes")
+    index_parser.add_argument("--from-corpus", action="store_true", help="Index the cleaned text of a corpus store (target) instead of files")
+    index_parser.add_argument("--index", default="resumes.index.npz", help="Resume index file")
+    index_parser.add_argument("--workers", type=int, default=None, help="Number of worker processes (default: all cores)")
+    index_parser.add_argument("--cache-dir", default=DEFAULT_CACHE_DIR, help="Extracted text cache directory")
+    
+    # Keep cleaned text in a memory-mapped store for later re-scoring
+    store_parser = subparsers.add_parser("store", help="Append cleaned text of resumes to a corpus store")
+    store_parser.add_argument("target", help="Directory (searched recursively) or glob pattern of resumes")
+    store_parser.add_argument("--corpus", default="resumes.corpus", help="Corpus store data file (the index is <corpus>.idx)")
+    store_parser.add_argument("--workers", type=int, default=None, help="Number of worker processes (default: all cores)")
+    store_parser.add_argument("--cache-dir", default=DEFAULT_CACHE_DIR, help="Extracted text cache directory")
+    
+    search_parser = subparsers.add_parser("search", help="Rank indexed resumes against a job")
+    query_group = search_parser.add_mutually_exclusive_group(required=True)
+    query_group.add_argument("--role", help="Role name from the job description file")
+    query_group.add_argument("--text", help="Ad-hoc job description text")
+    search_parser.add_argument("--index", default="resumes.index.npz", help="Resume index file")
+    search_parser.add_argument("--jobs", default="job_description.txt", help="Job description file")
+    search_parser.add_argument("-k", "--top", type=int, default=50, help="Number of candidates to return")
+    
+    # Long-running daemon: load the catalog once, score over a local socket
+    serve_parser = subparsers.add_parser("serve", help="Run a scoring daemon (use scoring_daemon.py as the client)")
+    serve_parser.add_argument("--jobs", default="job_description.txt", help="Job description file (reloaded when it changes)")
+    serve_parser.add_argument("--socket", default=None, help="Unix socket path (default: per-user socket in the temp dir)")
+    serve_parser.add_argument("--port", type=int, default=None, help="Listen on this localhost TCP port instead of a socket")
+    serve_parser.add_argument("--poll-interval", type=float, default=1.0, help="Seconds between job file change checks")
+    serve_parser.add_argument("--cache-dir", default=DEFAULT_CACHE_DIR, help="Extracted text cache directory")
+    serve_parser.add_argument("--no-cache", action="store_true", help="Disable the extracted text cache")
+    
+    # Asyncio HTTP service that scores concurrent uploads in micro-batches
+    http_parser = subparsers.add_parser("serve-http", help="Run the asyncio HTTP scoring service with micro-batching")
+    http_parser.add_argument("--jobs", default="job_description.txt", help="Job description file")
+    http_parser.add_argument("--host", default="127.0.0.1", help="Address to listen on")
+    http_parser.add_argument("--port", type=int, default=8766, help="Port to listen on")
+    http_parser.add_argument("--workers", type=int, default=None, help="Extraction worker processes (default: all cores)")
+    http_parser.add_argument("--max-batch", type=int, default=64, help="Most resumes scored in one matrix product")
+    http_parser.add_argument("--batch-window-ms", type=float, default=5.0, help="How long to wait for a batch to fill")
+    http_parser.add_argument("--max-pending", type=int, default=256, help="Most uploads extracted or queued at once")
+    http_parser.add_argument("--max-upload-mb", type=float, default=20, help="Largest accepted upload")
+    http_parser.add_argument("--cache-dir", default=DEFAULT_CACHE_DIR, help="Extracted text cache directory")
+    http_parser.add_argument("--no-cache", action="store_true", help="Disable the extracted text cache")
+    
+    args = parser.parse_args(argv)
+    if args.top_k < 1:
+        parser.error("--top-k must be at least 1")
+    
+    # Optional per-stage instrumentation
+    instrumentation = None
+    if args.metrics_jsonl or args.metrics_prom or args.trace_memory:
+        instrumentation = Instrumentation(trace_memory=args.trace_memory)
+        if args.metrics_jsonl:
+            instrumentation.add_hook(JsonLinesWriter(args.metrics_jsonl))
+
+    # Isolated extraction workers with a per-file timeout and memory limit
+    sandbox_options = None
+    if not args.no_sandbox:
+        sandbox_options = {"timeout": args.extract_timeout, "memory_mb": args.extract_memory_mb}
+    
+    if args.command == "batch":
+        from batch import run_batch
+        output_format = args.format or ("jsonl" if args.output.lower().endswith((".jsonl", ".json")) else "csv")
+        run_batch(args.target, args.output, output_format=output_format,
+                  workers=args.workers, job_file=args.jobs, top=args.top,
+                  cache_dir=None if args.no_cache else args.cache_dir,
+                  charts_dir=args.charts_dir, chart_format=args.chart_format, chart_dpi=args.chart_dpi,
+                  instrumentation=instrumentation, max_pages=args.max_pages, max_chars=args.max_chars,
+                  sandbox_options=sandbox_options, from_corpus=args.from_corpus, hash_features=args.hash_features,
+                  lsa_dims=args.lsa_dims, skills_file=args.skills, dedup=args.dedup,
+                  dedup_threshold=args.dedup_threshold)
+    elif args.command == "index":
+        build_resume_index(args.target, args.index, workers=args.workers, cache_dir=args.cache_dir,
+                           from_corpus=args.from_corpus, max_pages=args.max_pages, max_chars=args.max_chars,
+                           sandbox_options=sandbox_options)
+    elif args.command == "store":
+        build_corpus_store(args.target, args.corpus, workers=args.workers, cache_dir=args.cache_dir,
+                           max_pages=args.max_pages, max_chars=args.max_chars, sandbox_options=sandbox_options)
+    elif args.command == "search":
+        search_resume_index(args.index, role=args.role, text=args.text, job_file=args.jobs, top=args.top)
+    elif args.command == "serve":
+        import scoring_daemon
+        scoring_daemon.serve(args.jobs, socket_path=args.socket or scoring_daemon.DEFAULT_SOCKET, port=args.port,
+                             cache_dir=None if args.no_cache else args.cache_dir,
+                             poll_interval=args.poll_interval, instrumentation=instrumentation,
+                             max_pages=args.max_pages, max_chars=args.max_chars, sandbox_options=sandbox_options)
+    elif args.command == "serve-http":
+        from async_service import run_service
+        run_service(args.jobs, host=args.host, port=args.port, workers=args.workers, max_batch=args.max_batch,
+                    batch_window_ms=args.batch_window_ms, max_pending=args.max_pending,
+                    max_upload_mb=args.max_upload_mb, cache_dir=None if args.no_cache else args.cache_dir,
+                    instrumentation=instrumentation, sandbox_options=sandbox_options)
+    else:
+        sandbox = SandboxedExtractor(**sandbox_options) if sandbox_options is not None else None
+        analyzer = ResumeAnalyzer(instrumentation=instrumentation, top_k=args.top_k, max_pages=args.max_pages,
+                                  max_chars=args.max_chars, page_workers=args.page_workers, sandbox=sandbox,
+                                  hash_features=args.hash_features, lsa_dims=args.lsa_dims, skills_file=args.skills)
+        analyzer.run()
+        if sandbox is not None:
+            sandbox.close()
+        
+    if instrumentation is not None and args.metrics_prom:
+        instrumentation.write_prometheus(args.metrics_prom)
+
+
 if __name__ == "__main__":
-    analyzer = ResumeAnalyzer()
-    analyzer.run()
\ No newline at end of file
+    main()
\ No newline at end of file
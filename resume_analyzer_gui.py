@@ -4,30 +4,48 @@ from PIL import Image, ImageTk
 import matplotlib
 matplotlib.use("TkAgg")
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-import matplotlib.pyplot as plt
+from charts import ChartRenderer, ChartSaver
 import os
 import datetime 
 import sys
+import threading
+import queue
+import argparse
+from contextlib import nullcontext
 from resume_analyzer import ResumeAnalyzer  # Import the original class
+from extraction_sandbox import DEFAULT_MEMORY_MB, DEFAULT_TIMEOUT, SandboxedExtractor
+from catalog_watcher import CatalogWatcher
+from instrumentation import Instrumentation, JsonLinesWriter
 
 class ResumeAnalyzerGUI:
-    def __init__(self, root):
+    def __init__(self, root, instrumentation=None, sandbox=None, skills_file=None):
         self.root = root
         self.root.title("Resume Analyzer - Career Match Finder")
         self.root.geometry("900x700")
         self.root.configure(bg="#f0f0f0")  # Slightly lighter background
         
-        # Initialize analyzer
-        self.analyzer = ResumeAnalyzer()
+        # Initialize analyzer; a sandbox keeps a hostile PDF from hanging the GUI
+        self.analyzer = ResumeAnalyzer(instrumentation=instrumentation, sandbox=sandbox, skills_file=skills_file)
         
         # Variables
         self.name_var = tk.StringVar()
         self.resume_path_var = tk.StringVar()
         self.status_var = tk.StringVar(value="Ready to analyze your resume")
         
+        # Background analysis state (one job at a time)
+        self.analysis_thread = None
+        self.cancel_event = threading.Event()
+        self.analysis_queue = queue.Queue()
+        
         # Apply professional color theme
         self.apply_theme()
         
+        # Chart figure is created once and redrawn; PNG exports run on a saver thread
+        self.chart_renderer = ChartRenderer(facecolor=self.colors["frame_bg"])
+        self.chart_saver = ChartSaver()
+        self.chart_canvas = None
+        self.results_text = None
+        
         # Create charts directory
         self.charts_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), "charts")
         if not os.path.exists(self.charts_dir):
@@ -38,6 +56,10 @@ class ResumeAnalyzerGUI:
         
         # Try to load job descriptions automatically
         self.load_job_descriptions()
+        
+        # Apply edits to the job description file without a restart
+        self.catalog_watcher = CatalogWatcher("job_description.txt")
+        self.root.after(2000, self.poll_catalog)
 
     def apply_theme(self):
         """Apply professional color theme to the application"""
@@ -156,14 +178,25 @@ class ResumeAnalyzerGUI:
         )
         browse_button.grid(row=1, column=2, padx=5, pady=5)
         
-        # Analyze button
-        analyze_button = ttk.Button(
-            input_content,
+        # Analyze and Cancel buttons
+        button_frame = ttk.Frame(input_content, style="TFrame")
+        button_frame.grid(row=2, column=1, pady=15)
+        
+        self.analyze_button = ttk.Button(
+            button_frame,
             text="Analyze Resume",
             command=self.run_analysis,
             style="Accent.TButton"
         )
-        analyze_button.grid(row=2, column=1, pady=15)
+        self.analyze_button.pack(side=tk.LEFT, padx=5)
+        
+        self.cancel_button = ttk.Button(
+            button_frame,
+            text="Cancel",
+            command=self.cancel_analysis,
+            state=tk.DISABLED
+        )
+        self.cancel_button.pack(side=tk.LEFT, padx=5)
         
         # Status bar
         status_bar = ttk.Label(
@@ -203,15 +236,16 @@ class ResumeAnalyzerGUI:
         if filename:
             self.resume_path_var.set(filename)
             
-    def load_job_descriptions(self):
+    def load_job_descriptions(self, reload=False):
         """Load job descriptions and update status"""
-        self.status_var.set("Loading job descriptions...")
+        self.status_var.set("Reloading job descriptions..." if reload else "Loading job descriptions...")
         self.root.update_idletasks()
         
         result = self.analyzer.load_job_descriptions()
         
         if result:
-            self.status_var.set(f"Loaded {len(self.analyzer.job_descriptions)} job descriptions")
+            action = "Reloaded" if reload else "Loaded"
+            self.status_var.set(f"{action} {len(self.analyzer.job_descriptions)} job descriptions")
         else:
             self.status_var.set("Error: Could not load job descriptions")
             messagebox.showerror(
@@ -219,8 +253,21 @@ class ResumeAnalyzerGUI:
                 "Could not load job descriptions. Please make sure 'job_description.txt' file exists."
             )
             
+    def poll_catalog(self):
+        """Reload the catalog after it was edited, once no analysis is running"""
+        busy = self.analysis_thread is not None and self.analysis_thread.is_alive()
+        if not busy and self.catalog_watcher.check():
+            # Only added or modified roles are re-cleaned, so this is quick
+            self.load_job_descriptions(reload=True)
+        self.root.after(2000, self.poll_catalog)
+        
     def run_analysis(self):
-        """Run the resume analysis and display results"""
+        """Start the resume analysis on a worker thread"""
+        # Refuse a second analysis while one is still running
+        if self.analysis_thread is not None and self.analysis_thread.is_alive():
+            messagebox.showinfo("Busy", "An analysis is already running. Please wait or cancel it first.")
+            return
+            
         # Check if inputs are valid
         name = self.name_var.get().strip()
         resume_path = self.resume_path_var.get().strip()
@@ -237,42 +284,95 @@ class ResumeAnalyzerGUI:
         self.analyzer.name = name
         self.analyzer.resume_file = resume_path
         
-        # Update status
+        # Update status and buttons
         self.status_var.set("Analyzing resume...")
-        self.root.update_idletasks()
+        self.analyze_button.config(state=tk.DISABLED)
+        self.cancel_button.config(state=tk.NORMAL)
         
-        # Extract text from resume
-        if not self.analyzer.extract_text_from_file():
-            self.status_var.set("Error: Could not extract text from resume")
-            messagebox.showerror("Error", "Could not extract text from the resume file")
-            return
+        # Run extraction and scoring off the Tk main thread
+        self.cancel_event.clear()
+        self.analysis_thread = threading.Thread(target=self.analysis_worker, daemon=True)
+        self.analysis_thread.start()
+        self.root.after(100, self.poll_analysis)
+        
+    def analysis_worker(self):
+        """Extract and score the resume (runs on a worker thread, never touches Tk)"""
+        try:
+            self.analysis_queue.put(("stage", "Step 1/3: Extracting text from resume..."))
+            if not self.analyzer.extract_text_from_file():
+                if self.cancel_event.is_set():
+                    self.analysis_queue.put(("cancelled", None))
+                    return
+                error = self.analyzer.extract_error
+                if error is not None:
+                    self.analysis_queue.put(("error", f"Could not extract text from the resume file ({error.reason}): {error}"))
+                else:
+                    self.analysis_queue.put(("error", "Could not extract text from the resume file"))
+                return
+                
+            if self.cancel_event.is_set():
+                self.analysis_queue.put(("cancelled", None))
+                return
+                
+            self.analysis_queue.put(("stage", "Step 2/3: Matching against job descriptions..."))
+            if not self.analyzer.calculate_similarities():
+                self.analysis_queue.put(("error", "Could not analyze the resume"))
+                return
+            self.analyzer.match_skills()
+                
+            if self.cancel_event.is_set():
+                self.analysis_queue.put(("cancelled", None))
+                return
+                
+            self.analysis_queue.put(("done", None))
+        except Exception as e:
+            self.analysis_queue.put(("error", f"Analysis failed: {e}"))
             
-        # Calculate similarities
-        if not self.analyzer.calculate_similarities():
-            self.status_var.set("Error: Could not analyze resume")
-            messagebox.showerror("Error", "Could not analyze the resume")
-            return
+    def poll_analysis(self):
+        """Apply messages from the worker thread on the Tk main thread"""
+        try:
+            while True:
+                kind, payload = self.analysis_queue.get_nowait()
+                if kind == "stage":
+                    if not self.cancel_event.is_set():
+                        self.status_var.set(payload)
+                    continue
+                    
+                # Final message: the worker has finished
+                self.analyze_button.config(state=tk.NORMAL)
+                self.cancel_button.config(state=tk.DISABLED)
+                if kind == "done" and not self.analyzer.best_match:
+                    self.status_var.set("Analysis complete: no matching roles found")
+                    messagebox.showinfo("No Match", "Your resume shares no keywords with any of the job descriptions.")
+                elif kind == "done":
+                    self.status_var.set("Step 3/3: Rendering results...")
+                    self.display_results()
+                elif kind == "cancelled":
+                    self.status_var.set("Analysis cancelled")
+                else:
+                    self.status_var.set(f"Error: {payload}")
+                    messagebox.showerror("Error", payload)
+                return
+        except queue.Empty:
+            pass
             
-        # Show results
-        self.display_results()
+        self.root.after(100, self.poll_analysis)
         
-    def display_results(self):
-        """Display analysis results in the GUI with horizontal layout"""
-        # Update status
-        self.status_var.set("Analysis complete")
-        
-        # Clear and recreate results frame to avoid stacking issues
-        if hasattr(self, 'results_frame') and self.results_frame.winfo_ismapped():
-            self.results_frame.pack_forget()
-            
-        # Recreate results frame with secondary style
-        main_frame = self.root.winfo_children()[0]  # Get the main frame
-        self.results_frame = ttk.LabelFrame(
-            main_frame, 
-            text="Analysis Results", 
-            padding=15,
-            style="Secondary.TLabelframe"
-        )
+    def cancel_analysis(self):
+        """Cancel the running analysis, stopping an extraction in progress"""
+        if self.analysis_thread is None or not self.analysis_thread.is_alive():
+            return
+        self.cancel_event.set()
+        # Killing the sandbox worker ends a slow extraction at once; later
+        # stages are quick and check cancel_event at their boundaries
+        if self.analyzer.sandbox is not None:
+            self.analyzer.sandbox.cancel()
+        self.cancel_button.config(state=tk.DISABLED)
+        self.status_var.set("Analysis cancelled")
+        
+    def create_results_frame(self):
+        """Create the results text and chart widgets (reused by every analysis)"""
+        # Show the results frame created in create_gui (only once)
         self.results_frame.pack(fill=tk.BOTH, expand=True, pady=(0, 5))
         
         # Create a horizontal layout with two frames side by side
@@ -318,12 +418,69 @@ class ResumeAnalyzerGUI:
         self.results_text.tag_configure("success", foreground=self.colors["success"])
         self.results_text.tag_configure("emphasis", font=("Arial", 10, "bold"), foreground="#8e44ad") # Purple
         
+        # Right side for chart with a different background color - MODIFIED WITH SCROLLBARS
+        chart_container = ttk.Frame(horizontal_frame, style="Chart.TFrame")
+        chart_container.grid(row=0, column=1, sticky="nsew", padx=(10, 0))
+        
+        # Make chart container responsive
+        chart_container.columnconfigure(0, weight=1)
+        chart_container.rowconfigure(0, weight=1)
+        
+        # Create a canvas with scrollbars for the chart
+        chart_canvas = tk.Canvas(chart_container, bg=self.colors["frame_bg"], highlightthickness=0)
+        chart_canvas.grid(row=0, column=0, sticky="nsew")
+        
+        # Add vertical scrollbar
+        chart_v_scroll = ttk.Scrollbar(chart_container, orient="vertical", command=chart_canvas.yview)
+        chart_v_scroll.grid(row=0, column=1, sticky="ns")
+        
+        # Add horizontal scrollbar
+        chart_h_scroll = ttk.Scrollbar(chart_container, orient="horizontal", command=chart_canvas.xview)
+        chart_h_scroll.grid(row=1, column=0, sticky="ew")
+        
+        # Configure canvas scrolling
+        chart_canvas.configure(xscrollcommand=chart_h_scroll.set, yscrollcommand=chart_v_scroll.set)
+        
+        # Create a frame inside the canvas to hold the chart
+        chart_frame = ttk.Frame(chart_canvas, style="Chart.TFrame")
+        
+        # Create a window inside the canvas to display the frame
+        chart_canvas_window = chart_canvas.create_window((0, 0), window=chart_frame, anchor="nw")
+        
+        # Create the chart canvas once; each analysis only redraws the figure
+        self.chart_canvas = FigureCanvasTkAgg(self.chart_renderer.figure, chart_frame)
+        self.chart_canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
+        
+        # Make sure the chart frame resizes with the canvas
+        def configure_chart_frame(event):
+            # Update the scrollregion to encompass the inner frame
+            chart_canvas.configure(scrollregion=chart_canvas.bbox("all"))
+            
+            # Update the size of the window to match the canvas width
+            width = event.width
+            chart_canvas.itemconfig(chart_canvas_window, width=width)
+        
+        # Make the chart frame responsive to canvas resizing
+        chart_frame.bind("<Configure>", configure_chart_frame)
+        chart_canvas.bind("<Configure>", lambda e: chart_canvas.itemconfig(chart_canvas_window, width=e.width))
+        
+    def display_results(self):
+        """Display analysis results in the GUI with horizontal layout"""
+        # Update status
+        self.status_var.set("Analysis complete")
+        
+        # Build the results widgets on first use, then just clear and refill them
+        if self.results_text is None:
+            self.create_results_frame()
+        self.results_text.delete("1.0", tk.END)
+        
         # Insert header with formatting
         self.results_text.insert(tk.END, f"📊 RESUME ANALYSIS RESULTS FOR {self.analyzer.name.upper()} 📊\n_____________________________________________________\n", "header")
         
         # Insert match percentages with formatting
         self.results_text.insert(tk.END, "Career match percentages (normalized to 100%):\n", "subheader")
-        for role, score in sorted(self.analyzer.normalized_job_matches.items(), key=lambda x: x[1], reverse=True):
+        # Roles come ranked best first (on every scoring path), followed by the "Other" bucket
+        for role, score in self.analyzer.chart_matches().items():
             self.results_text.insert(tk.END, f"🔹 {role}: ", "normal")
             self.results_text.insert(tk.END, f"{score}%\n", "highlight")
             
@@ -355,6 +512,15 @@ class ResumeAnalyzerGUI:
             self.results_text.insert(tk.END, "2. Practice explaining how your experience relates to the role's requirements\n", "normal")
             self.results_text.insert(tk.END, "3. Consider preparing a portfolio of relevant work samples\n", "normal")
             
+        # Concrete matched and missing skills for each returned role
+        if self.analyzer.skill_gaps:
+            self.results_text.insert(tk.END, "\n" + "_" * 50 + "\n\n", "normal")
+            self.results_text.insert(tk.END, "SKILLS BY ROLE:\n", "subheader")
+            for role, gaps in self.analyzer.skill_gaps.items():
+                self.results_text.insert(tk.END, f"{role}\n", "normal")
+                self.results_text.insert(tk.END, f"  ✅ Matched: {', '.join(gaps['matched']) or 'none'}\n", "normal")
+                self.results_text.insert(tk.END, f"  ❌ Missing: {', '.join(gaps['missing']) or 'none'}\n", "normal")
+            
         # Add additional content to make scrollbar necessary
         self.results_text.insert(tk.END, "\n" + "_" * 50 + "\n\n", "normal")
         self.results_text.insert(tk.END, "ANALYSIS DETAILS:\n", "subheader")
@@ -376,141 +542,64 @@ class ResumeAnalyzerGUI:
         self.results_text.insert(tk.END, "7. List technical skills separately\n", "normal")
         self.results_text.insert(tk.END, "8. Proofread carefully\n", "normal")
         
-        # Right side for chart with a different background color - MODIFIED WITH SCROLLBARS
-        chart_container = ttk.Frame(horizontal_frame, style="Chart.TFrame")
-        chart_container.grid(row=0, column=1, sticky="nsew", padx=(10, 0))
-        
-        # Make chart container responsive
-        chart_container.columnconfigure(0, weight=1)
-        chart_container.rowconfigure(0, weight=1)
-        
-        # Create a canvas with scrollbars for the chart
-        chart_canvas = tk.Canvas(chart_container, bg=self.colors["frame_bg"], highlightthickness=0)
-        chart_canvas.grid(row=0, column=0, sticky="nsew")
-        
-        # Add vertical scrollbar
-        chart_v_scroll = ttk.Scrollbar(chart_container, orient="vertical", command=chart_canvas.yview)
-        chart_v_scroll.grid(row=0, column=1, sticky="ns")
-        
-        # Add horizontal scrollbar
-        chart_h_scroll = ttk.Scrollbar(chart_container, orient="horizontal", command=chart_canvas.xview)
-        chart_h_scroll.grid(row=1, column=0, sticky="ew")
-        
-        # Configure canvas scrolling
-        chart_canvas.configure(xscrollcommand=chart_h_scroll.set, yscrollcommand=chart_v_scroll.set)
-        
-        # Create a frame inside the canvas to hold the chart
-        chart_frame = ttk.Frame(chart_canvas, style="Chart.TFrame")
-        
-        # Create a window inside the canvas to display the frame
-        chart_canvas_window = chart_canvas.create_window((0, 0), window=chart_frame, anchor="nw")
-        
-        # Create and display chart in the scrollable frame
-        self.create_chart(chart_frame)
-        
-        # Make sure the chart frame resizes with the canvas
-        def configure_chart_frame(event):
-            # Update the scrollregion to encompass the inner frame
-            chart_canvas.configure(scrollregion=chart_canvas.bbox("all"))
-            
-            # Update the size of the window to match the canvas width
-            width = event.width
-            chart_canvas.itemconfig(chart_canvas_window, width=width)
-        
-        # Make the chart frame responsive to canvas resizing
-        chart_frame.bind("<Configure>", configure_chart_frame)
-        chart_canvas.bind("<Configure>", lambda e: chart_canvas.itemconfig(chart_canvas_window, width=e.width))
+        # Redraw the chart in the existing figure/canvas
+        self.create_chart()
         
-        # Auto-save chart
+        # Auto-save chart (rendered off the main thread)
         chart_path = self.auto_save_chart()
         if chart_path:
             self.results_text.insert(tk.END, f"\n📷 Chart saved as: {os.path.basename(chart_path)}\n", "normal")
             self.results_text.insert(tk.END, f"📁 Location: {self.charts_dir}\n", "normal")
         
-    def create_chart(self, frame):
-        """Create and display the pie chart in the provided frame"""
-        # Get data
-        roles = list(self.analyzer.normalized_job_matches.keys())
-        scores = list(self.analyzer.normalized_job_matches.values())
-    
-        # Create figure with larger size to support scrolling
-        fig = plt.figure(figsize=(7, 6), tight_layout=True)  # Increased size for better visibility with scrollbars
-        ax = fig.add_subplot(111)
-    
-        # Use the same colors for the pie chart as requested
-        colors = ['#1f77b4', '#ff7f0e', '#2ca02c', '#d62728', '#9467bd', '#8c564b']
-    
-        # Create pie chart with improved styling
-        wedges, texts, autotexts = ax.pie(
-            scores, 
-            labels=None,  # Remove labels from pie to avoid overlap
-            autopct='%1.1f%%',
-            startangle=90,
-            shadow=True,
-            colors=colors,
-            wedgeprops={'edgecolor': 'white', 'linewidth': 1, 'antialiased': True},
-            textprops={'fontsize': 9}  # Slightly larger for better visibility
-        )
-    
-        # Customize text appearance
-        for autotext in autotexts:
-            autotext.set_fontsize(9)
-            autotext.set_fontweight('bold')
-            autotext.set_color('white')
-        
-        # Add title with proper formatting
-        ax.set_title('Resume Match Analysis', 
-                     fontsize=12,  # Slightly larger
-                     fontweight='bold',
-                     pad=10)
-                 
-        # Add legend outside the pie for better positioning
-        plt.legend(wedges, roles, title="Career Roles", 
-                  loc="center left", 
-                  bbox_to_anchor=(1, 0.5),
-                  fontsize=8,  # Slightly larger
-                  title_fontsize=9)
-    
-        # Adjust subplot to give more room for the legend
-        plt.subplots_adjust(right=0.65)
-        
-        # Set background color of the chart
-        fig.patch.set_facecolor(self.colors["frame_bg"])
-        ax.set_facecolor(self.colors["frame_bg"])
-                 
-        # Remove any existing canvas
-        for widget in frame.winfo_children():
-            widget.destroy()
-        
-        # Create canvas with appropriate size
-        canvas = FigureCanvasTkAgg(fig, frame)
-        canvas.draw()
-        canvas_widget = canvas.get_tk_widget()
-        canvas_widget.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
-    
-        # Store the figure for saving later
-        self.chart_figure = fig
+    def create_chart(self):
+        """Redraw the pie chart in the reusable figure"""
+        matches = self.analyzer.chart_matches()
+        roles = list(matches.keys())
+        scores = list(matches.values())
+        
+        # Record chart rendering alongside the analyzer's stages when instrumented
+        stage = nullcontext()
+        if self.analyzer.instrumentation is not None:
+            stage = self.analyzer.instrumentation.stage("render_chart", resume_file=self.analyzer.resume_file)
+        with stage:
+            self.chart_renderer.draw(roles, scores)
+            self.chart_canvas.draw()
         
     def auto_save_chart(self):
         """Automatically save the chart when analysis is complete"""
-        if not hasattr(self, 'chart_figure'):
+        if not self.analyzer.normalized_job_matches:
             return None
             
-        try:
-            # Create a filename with timestamp
-            timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
-            name = self.analyzer.name.lower().replace(" ", "_")
-            filename = f"{self.charts_dir}/resume_analysis_{name}_{timestamp}.png"
-            
-            # Save the chart
-            self.chart_figure.savefig(filename, dpi=300, bbox_inches='tight')
-            self.status_var.set(f"Analysis complete. Chart saved as {os.path.basename(filename)}")
+        # Create a filename with timestamp
+        timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
+        name = self.analyzer.name.lower().replace(" ", "_")
+        filename = f"{self.charts_dir}/resume_analysis_{name}_{timestamp}.png"
+        
+        # Render the 300-dpi PNG with Agg on the chart saver thread
+        matches = self.analyzer.chart_matches()
+        future = self.chart_saver.submit(
+            list(matches.keys()),
+            list(matches.values()),
+            filename,
+            dpi=300,
+            facecolor=self.colors["frame_bg"]
+        )
+        self.status_var.set("Analysis complete. Saving chart...")
+        self.root.after(100, self.poll_chart_save, future)
+        return filename
+        
+    def poll_chart_save(self, future):
+        """Report the result of a background chart save on the main thread"""
+        if not future.done():
+            self.root.after(100, self.poll_chart_save, future)
+            return
             
-            return filename
-        except Exception as e:
-            self.status_var.set(f"Error saving chart: {str(e)}")
-            messagebox.showwarning("Warning", f"Could not auto-save chart: {str(e)}")
-            return None
+        error = future.exception()
+        if error is None:
+            self.status_var.set(f"Analysis complete. Chart saved as {os.path.basename(future.result())}")
+        else:
+            self.status_var.set(f"Error saving chart: {str(error)}")
+            messagebox.showwarning("Warning", f"Could not auto-save chart: {str(error)}")
         
     def save_chart(self):
         """Save the chart as an image file (manual save)"""
@@ -527,15 +616,30 @@ class ResumeAnalyzerGUI:
             initialdir=self.charts_dir
         )
         
-        if filename and hasattr(self, 'chart_figure'):
+        if filename and self.analyzer.normalized_job_matches:
             try:
-                self.chart_figure.savefig(filename, dpi=300, bbox_inches='tight')
+                self.chart_renderer.figure.savefig(filename, dpi=300, bbox_inches='tight')
                 messagebox.showinfo("Success", f"Chart saved as {filename}")
             except Exception as e:
                 messagebox.showerror("Error", f"Failed to save chart: {str(e)}")
 
 # Create a main function to run the GUI
 def main():
+    # Optional per-stage instrumentation
+    parser = argparse.ArgumentParser(description="Resume Analyzer GUI")
+    parser.add_argument("--metrics-jsonl", default=None, help="Append per-stage timing/memory records to this JSON lines file")
+    parser.add_argument("--metrics-prom", default=None, help="Write per-stage totals in Prometheus text format on exit")
+    parser.add_argument("--extract-timeout", type=float, default=DEFAULT_TIMEOUT, help="Seconds allowed to extract one resume")
+    parser.add_argument("--skills", default=None, help="Skills dictionary file, one skill per line (default: bundled list)")
+    parser.add_argument("--extract-memory-mb", type=int, default=DEFAULT_MEMORY_MB, help="Address-space limit of the extraction worker")
+    args = parser.parse_args()
+    
+    instrumentation = None
+    if args.metrics_jsonl or args.metrics_prom:
+        instrumentation = Instrumentation()
+        if args.metrics_jsonl:
+            instrumentation.add_hook(JsonLinesWriter(args.metrics_jsonl))
+            
     # Check if resumes directory exists
     if not os.path.exists("resumes"):
         os.makedirs("resumes")
@@ -551,8 +655,13 @@ def main():
         
     # Create and run the GUI
     root = tk.Tk()
-    app = ResumeAnalyzerGUI(root)
+    sandbox = SandboxedExtractor(args.extract_timeout, args.extract_memory_mb)
+    app = ResumeAnalyzerGUI(root, instrumentation=instrumentation, sandbox=sandbox, skills_file=args.skills)
     root.mainloop()
+    sandbox.close()
+    
+    if instrumentation is not None and args.metrics_prom:
+        instrumentation.write_prometheus(args.metrics_prom)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
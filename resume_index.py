@@ -0,0 +1,272 @@
+import math
+import multiprocessing
+import os
+import tempfile
+from collections import Counter
+
+import numpy as np
+import scipy.sparse as sp
+
+from job_index import pack_strings, unpack_strings
+from text_cleaning import vectorizer_tokens
+
+# Bump when the on-disk index layout changes
+RESUME_INDEX_FORMAT = 1
+
+
+class ResumeIndex:
+    """Inverted index over cleaned resume text for top-k candidate search.
+
+    Documents are stored as L2-normalised log term frequencies in column
+    (CSC) segments, so each term's column is its postings list. A query
+    weights its own terms by the current corpus IDF (the classic lnc.ltc
+    cosine scheme), which keeps stored documents independent of IDF and lets
+    new resumes be added incrementally without rewriting the index.
+    Scoring only touches the postings of the query's terms.
+    """
+
+    def __init__(self, segment_size=50000, max_segments=8):
+        self.segment_size = segment_size
+        self.max_segments = max_segments
+        self.vocabulary = {}
+        self.doc_freq = []
+        self.doc_ids = []
+        self.doc_positions = {}
+        self.segments = []
+        self._pending_indices = []
+        self._pending_data = []
+        self._pending_indptr = [0]
+
+    def __len__(self):
+        return len(self.doc_ids)
+
+    def __contains__(self, doc_id):
+        return doc_id in self.doc_positions
+
+    def add(self, doc_id, cleaned_text):
+        """Add one cleaned resume; returns False if doc_id is already indexed"""
+        if doc_id in self.doc_positions:
+            return False
+
+        counts = Counter(vectorizer_tokens(cleaned_text))
+        columns = []
+        weights = []
+        for term, count in counts.items():
+            column = self.vocabulary.get(term)
+            if column is None:
+                column = len(self.vocabulary)
+                self.vocabulary[term] = column
+                self.doc_freq.append(0)
+            self.doc_freq[column] += 1
+            columns.append(column)
+            weights.append(1.0 + math.log(count))
+
+        norm = math.sqrt(sum(weight * weight for weight in weights)) or 1.0
+        self._pending_indices.extend(columns)
+        self._pending_data.extend(weight / norm for weight in weights)
+        self._pending_indptr.append(len(self._pending_indices))
+
+        self.doc_positions[doc_id] = len(self.doc_ids)
+        self.doc_ids.append(doc_id)
+
+        if len(self._pending_indptr) - 1 >= self.segment_size:
+            self.commit()
+        return True
+
+    def commit(self):
+        """Turn pending documents into a searchable segment"""
+        n_pending = len(self._pending_indptr) - 1
+        if n_pending == 0:
+            return
+        segment = sp.csr_matrix(
+            (np.array(self._pending_data, dtype=np.float32),
+             np.array(self._pending_indices, dtype=np.int32),
+             np.array(self._pending_indptr, dtype=np.int64)),
+            shape=(n_pending, len(self.vocabulary)),
+        ).tocsc()
+        self.segments.append(segment)
+        self._pending_indices = []
+        self._pending_data = []
+        self._pending_indptr = [0]
+
+        if len(self.segments) > self.max_segments:
+            self.merge_segments()
+
+    def merge_segments(self):
+        """Merge all segments into one (vocabulary may have grown in between)"""
+        if len(self.segments) <= 1:
+            return
+        n_terms = len(self.vocabulary)
+        resized = []
+        for segment in self.segments:
+            segment = segment.tocsr()
+            segment.resize((segment.shape[0], n_terms))
+            resized.append(segment)
+        self.segments = [sp.vstack(resized, format='csc')]
+
+    def query_vector(self, cleaned_text):
+        """Return (columns, weights) of the IDF-weighted, normalised query"""
+        n_docs = len(self.doc_ids)
+        counts = Counter(vectorizer_tokens(cleaned_text))
+        columns = []
+        weights = []
+        for term, count in counts.items():
+            column = self.vocabulary.get(term)
+            if column is None:
+                continue
+            # Smoothed IDF, as in JobIndex/TfidfVectorizer
+            idf = math.log((1 + n_docs) / (1 + self.doc_freq[column])) + 1.0
+            columns.append(column)
+            weights.append((1.0 + math.log(count)) * idf)
+
+        norm = math.sqrt(sum(weight * weight for weight in weights)) or 1.0
+        return columns, [weight / norm for weight in weights]
+
+    def scores(self, cleaned_text):
+        """Cosine score of every indexed resume against the query text"""
+        self.commit()
+        columns, weights = self.query_vector(cleaned_text)
+        all_scores = np.zeros(len(self.doc_ids), dtype=np.float32)
+        offset = 0
+        for segment in self.segments:
+            n_rows, n_terms = segment.shape
+            postings = []
+            contributions = []
+            for column, weight in zip(columns, weights):
+                if column >= n_terms:
+                    continue
+                start, end = segment.indptr[column], segment.indptr[column + 1]
+                if start == end:
+                    continue
+                postings.append(segment.indices[start:end])
+                contributions.append(segment.data[start:end] * weight)
+            if postings:
+                all_scores[offset:offset + n_rows] = np.bincount(
+                    np.concatenate(postings),
+                    weights=np.concatenate(contributions),
+                    minlength=n_rows,
+                )
+            offset += n_rows
+        return all_scores
+
+    def search(self, cleaned_text, k=50):
+        """Return the top-k (doc_id, score) pairs for a cleaned job text"""
+        scores = self.scores(cleaned_text)
+        if len(scores) == 0:
+            return []
+        k = min(k, len(scores))
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top], kind='stable')]
+        return [(self.doc_ids[i], float(scores[i])) for i in top if scores[i] > 0]
+
+    def save(self, path):
+        """Write the index to a single .npz file"""
+        self.commit()
+        self.merge_segments()
+        n_terms = len(self.vocabulary)
+        if self.segments:
+            matrix = self.segments[0].tocsr()
+            matrix.resize((matrix.shape[0], n_terms))
+            matrix = matrix.tocsc()
+        else:
+            matrix = sp.csc_matrix((0, n_terms), dtype=np.float32)
+
+        terms = [None] * n_terms
+        for term, column in self.vocabulary.items():
+            terms[column] = term
+        term_blob, term_offsets = pack_strings(terms)
+        id_blob, id_offsets = pack_strings(self.doc_ids)
+
+        directory = os.path.dirname(os.path.abspath(path))
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, 'wb') as file:
+                np.savez(
+                    file,
+                    format=np.array(RESUME_INDEX_FORMAT),
+                    term_blob=term_blob, term_offsets=term_offsets,
+                    id_blob=id_blob, id_offsets=id_offsets,
+                    doc_freq=np.array(self.doc_freq, dtype=np.int64),
+                    data=matrix.data, indices=matrix.indices, indptr=matrix.indptr,
+                    shape=np.array(matrix.shape),
+                )
+            os.replace(tmp_path, path)
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    def load(self, path):
+        """Load an index saved with save(); returns False if unreadable"""
+        try:
+            with np.load(path, allow_pickle=False) as index:
+                if int(index["format"]) != RESUME_INDEX_FORMAT:
+                    return False
+                terms = unpack_strings(index["term_blob"], index["term_offsets"])
+                doc_ids = unpack_strings(index["id_blob"], index["id_offsets"])
+                doc_freq = index["doc_freq"].tolist()
+                matrix = sp.csc_matrix(
+                    (index["data"], index["indices"], index["indptr"]),
+                    shape=tuple(index["shape"]),
+                )
+        except (OSError, KeyError, ValueError) as e:
+            print(f"Could not read resume index '{path}': {e}")
+            return False
+
+        self.vocabulary = {term: column for column, term in enumerate(terms)}
+        self.doc_freq = doc_freq
+        self.doc_ids = doc_ids
+        self.doc_positions = {doc_id: i for i, doc_id in enumerate(doc_ids)}
+        self.segments = [matrix] if matrix.shape[0] else []
+        self._pending_indices = []
+        self._pending_data = []
+        self._pending_indptr = [0]
+        return True
+
+
+# Analyzer used by extraction workers in index_files
+_worker_analyzer = None
+
+
+def init_extract_worker(cache_dir, max_pages=None, max_chars=None, sandbox_options=None):
+    """Create one analyzer per worker process for text extraction"""
+    global _worker_analyzer
+    from resume_analyzer import ResumeAnalyzer
+    from extraction_sandbox import SandboxedExtractor
+    # As in batch mode, each worker owns one sandbox process with the timeout and memory limit
+    sandbox = SandboxedExtractor(**sandbox_options) if sandbox_options is not None else None
+    _worker_analyzer = ResumeAnalyzer(cache_dir=cache_dir, max_pages=max_pages, max_chars=max_chars, sandbox=sandbox)
+
+
+def extract_clean_text(path):
+    """Extract and clean one resume in a worker, returning (path, text or None)"""
+    analyzer = _worker_analyzer
+    analyzer.resume_file = path
+    analyzer.resume_text = ""
+    if not analyzer.extract_text_from_file():
+        return path, None
+    return path, analyzer.resume_text
+
+
+def index_files(index, paths, workers=None, cache_dir=None, max_pages=None, max_chars=None, sandbox_options=None):
+    """Extract resumes in parallel and add the ones not yet indexed"""
+    paths = (path for path in paths if path not in index)
+    added = 0
+    failed = 0
+    with multiprocessing.Pool(workers or os.cpu_count() or 1, initializer=init_extract_worker,
+                              initargs=(cache_dir, max_pages, max_chars, sandbox_options)) as pool:
+        for path, text in pool.imap_unordered(extract_clean_text, paths, chunksize=8):
+            if text is None:
+                failed += 1
+            elif index.add(path, text):
+                added += 1
+    return added, failed
+
+
+def index_corpus(index, store):
+    """Add every document of a CorpusStore that is not yet indexed (no extraction)"""
+    added = 0
+    for doc_id, text in store.iter_documents():
+        if index.add(doc_id, text):
+            added += 1
+    return added
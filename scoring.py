@@ -0,0 +1,249 @@
+import asyncio
+import os
+from dataclasses import dataclass
+from typing import Tuple
+
+from extraction import extract_text, resume_kind
+
+# Roles returned (and charted) per resume; the rest are summed into an "Other" bucket
+DEFAULT_TOP_K = 10
+OTHER_LABEL = "Other ({} roles)"
+
+
+@dataclass(frozen=True)
+class RoleMatch:
+    """Match of one resume against one role"""
+    role: str
+    score: int
+    normalized_score: int
+
+
+@dataclass(frozen=True)
+class MatchResult:
+    """Immutable result of scoring one resume against the job catalog.
+
+    ``matches`` is ranked best first: normalized score, then raw score, then
+    catalog order, the same ranking on the full and the top-k paths.
+    """
+    resume_file: str
+    matches: Tuple[RoleMatch, ...]
+    best_match: str
+    best_score: int
+    best_normalized_score: int
+    pages: int = 0
+    other_normalized_score: int = 0
+    other_roles: int = 0
+
+    @property
+    def job_matches(self):
+        """Raw match percentages as a new {role: score} dict"""
+        return {match.role: match.score for match in self.matches}
+
+    @property
+    def normalized_job_matches(self):
+        """Normalized percentages as a new {role: score} dict"""
+        return {match.role: match.normalized_score for match in self.matches}
+
+    def ranked(self, top=None):
+        """The best ``top`` matches (all by default), best first"""
+        return self.matches[:top] if top is not None else self.matches
+
+    def chart_matches(self):
+        """Normalized scores of the returned roles plus an "Other" bucket for the rest"""
+        return chart_matches(self.normalized_job_matches, self.other_normalized_score, self.other_roles)
+
+
+def chart_matches(normalized_job_matches, other_normalized_score=0, other_roles=0):
+    """{label: share} for charts: the top roles, then "Other (N roles)" when it is non-zero"""
+    matches = dict(normalized_job_matches)
+    if other_roles and other_normalized_score > 0:
+        matches[OTHER_LABEL.format(other_roles)] = other_normalized_score
+    return matches
+
+
+def normalize_scores(job_matches, total_match=None):
+    """Normalize job match percentages to sum to 100% (empty if every score is 0).
+
+    ``total_match`` is the sum over the whole catalog when job_matches only
+    holds the top roles.
+    """
+    if total_match is None:
+        total_match = sum(job_matches.values())
+    if total_match <= 0:
+        return {}
+    return {role: round((score / total_match) * 100) for role, score in job_matches.items()}
+
+
+def score_cleaned_text(job_index, cleaned_text, resume_file="", pages=0, top_k=None):
+    """Score cleaned resume text against a fitted JobIndex; returns a MatchResult or None.
+
+    With ``top_k`` only the best k roles are returned and the remaining
+    roles are summarized in ``other_normalized_score``.
+    """
+    if not cleaned_text or not job_index.is_fitted():
+        return None
+
+    if top_k is None or top_k >= len(job_index.roles):
+        return _match_result(job_index.roles, job_index.score(cleaned_text), resume_file, pages)
+
+    rows, similarities, total_match = job_index.top_k(cleaned_text, top_k)
+    roles = [job_index.roles[row] for row in rows]
+    return _match_result(roles, similarities, resume_file, pages, total_match, len(job_index.roles) - len(roles))
+
+
+def score_cleaned_batch(job_index, cleaned_texts, resume_files=None, pages=None, top_k=None):
+    """Score many cleaned resumes with one sparse matrix product; returns MatchResults (None for empty text).
+
+    ``top_k`` keeps the best k roles per resume as in score_cleaned_text,
+    scoring the job matrix in row chunks instead of one dense array.
+    """
+    cleaned_texts = list(cleaned_texts)
+    resume_files = resume_files or [""] * len(cleaned_texts)
+    pages = pages or [0] * len(cleaned_texts)
+    results = [None] * len(cleaned_texts)
+    if not job_index.is_fitted():
+        return results
+
+    scored = [i for i, text in enumerate(cleaned_texts) if text]
+    if not scored:
+        return results
+    n_roles = len(job_index.roles)
+    if top_k is None or top_k >= n_roles:
+        similarities = job_index.score_batch([cleaned_texts[i] for i in scored])
+        for row, i in enumerate(scored):
+            results[i] = _match_result(job_index.roles, similarities[row], resume_files[i], pages[i])
+        return results
+
+    rows, similarities, totals = job_index.top_k_batch([cleaned_texts[i] for i in scored], top_k)
+    for role_rows, role_similarities, total, i in zip(rows, similarities, totals, scored):
+        results[i] = _match_result([job_index.roles[row] for row in role_rows], role_similarities,
+                                   resume_files[i], pages[i], int(total), n_roles - len(role_rows))
+    return results
+
+
+def score_embedding_batch(job_index, embeddings, resume_files=None, top_k=DEFAULT_TOP_K):
+    """Score precomputed LSA embeddings (e.g. from a corpus store cache) in one matrix product.
+
+    Returns one MatchResult per row, with the best ``top_k`` roles as in
+    score_cleaned_text.
+    """
+    resume_files = resume_files or [""] * len(embeddings)
+    n_roles = len(job_index.roles)
+    rows, similarities, totals = job_index.top_k_embeddings(embeddings, top_k)
+    return [_match_result([job_index.roles[row] for row in role_rows], role_similarities, resume_file, 0,
+                          int(total), n_roles - len(role_rows))
+            for role_rows, role_similarities, total, resume_file in zip(rows, similarities, totals, resume_files)]
+
+
+def _match_result(roles, similarities, resume_file, pages, total_match=None, other_roles=0):
+    # Round to nearest integer (whole number)
+    job_matches = {role: round(similarity * 100) for role, similarity in zip(roles, similarities)}
+    normalized = normalize_scores(job_matches, total_match)
+    other_normalized_score = 0
+    if other_roles and total_match:
+        other_normalized_score = round((total_match - sum(job_matches.values())) / total_match * 100)
+
+    # Rank by normalized score, then raw score; the stable sort keeps catalog order
+    # for full ties (top-k rows already arrive in that order)
+    matches = tuple(sorted((RoleMatch(role, score, normalized.get(role, 0)) for role, score in job_matches.items()),
+                           key=lambda match: (-match.normalized_score, -match.score)))
+
+    # Best match is the first ranked role with a non-zero normalized score
+    best_match = ""
+    best_normalized_score = 0
+    if matches and matches[0].normalized_score > 0:
+        best_match = matches[0].role
+        best_normalized_score = matches[0].normalized_score
+
+    return MatchResult(
+        resume_file=resume_file,
+        matches=matches,
+        best_match=best_match,
+        best_score=job_matches.get(best_match, 0),
+        best_normalized_score=best_normalized_score,
+        pages=pages,
+        other_normalized_score=other_normalized_score,
+        other_roles=other_roles,
+    )
+
+
+class ResumeScorer:
+    """Reentrant scoring against one shared, read-only JobIndex.
+
+    A scorer holds no per-resume state: every call extracts, cleans and
+    scores into a fresh MatchResult, so one instance can serve many threads
+    or asyncio tasks at once without copying the job index. Use
+    ``ResumeAnalyzer.create_scorer()`` to build one from a loaded catalog.
+    """
+
+    def __init__(self, job_index, clean_text, text_cache=None, top_k=None, max_pages=None, max_chars=None,
+                 sandbox=None):
+        self.job_index = job_index
+        self.clean_text = clean_text
+        self.text_cache = text_cache
+        self.top_k = top_k
+        # Extraction caps; must match the ones the text cache's version was built for
+        self.max_pages = max_pages
+        self.max_chars = max_chars
+        # Optional SandboxedExtractor or SandboxPool: parse files in a worker with a timeout and memory limit
+        self.sandbox = sandbox
+
+    def score_text(self, raw_text, resume_file=""):
+        """Score raw (uncleaned) resume text"""
+        return score_cleaned_text(self.job_index, self.clean_text(raw_text), resume_file, top_k=self.top_k)
+
+    def score_bytes(self, data, kind, resume_file=""):
+        """Score the contents of a PDF/DOCX file given as bytes"""
+        cache_key = None
+        if self.text_cache is not None and kind in ('pdf', 'docx'):
+            cache_key = self.text_cache.key_for_bytes(bytes(data))
+            cached = self.text_cache.get(cache_key)
+            if cached is not None:
+                return score_cleaned_text(self.job_index, cached[1], resume_file, cached[2], self.top_k)
+
+        text, pages = self._extract(data, kind)
+        return self._score_extracted(text, pages, resume_file, cache_key)
+
+    def score_file(self, path):
+        """Score a PDF/DOCX resume on disk"""
+        path = os.fspath(path)
+        cache_key = None
+        if self.text_cache is not None and resume_kind(path) is not None:
+            cache_key = self.text_cache.key_for_file(path)
+            cached = self.text_cache.get(cache_key)
+            if cached is not None:
+                return score_cleaned_text(self.job_index, cached[1], path, cached[2], self.top_k)
+
+        text, pages = self._extract(path, None)
+        return self._score_extracted(text, pages, path, cache_key)
+
+    def _extract(self, source, kind):
+        # Sandbox failures are raised as ExtractionError
+        if self.sandbox is not None:
+            return self.sandbox.extract(source, kind, self.max_pages, self.max_chars)
+        return extract_text(source, kind, self.max_pages, self.max_chars)
+
+    def _score_extracted(self, text, pages, resume_file, cache_key):
+        if not text:
+            return None
+        cleaned = self.clean_text(text)
+        if cache_key is not None:
+            self.text_cache.put(cache_key, text, cleaned, pages)
+        return score_cleaned_text(self.job_index, cleaned, resume_file, pages, self.top_k)
+
+    def score(self, resume, kind=None):
+        """Score a path (str/PathLike), bytes (kind required) or a text string.
+
+        A str is treated as a path if such a file exists and as resume text
+        otherwise.
+        """
+        if isinstance(resume, (bytes, bytearray, memoryview)):
+            return self.score_bytes(resume, kind)
+        if isinstance(resume, os.PathLike) or (isinstance(resume, str) and os.path.isfile(resume)):
+            return self.score_file(resume)
+        return self.score_text(resume)
+
+    async def score_async(self, resume, kind=None, executor=None):
+        """Score in an executor so extraction does not block the event loop"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(executor, self.score, resume, kind)
@@ -0,0 +1,303 @@
+"""Long-running scoring daemon and its thin client.
+
+The daemon loads the job catalog once and answers scoring requests over a
+Unix domain socket (or a localhost TCP port), so each resume only pays for
+extraction and scoring. It reloads the catalog when the job description
+file changes. The protocol is one JSON object per line in each direction:
+
+    {"op": "score", "path": "/abs/resume.pdf", "top": 5}
+    {"op": "score", "text": "raw resume text"}
+    {"op": "ping"}
+    {"op": "reload"}
+
+The client side of this module only uses the standard library, so
+``python scoring_daemon.py resume.pdf`` starts in a few milliseconds.
+"""
+import argparse
+import json
+import os
+import signal
+import socket
+import socketserver
+import sys
+import tempfile
+import threading
+import time
+
+from catalog_watcher import CatalogWatcher
+from extraction_sandbox import ExtractionError, SandboxPool
+
+DEFAULT_PORT = 8765
+if hasattr(socket, "AF_UNIX") and hasattr(os, "getuid"):
+    DEFAULT_SOCKET = os.path.join(tempfile.gettempdir(), f"resume_analyzer-{os.getuid()}.sock")
+else:  # Windows: fall back to localhost TCP
+    DEFAULT_SOCKET = None
+
+
+def result_row(result, resume_file="", top=5):
+    """Turn a MatchResult (or None) into the same row shape batch mode writes"""
+    row = {"file": resume_file, "status": "ok", "best_match": "", "best_score": None,
+           "best_normalized_score": None, "top_matches": [], "pages": 0, "error": "",
+           "error_type": ""}
+    if result is None:
+        row["status"] = "error"
+        row["error"] = "Could not analyze resume"
+        return row
+    row["best_match"] = result.best_match
+    row["best_score"] = result.best_score
+    row["best_normalized_score"] = result.best_normalized_score
+    row["top_matches"] = [(match.role, match.normalized_score) for match in result.ranked(top)]
+    row["pages"] = result.pages
+    return row
+
+
+class ScoringService:
+    """Holds the current ResumeScorer and swaps in a new one when the catalog changes"""
+
+    def __init__(self, job_file="job_description.txt", cache_dir=None, instrumentation=None, max_pages=None,
+                 max_chars=None, sandbox_options=None):
+        self.job_file = job_file
+        self.cache_dir = cache_dir
+        self.instrumentation = instrumentation
+        self.max_pages = max_pages
+        self.max_chars = max_chars
+        # Sandbox workers outlive catalog reloads; every scorer extracts through them
+        self.sandbox = SandboxPool(**sandbox_options) if sandbox_options is not None else None
+        self.scorer = None
+        self.watcher = CatalogWatcher(job_file)
+        self.loaded_at = 0.0
+        self.requests = 0
+        self._reload_lock = threading.Lock()
+
+    def load(self):
+        """(Re)load the catalog; the previous scorer keeps serving if this fails"""
+        from resume_analyzer import ResumeAnalyzer
+
+        with self._reload_lock:
+            # Update a copy of the current index: only edited roles are re-cleaned,
+            # and in-flight requests keep scoring against the old one
+            analyzer = ResumeAnalyzer(cache_dir=self.cache_dir, instrumentation=self.instrumentation,
+                                      max_pages=self.max_pages, max_chars=self.max_chars, sandbox=self.sandbox)
+            if self.scorer is not None:
+                analyzer.job_index = self.scorer.job_index.copy()
+            if not analyzer.load_job_descriptions(self.job_file, verbose=False):
+                return False
+            self.scorer = analyzer.create_scorer()
+            self.loaded_at = time.time()
+            print(f"Loaded {len(analyzer.job_descriptions)} job descriptions from '{self.job_file}'.")
+            return True
+
+    def close(self):
+        """Stop the sandbox workers"""
+        if self.sandbox is not None:
+            self.sandbox.close()
+
+    def handle(self, request):
+        """Answer one decoded request with a JSON-serializable dict"""
+        op = request.get("op", "score")
+        if op == "ping":
+            scorer = self.scorer
+            return {"status": "ok", "job_file": self.job_file, "loaded_at": self.loaded_at,
+                    "roles": len(scorer.job_index.roles) if scorer is not None else 0,
+                    "requests": self.requests}
+        if op == "reload":
+            if self.load():
+                return {"status": "ok", "loaded_at": self.loaded_at}
+            return {"status": "error", "error": "Job descriptions could not be loaded"}
+        if op != "score":
+            return {"status": "error", "error": f"Unknown op '{op}'"}
+
+        self.requests += 1
+        scorer = self.scorer
+        path = request.get("path", "")
+        top = request.get("top", 5)
+        if scorer is None:
+            return dict(result_row(None, path), error="Job descriptions could not be loaded")
+        try:
+            if path:
+                if not os.path.isfile(path):
+                    return dict(result_row(None, path), error="File not found")
+                return result_row(scorer.score_file(path), path, top)
+            return result_row(scorer.score_text(request.get("text", "")), "", top)
+        except ExtractionError as e:
+            # Structured sandbox failure: timeout, oom, parse_error or crash
+            return dict(result_row(None, path), error=str(e), error_type=e.reason)
+        except Exception as e:
+            return dict(result_row(None, path), error=f"{type(e).__name__}: {e}")
+
+
+class _RequestHandler(socketserver.StreamRequestHandler):
+    """Reads JSON lines from one connection until the client closes it"""
+
+    def handle(self):
+        for line in self.rfile:
+            if not line.strip():
+                continue
+            try:
+                request = json.loads(line)
+                if not isinstance(request, dict):
+                    raise ValueError("request must be a JSON object")
+            except ValueError as e:
+                response = {"status": "error", "error": f"Invalid request: {e}"}
+            else:
+                response = self.server.service.handle(request)
+            self.wfile.write((json.dumps(response, ensure_ascii=False) + "\n").encode('utf-8'))
+            self.wfile.flush()
+
+
+class _TCPServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+
+if DEFAULT_SOCKET is not None:
+    class _UnixServer(socketserver.ThreadingUnixStreamServer):
+        daemon_threads = True
+
+
+def _remove_stale_socket(socket_path):
+    """Delete a socket file left behind by a daemon that is no longer running"""
+    if not os.path.exists(socket_path):
+        return True
+    probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        probe.connect(socket_path)
+    except OSError:
+        os.unlink(socket_path)
+        return True
+    finally:
+        probe.close()
+    return False
+
+
+def _raise_keyboard_interrupt(signum, frame):
+    raise KeyboardInterrupt
+
+
+def serve(job_file="job_description.txt", socket_path=DEFAULT_SOCKET, port=None, cache_dir=None,
+          poll_interval=1.0, instrumentation=None, max_pages=None, max_chars=None, sandbox_options=None):
+    """Run the scoring daemon until interrupted; port selects localhost TCP instead of a socket"""
+    service = ScoringService(job_file, cache_dir, instrumentation, max_pages, max_chars, sandbox_options)
+    if not service.load():
+        service.close()
+        return False
+
+    if port is not None or socket_path is None:
+        server = _TCPServer(("127.0.0.1", port or DEFAULT_PORT), _RequestHandler)
+        address = "127.0.0.1:%d" % server.server_address[1]
+    else:
+        if not _remove_stale_socket(socket_path):
+            print(f"A daemon is already listening on '{socket_path}'.")
+            service.close()
+            return False
+        server = _UnixServer(socket_path, _RequestHandler)
+        # Only the owner may ask the daemon to read files
+        os.chmod(socket_path, 0o600)
+        address = socket_path
+    server.service = service
+
+    stop_event = service.watcher.start(service.load, poll_interval)
+    # Treat SIGTERM (e.g. from a service manager) like Ctrl+C so the socket is removed
+    if threading.current_thread() is threading.main_thread() and hasattr(signal, "SIGTERM"):
+        signal.signal(signal.SIGTERM, _raise_keyboard_interrupt)
+    print(f"Scoring daemon listening on {address} (Ctrl+C to stop)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\nStopping scoring daemon.")
+    finally:
+        stop_event.set()
+        server.server_close()
+        service.close()
+        if port is None and socket_path is not None and os.path.exists(socket_path):
+            os.unlink(socket_path)
+    return True
+
+
+class ScoringClient:
+    """Thin client for a running scoring daemon; one connection serves many requests"""
+
+    def __init__(self, socket_path=DEFAULT_SOCKET, port=None, timeout=60.0):
+        if port is not None or socket_path is None:
+            self.sock = socket.create_connection(("127.0.0.1", port or DEFAULT_PORT), timeout=timeout)
+        else:
+            self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            self.sock.settimeout(timeout)
+            self.sock.connect(socket_path)
+        self.reader = self.sock.makefile('rb')
+
+    def request(self, payload):
+        """Send one request and wait for its response"""
+        self.sock.sendall((json.dumps(payload, ensure_ascii=False) + "\n").encode('utf-8'))
+        line = self.reader.readline()
+        if not line:
+            raise ConnectionError("Scoring daemon closed the connection")
+        return json.loads(line)
+
+    def score_file(self, path, top=5):
+        return self.request({"op": "score", "path": os.path.abspath(path), "top": top})
+
+    def score_text(self, text, top=5):
+        return self.request({"op": "score", "text": text, "top": top})
+
+    def ping(self):
+        return self.request({"op": "ping"})
+
+    def reload(self):
+        return self.request({"op": "reload"})
+
+    def close(self):
+        self.reader.close()
+        self.sock.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def client_main(argv=None):
+    """Score resumes through a running daemon and print one line (or JSON row) each"""
+    parser = argparse.ArgumentParser(description="Resume Analyzer - scoring daemon client")
+    parser.add_argument("files", nargs="*", help="PDF/DOCX resumes to score")
+    parser.add_argument("--text", help="Score this raw resume text instead of files")
+    parser.add_argument("--socket", default=DEFAULT_SOCKET, help="Daemon Unix socket path")
+    parser.add_argument("--port", type=int, default=None, help="Daemon localhost TCP port (instead of a socket)")
+    parser.add_argument("--top", type=int, default=5, help="Number of top roles to report")
+    parser.add_argument("--json", action="store_true", help="Print raw JSON rows")
+    parser.add_argument("--ping", action="store_true", help="Check that the daemon is up")
+    parser.add_argument("--reload", action="store_true", help="Force the daemon to reload the job catalog")
+    args = parser.parse_args(argv)
+
+    try:
+        client = ScoringClient(args.socket, args.port)
+    except OSError as e:
+        print(f"Could not connect to the scoring daemon: {e}", file=sys.stderr)
+        return 2
+
+    failures = 0
+    with client:
+        if args.ping or args.reload:
+            print(json.dumps(client.reload() if args.reload else client.ping()))
+        if args.text is not None:
+            failures += _print_row(client.score_text(args.text, args.top), args.json)
+        for path in args.files:
+            failures += _print_row(client.score_file(path, args.top), args.json)
+    return 1 if failures else 0
+
+
+def _print_row(row, as_json):
+    """Print one result row; returns 1 if it is an error so callers can count failures"""
+    if as_json:
+        print(json.dumps(row, ensure_ascii=False))
+    elif row["status"] != "ok":
+        print(f"{row['file'] or '<text>'}: error: {row['error']}")
+    else:
+        top = ", ".join(f"{role} {score}%" for role, score in row["top_matches"])
+        print(f"{row['file'] or '<text>'}: {row['best_match'] or 'no match'} ({top})")
+    return 0 if row["status"] == "ok" else 1
+
+
+if __name__ == "__main__":
+    sys.exit(client_main())
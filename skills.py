@@ -0,0 +1,222 @@
+"""Skill extraction with an Aho-Corasick automaton.
+
+The skills dictionary is compiled once into an automaton over skill
+tokens, so one linear pass over a resume or job section finds every skill
+it mentions, multi-word phrases such as "machine learning" included,
+however large the dictionary is. Skill tokens are lowercase words that
+keep the symbols and digits clean_text drops ("c++", "c#", "s3",
+"node.js", ".net"), so those skills stay distinct; skills named by a
+common English word ("Go", "R", "Spring") are matched through the
+unambiguous aliases in SKILL_ALIASES instead.
+"""
+import re
+from collections import deque
+
+# Words with inner dots ("node.js", "asp.net"), a leading dot (".net") and
+# trailing "+"/"#" ("c++", "c#"); anything else separates tokens
+_SKILL_TOKEN = re.compile(r"\.?[^\W_]+(?:\.[^\W_]+)*[+#]*")
+
+# A small bundled dictionary; pass a file with one skill per line for more
+BUNDLED_SKILLS = (
+    "Python", "Java", "JavaScript", "TypeScript", "C++", "C#", "Go", "Rust", "Ruby", "PHP", "Scala", "Kotlin",
+    "Swift", "R", "MATLAB", "Perl", "Bash", "SQL", "NoSQL", "PL/SQL", "HTML", "CSS", "Sass",
+    "React", "Angular", "Vue", "Node.js", "Express", "Django", "Flask", "FastAPI", "Spring", "Spring Boot",
+    "Ruby on Rails", ".NET", "ASP.NET", "jQuery", "Redux", "Next.js", "GraphQL", "REST", "REST APIs",
+    "Microservices", "gRPC", "WebSockets",
+    "PostgreSQL", "MySQL", "SQLite", "Oracle", "SQL Server", "MongoDB", "Redis", "Cassandra",
+    "Elasticsearch", "DynamoDB", "Neo4j", "Snowflake", "BigQuery", "Redshift",
+    "Docker", "Kubernetes", "Helm", "Terraform", "Ansible", "Puppet", "Chef", "Jenkins", "GitLab CI",
+    "GitHub Actions", "CI/CD", "Continuous Integration", "Continuous Delivery", "Infrastructure as Code",
+    "AWS", "Azure", "Google Cloud", "GCP", "Lambda", "EC2", "S3", "CloudFormation", "Serverless",
+    "Linux", "Unix", "Windows Server", "Networking", "TCP/IP", "DNS", "Load Balancing", "Nginx", "Apache",
+    "Prometheus", "Grafana", "Monitoring", "Logging", "Site Reliability Engineering", "Incident Response",
+    "Git", "Agile", "Scrum", "Kanban", "Jira", "Test-Driven Development", "Unit Testing", "Selenium",
+    "Cypress", "Jest", "PyTest", "Code Review", "Design Patterns", "Object-Oriented Programming",
+    "Functional Programming", "Data Structures", "Algorithms", "System Design", "Distributed Systems",
+    "Machine Learning", "Deep Learning", "Artificial Intelligence", "Natural Language Processing", "NLP",
+    "Computer Vision", "Reinforcement Learning", "Neural Networks", "TensorFlow", "PyTorch", "Keras",
+    "scikit-learn", "XGBoost", "Pandas", "NumPy", "SciPy", "Matplotlib", "Seaborn", "Jupyter",
+    "Statistics", "Probability", "Linear Algebra", "Regression", "Classification", "Clustering",
+    "Time Series", "A/B Testing", "Experimental Design", "Feature Engineering", "Data Analysis",
+    "Data Visualization", "Data Mining", "Data Engineering", "Data Modeling", "Data Warehousing",
+    "ETL", "Apache Spark", "Spark", "Hadoop", "Kafka", "Airflow", "dbt", "Tableau", "Power BI", "Looker",
+    "Excel", "Business Intelligence", "Big Data", "MLOps", "Model Deployment", "LLM", "Transformers",
+    "Cybersecurity", "Penetration Testing", "Network Security", "Cryptography", "OAuth", "IAM",
+    "Vulnerability Assessment", "SIEM", "Firewalls",
+    "Figma", "Sketch", "Adobe XD", "Photoshop", "Illustrator", "UI Design", "UX Design",
+    "User Research", "Wireframing", "Prototyping", "Accessibility", "Responsive Design",
+    "Android", "iOS", "React Native", "Flutter", "Mobile Development",
+    "Project Management", "Product Management", "Stakeholder Management", "Roadmapping",
+    "Communication", "Leadership", "Mentoring", "Teamwork", "Problem Solving", "Critical Thinking",
+    "Public Speaking", "Technical Writing", "Documentation", "Customer Service", "Negotiation",
+    "Sales", "Marketing", "SEO", "Content Marketing", "Social Media", "Google Analytics", "CRM",
+    "Salesforce", "SAP", "Accounting", "Financial Analysis", "Budgeting", "Forecasting",
+)
+
+# Phrases matched for a skill instead of its name: spelling variants, and
+# unambiguous forms of skills whose bare name is a common word
+SKILL_ALIASES = {
+    "Go": ("golang", "go language", "go programming", "go developer"),
+    "Rust": ("rustlang", "rust-lang", "rust language", "rust programming", "rust developer"),
+    "Ruby": ("ruby language", "ruby programming", "ruby developer", "rubygems", "ruby gems"),
+    "R": ("r programming", "r language", "rstudio", "r studio", "tidyverse", "ggplot2"),
+    "Express": ("express.js", "expressjs"),
+    "Spring": ("spring framework", "spring mvc", "spring data", "spring security"),
+    "Flask": ("flask framework", "python flask", "flask api", "flask app"),
+    "REST": ("rest api", "restful", "rest services", "rest endpoints", "rest architecture"),
+    "Helm": ("helm chart", "helm charts", "kubernetes helm"),
+    "Apache": ("apache http server", "apache httpd", "apache web server", "apache tomcat"),
+    "Networking": ("computer networking", "network engineering", "network administration", "networking protocols"),
+    "Spark": ("pyspark", "spark sql", "spark streaming", "spark jobs", "spark mllib"),
+    "Airflow": ("apache airflow", "airflow dags", "airflow dag"),
+    "Cypress": ("cypress.io", "cypress tests", "cypress testing"),
+    "Swift": ("swift programming", "swiftui", "swift language", "swift developer"),
+    "Chef": ("chef infra", "chef cookbooks", "chef configuration"),
+    "Puppet": ("puppet enterprise", "puppet manifests", "puppet configuration"),
+    "Sketch": ("sketch app", "sketch design"),
+    "Lambda": ("aws lambda", "lambda functions"),
+    "Excel": ("microsoft excel", "ms excel", "advanced excel", "excel vba", "excel spreadsheets"),
+    "Oracle": ("oracle database", "oracle db", "oracle sql", "oracle dba"),
+    "React": ("react.js", "reactjs", "react hooks", "react components", "react developer", "react redux"),
+    "Vue": ("vue", "vue.js", "vuejs"),
+    "Angular": ("angular", "angular.js", "angularjs"),
+    "Node.js": ("node.js", "nodejs"),
+    "Next.js": ("next.js", "nextjs"),
+    "scikit-learn": ("scikit-learn", "sklearn"),
+}
+
+
+def skill_tokens(text):
+    """Lowercase skill tokens of raw (or already tokenized) text"""
+    return _SKILL_TOKEN.findall(text.lower())
+
+
+def tee_skill_tokens(chunks, tokens):
+    """Yield text chunks unchanged while appending their skill tokens to ``tokens``.
+
+    As in clean_stream, the text after each chunk's last whitespace is
+    carried into the next chunk, so tokens split across chunks stay whole.
+    """
+    carry = ""
+    for chunk in chunks:
+        yield chunk
+        text = carry + chunk
+        cut = len(text)
+        while cut and not text[cut - 1].isspace():
+            cut -= 1
+        tokens.extend(skill_tokens(text[:cut]))
+        carry = text[cut:]
+    tokens.extend(skill_tokens(carry))
+
+
+def load_skills(path=None):
+    """(name, phrases) pairs from a file or the bundled list.
+
+    A file has one skill per line (``#`` starts a comment line); a line
+    ``Name = phrase, phrase`` matches the listed phrases instead of the name.
+    """
+    if path is None:
+        return [(skill, SKILL_ALIASES.get(skill, (skill,))) for skill in BUNDLED_SKILLS]
+    skills = []
+    with open(path, 'r', encoding='utf-8') as file:
+        for line in file:
+            line = line.strip()
+            if not line or line.startswith('#'):
+                continue
+            name, _, phrases = line.partition('=')
+            name = name.strip()
+            phrases = [phrase.strip() for phrase in phrases.split(',') if phrase.strip()]
+            skills.append((name, tuple(phrases) or (name,)))
+    return skills
+
+
+class SkillMatcher:
+    """Aho-Corasick automaton over the skill tokens of a skills dictionary.
+
+    States are trie nodes of token sequences; each has token transitions, a
+    failure link to the longest proper suffix that is also a trie prefix,
+    and the skills ending there (including those of its failure chain).
+    ``find`` is a single pass over the tokens of a text, whatever the
+    number of skills.
+    """
+
+    def __init__(self, skills):
+        self.skills = []
+        self._transitions = [{}]
+        self._failure = [0]
+        self._outputs = [()]
+        owners = {}
+        for name, phrases in skills:
+            skill_id = len(self.skills)
+            added = False
+            for phrase in phrases:
+                words = tuple(skill_tokens(phrase))
+                owner = owners.get(words)
+                if not words or owner == skill_id:
+                    continue
+                if owner is not None:
+                    if self.skills[owner] != name:
+                        print(f"Skill '{name}' matches the same text as '{self.skills[owner]}' ({phrase!r}); "
+                              f"keeping '{self.skills[owner]}'")
+                    continue
+                owners[words] = skill_id
+                self._add(words, skill_id)
+                added = True
+            if added:
+                self.skills.append(name)
+        self._link()
+
+    def _add(self, words, skill_id):
+        state = 0
+        for word in words:
+            next_state = self._transitions[state].get(word)
+            if next_state is None:
+                next_state = len(self._transitions)
+                self._transitions[state][word] = next_state
+                self._transitions.append({})
+                self._failure.append(0)
+                self._outputs.append(())
+            state = next_state
+        self._outputs[state] += (skill_id,)
+
+    def _link(self):
+        """Breadth-first pass setting failure links and merging outputs along them"""
+        queue = deque(self._transitions[0].values())
+        while queue:
+            state = queue.popleft()
+            for word, next_state in self._transitions[state].items():
+                queue.append(next_state)
+                failure = self._failure[state]
+                while failure and word not in self._transitions[failure]:
+                    failure = self._failure[failure]
+                self._failure[next_state] = self._transitions[failure].get(word, 0)
+                self._outputs[next_state] += self._outputs[self._failure[next_state]]
+
+    def __len__(self):
+        return len(self.skills)
+
+    def find(self, text):
+        """Ids of the skills in a text, in order of first appearance"""
+        transitions = self._transitions
+        failure = self._failure
+        outputs = self._outputs
+        found = {}
+        state = 0
+        for word in skill_tokens(text):
+            while state and word not in transitions[state]:
+                state = failure[state]
+            state = transitions[state].get(word, 0)
+            for skill_id in outputs[state]:
+                found.setdefault(skill_id, None)
+        return list(found)
+
+    def names(self, skill_ids):
+        return [self.skills[skill_id] for skill_id in skill_ids]
+
+
+def skill_gaps(matcher, resume_skill_ids, role_skill_ids):
+    """(matched, missing) skill names of one role, in the order the role mentions them"""
+    resume_skills = set(resume_skill_ids)
+    matched = [skill_id for skill_id in role_skill_ids if skill_id in resume_skills]
+    missing = [skill_id for skill_id in role_skill_ids if skill_id not in resume_skills]
+    return matcher.names(matched), matcher.names(missing)
@@ -0,0 +1,156 @@
+import hashlib
+import json
+import os
+import tempfile
+
+try:
+    import fcntl
+except ImportError:  # Windows: the shared size file is updated without a lock
+    fcntl = None
+
+DEFAULT_CACHE_DIR = ".text_cache"
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+# Running total of the entry sizes, shared by every process using the directory
+SIZE_FILE = "size"
+
+
+class TextCache:
+    """Content-addressed on-disk cache of extracted resume text.
+
+    Entries are keyed by a SHA-256 of the file contents plus the extractor
+    version and hold the raw extracted text, the ``clean_text`` output
+    and the document's page count. Each hit refreshes the entry's modification time, and the least
+    recently used entries are evicted once the cache grows beyond
+    ``max_bytes``. Writes go through a temporary file and ``os.replace`` so
+    several batch workers can share one cache directory; the total size is
+    kept in a lock-protected size file in the directory, so the limit holds
+    for all of them together.
+    """
+
+    def __init__(self, cache_dir=DEFAULT_CACHE_DIR, max_bytes=DEFAULT_MAX_BYTES, version="1"):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.version = version
+
+    def key_for_file(self, path):
+        """Hash the file contents together with the extractor version"""
+        digest = hashlib.sha256()
+        digest.update(f"extractor-{self.version}\0".encode('utf-8'))
+        with open(path, 'rb') as file:
+            for chunk in iter(lambda: file.read(1024 * 1024), b''):
+                digest.update(chunk)
+        return digest.hexdigest()
+
+    def key_for_bytes(self, data):
+        """Same key as key_for_file for a file with these contents"""
+        digest = hashlib.sha256()
+        digest.update(f"extractor-{self.version}\0".encode('utf-8'))
+        digest.update(data)
+        return digest.hexdigest()
+
+    def _entry_path(self, key):
+        return os.path.join(self.cache_dir, key[:2], f"{key}.json")
+
+    def get(self, key):
+        """Return (raw_text, clean_text, pages) for key, or None on a miss"""
+        path = self._entry_path(key)
+        try:
+            with open(path, 'r', encoding='utf-8') as file:
+                entry = json.load(file)
+            # Mark as recently used for LRU eviction
+            os.utime(path)
+        except (OSError, ValueError):
+            return None
+        # Entries written before page counts were stored report 0 pages
+        return entry.get("raw", ""), entry.get("clean", ""), entry.get("pages", 0)
+
+    def put(self, key, raw_text, clean_text, pages=0):
+        """Store the raw and cleaned text and page count for key, evicting old entries if needed"""
+        path = self._entry_path(key)
+        data = json.dumps({"raw": raw_text, "clean": clean_text, "pages": pages},
+                          ensure_ascii=False).encode('utf-8')
+        if len(data) > self.max_bytes:
+            return False
+
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+            with os.fdopen(fd, 'wb') as file:
+                file.write(data)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            print(f"Could not write text cache entry: {e}")
+            return False
+
+        self._update_size(len(data))
+        return True
+
+    def _update_size(self, added, reset=False):
+        """Add to the shared size (under an exclusive lock) and evict if it exceeds max_bytes"""
+        try:
+            fd = os.open(os.path.join(self.cache_dir, SIZE_FILE), os.O_RDWR | os.O_CREAT, 0o644)
+        except OSError:
+            return
+        with os.fdopen(fd, 'r+') as size_file:
+            if fcntl is not None:
+                fcntl.flock(size_file, fcntl.LOCK_EX)
+            try:
+                total = int(size_file.read()) + added
+            except ValueError:
+                # New or unreadable size file: count the entries once
+                total = self.size()
+            if reset:
+                total = 0
+            elif total > self.max_bytes:
+                total = self._evict()
+            size_file.seek(0)
+            size_file.truncate()
+            size_file.write(str(total))
+            # The lock is released when the file is closed
+
+    def _entries(self):
+        """List (mtime, size, path) for every cache entry"""
+        entries = []
+        if not os.path.isdir(self.cache_dir):
+            return entries
+        for dirpath, _, filenames in os.walk(self.cache_dir):
+            for filename in filenames:
+                if not filename.endswith(".json"):
+                    continue
+                path = os.path.join(dirpath, filename)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, path))
+        return entries
+
+    def size(self):
+        """Total size of the cache entries in bytes"""
+        return sum(size for _, size, _ in self._entries())
+
+    def _evict(self):
+        """Remove least recently used entries until the cache fits in max_bytes; returns the new size"""
+        entries = self._entries()
+        total = sum(size for _, size, _ in entries)
+        if total > self.max_bytes:
+            entries.sort()
+            for _, size, path in entries:
+                if total <= self.max_bytes:
+                    break
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+                total -= size
+        return total
+
+    def clear(self):
+        """Remove every entry from the cache"""
+        for _, _, path in self._entries():
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+        if os.path.isdir(self.cache_dir):
+            self._update_size(0, reset=True)
@@ -0,0 +1,71 @@
+import re
+
+# Characters clean_text removes: anything that is neither a word character nor
+# whitespace (punctuation), plus digits. Removing them never splits a word, so
+# "c++" becomes "c" and "node.js" becomes "nodejs", exactly as before.
+_DROP_PATTERN = re.compile(r'(?:[^\w\s]|\d)+')
+
+# The same removal for ASCII text as a str.translate table (one C-level pass);
+# derived from _DROP_PATTERN so the two paths cannot disagree
+_ASCII_DROP_TABLE = {code: None for code in range(128) if _DROP_PATTERN.fullmatch(chr(code))}
+
+
+def clean_tokens(text, stop_words):
+    """Lowercase, drop punctuation/digits and stopwords, and return the word list.
+
+    Produces the same words as the original four-pass clean_text (lower, two
+    re.sub calls, whitespace collapse, split and stopword filter) in a single
+    removal pass followed by one split.
+    """
+    text = text.lower()
+    if text.isascii():
+        text = text.translate(_ASCII_DROP_TABLE)
+    else:
+        text = _DROP_PATTERN.sub('', text)
+    return [word for word in text.split() if word not in stop_words]
+
+
+def clean_text(text, stop_words):
+    """clean_tokens joined with single spaces"""
+    return ' '.join(clean_tokens(text, stop_words))
+
+
+def clean_stream(chunks, stop_words):
+    """clean_text over text arriving in chunks (e.g. PDF pages), without joining them first.
+
+    A word may be split across two chunks, so the text after the last
+    whitespace of each chunk is carried into the next one; the result is
+    identical to clean_text of the concatenated chunks.
+    """
+    words = []
+    carry = ""
+    for chunk in chunks:
+        text = carry + chunk
+        cut = len(text)
+        while cut and not text[cut - 1].isspace():
+            cut -= 1
+        words.extend(clean_tokens(text[:cut], stop_words))
+        carry = text[cut:]
+    words.extend(clean_tokens(carry, stop_words))
+    return ' '.join(words)
+
+
+def clean_batch(texts, stop_words):
+    """clean_tokens of many documents at once, one word list per text"""
+    stop_words = frozenset(stop_words)
+    return [clean_tokens(text, stop_words) for text in texts]
+
+
+def vectorizer_terms(words):
+    """Tokens TfidfVectorizer's default pattern would find in clean_tokens output.
+
+    Cleaned words consist only of word characters, so the vectorizer's
+    ``\\b\\w\\w+\\b`` pattern matches each whole word of two or more
+    characters; filtering the words avoids running the regex again.
+    """
+    return [word for word in words if len(word) > 1]
+
+
+def vectorizer_tokens(cleaned_text):
+    """vectorizer_terms of clean_text output"""
+    return vectorizer_terms(cleaned_text.split())